@@ -37,7 +37,89 @@ class Settings(BaseSettings):
     email_service_url: str = Field(default="http://localhost:8080/send-email", alias="EMAIL_SERVICE_URL")
     
     # Security
-    password_hash_rounds: int = 12
+    password_hasher: str = "bcrypt"  # default for new hashes: "bcrypt", "argon2id" or "scrypt"
+    password_hash_rounds: int = 12  # used when calibration is disabled
+    password_hash_calibration_enabled: bool = True
+    password_hash_budget_ms: float = 250.0  # p99 budget for one hash
+    password_hash_min_rounds: int = 10
+    password_hash_max_rounds: int = 14
+    password_hash_calibration_samples: int = 5
+    argon2_time_cost: int = 3
+    argon2_memory_cost_kib: int = 65536
+    argon2_parallelism: int = 1
+    scrypt_n_log2: int = 15
+    scrypt_r: int = 8
+    scrypt_p: int = 1
+    password_hashing_backend: str = "local"  # "local" pool or "remote" hashing service
+    hashing_service_url: str = "unix:///tmp/dailymotion-hashing.sock"  # or tcp://host:port
+    hashing_service_pool_size: int = 4
+    hashing_service_timeout: float = 5.0
+    password_hash_executor_mode: str = "thread"  # "thread" or "process"
+    password_hash_workers: int = Field(default_factory=lambda: os.cpu_count() or 1)
+    password_hash_max_queue_size: int = 64
+    password_hash_queue_timeout: Optional[float] = 5.0
+    
+    # Registration: look up the email before hashing ("auto", "always" or "never");
+    # "auto" does it only while a hash takes at least the given time
+    registration_email_precheck: str = "auto"
+    registration_email_precheck_min_hash_ms: float = 50.0
+    
+    # Read-through user cache (per process, off by default)
+    user_cache_enabled: bool = False
+    user_cache_ttl_seconds: float = 30.0
+    user_cache_negative_ttl_seconds: float = 2.0
+    user_cache_max_entries: int = 10000
+    
+    # Bloom filter of registered emails (skips the registration pre-check)
+    email_filter_enabled: bool = False
+    email_filter_capacity: int = 1000000
+    email_filter_error_rate: float = 0.001
+    email_filter_snapshot_path: str = "/tmp/dailymotion-email-filter.bin"
+    email_filter_warmup_batch_size: int = 10000
+    # Rows registered this long before the snapshot watermark are re-read
+    email_filter_watermark_overlap_seconds: float = 300.0
+    
+    # Activation code store: "postgres", "memory" (single worker only), "redis"
+    # or "hmac" (codes derived from the user, no storage)
+    activation_code_store: str = "postgres"
+    activation_code_memory_max_entries: int = 100000
+    redis_url: str = "redis://localhost:6379/0"
+    activation_code_redis_prefix: str = "dm:activation:"
+    activation_code_hmac_step_seconds: int = 60
+    activation_code_hmac_valid_steps: int = 2
+    
+    # Expired activation code cleanup (postgres store): rows scanned per
+    # batch, delete rate cap (0 = none), standby lag to wait out (0 = off)
+    activation_code_cleanup_batch_size: int = 1000
+    activation_code_cleanup_max_rows_per_second: float = 5000.0
+    activation_code_cleanup_max_replication_lag_seconds: float = 10.0
+    
+    # Periodic maintenance jobs, run by one API worker per interval
+    scheduler_enabled: bool = True
+    scheduler_jitter_seconds: float = 15.0
+    activation_code_cleanup_interval_seconds: float = 300.0
+    user_stats_reconcile_interval_seconds: float = 3600.0
+    pending_user_purge_interval_seconds: float = 3600.0
+    # PENDING accounts older than this are deleted; 0 (default) keeps them forever
+    pending_user_max_age_hours: float = 0.0
+    
+    # Verified credential cache (skips bcrypt on repeat activate/resend calls)
+    credential_cache_enabled: bool = True
+    credential_cache_ttl_seconds: float = 120.0
+    credential_cache_max_entries: int = 10000
+    
+    # Admin user listing/search (X-Admin-Token header); empty disables them
+    admin_api_token: str = ""
+    # Rows per server-side cursor fetch (and response chunk) in user exports
+    user_export_batch_size: int = 1000
+    # Bulk user import: rows per batch, and passwords hashed at once on the
+    # shared hashing pool (kept low so live registrations still get workers)
+    bulk_import_batch_size: int = 1000
+    bulk_import_hash_concurrency: int = 2
+    
+    # Token other services send as X-Internal-Token to the batch status
+    # lookup; empty disables it
+    internal_api_token: str = ""
     
     # JWT for Basic Auth (optional enhancement)
     secret_key: str = Field(default="dailymotion-secret-key-change-in-production", alias="SECRET_KEY")
@@ -59,6 +141,87 @@ class Settings(BaseSettings):
             raise ValueError('Minimum connections must be at least 1')
         return v
     
+    @field_validator('password_hasher')
+    @classmethod
+    def validate_password_hasher(cls, v):
+        if v not in ('bcrypt', 'argon2id', 'scrypt'):
+            raise ValueError('Password hasher must be "bcrypt", "argon2id" or "scrypt"')
+        return v
+
+    @field_validator('password_hashing_backend')
+    @classmethod
+    def validate_password_hashing_backend(cls, v):
+        if v not in ('local', 'remote'):
+            raise ValueError('Password hashing backend must be "local" or "remote"')
+        return v
+
+    @field_validator('activation_code_store')
+    @classmethod
+    def validate_activation_code_store(cls, v):
+        if v not in ('postgres', 'memory', 'redis', 'hmac'):
+            raise ValueError('Activation code store must be "postgres", "memory", "redis" or "hmac"')
+        return v
+
+    @field_validator('activation_code_hmac_step_seconds', 'activation_code_hmac_valid_steps')
+    @classmethod
+    def validate_activation_code_hmac_window(cls, v):
+        if v < 1:
+            raise ValueError('Activation code HMAC step and window must be at least 1')
+        return v
+
+    @field_validator('activation_code_cleanup_batch_size')
+    @classmethod
+    def validate_activation_code_cleanup_batch_size(cls, v):
+        if v < 1:
+            raise ValueError('Activation code cleanup batch size must be at least 1')
+        return v
+
+    @field_validator('user_export_batch_size')
+    @classmethod
+    def validate_user_export_batch_size(cls, v):
+        if v < 1:
+            raise ValueError('User export batch size must be at least 1')
+        return v
+
+    @field_validator('bulk_import_batch_size', 'bulk_import_hash_concurrency')
+    @classmethod
+    def validate_bulk_import_sizes(cls, v):
+        if v < 1:
+            raise ValueError('Bulk import batch size and hash concurrency must be at least 1')
+        return v
+
+    @field_validator(
+        'activation_code_cleanup_interval_seconds',
+        'user_stats_reconcile_interval_seconds',
+        'pending_user_purge_interval_seconds'
+    )
+    @classmethod
+    def validate_job_interval(cls, v):
+        if v <= 0:
+            raise ValueError('Job intervals must be positive')
+        return v
+
+    @field_validator('registration_email_precheck')
+    @classmethod
+    def validate_registration_email_precheck(cls, v):
+        if v not in ('auto', 'always', 'never'):
+            raise ValueError('Registration email pre-check must be "auto", "always" or "never"')
+        return v
+
+    @field_validator('password_hash_executor_mode')
+    @classmethod
+    def validate_password_hash_executor_mode(cls, v):
+        if v not in ('thread', 'process'):
+            raise ValueError('Password hash executor mode must be "thread" or "process"')
+        return v
+
+    @field_validator('password_hash_max_rounds')
+    @classmethod
+    def validate_password_hash_max_rounds(cls, v, info):
+        if 'password_hash_min_rounds' in info.data and v < info.data['password_hash_min_rounds']:
+            raise ValueError('Maximum hash rounds must be greater than or equal to minimum hash rounds')
+        return v
+
     @field_validator('db_max_connections')
     @classmethod
     def validate_max_connections(cls, v, info):
@@ -9,9 +9,23 @@ from config import settings, get_rabbitmq_url
 from src.infrastructure.database.postgresql_client import PostgreSQLClient
 from src.infrastructure.messaging.rabbitmq_client import RabbitMQClient
 from src.infrastructure.email.email_service import EmailService
+from src.infrastructure.hashing.hashing_backend import PasswordHashingBackend, LocalHashingBackend
+from src.infrastructure.hashing.remote_hasher import RemoteHashingBackend
+from src.infrastructure.hashing.credential_cache import VerifiedCredentialCache
+from src.infrastructure.cache.user_cache import UserCache
+from src.infrastructure.scheduler.job_scheduler import JobScheduler
+from src.domain.user.statements import USER_STATEMENTS
+from src.domain.user.bulk_import import UserImporter
+from src.domain.user.code_cleaner import ActivationCodeCleaner
+from src.domain.user.email_filter import RegisteredEmailFilter
 from src.domain.user.repository import UserRepository, ActivationCodeRepository
 from src.domain.user.service import UserService
-from src.api.v1 import users
+from src.infrastructure.activation_codes.activation_code_store import ActivationCodeStore
+from src.infrastructure.activation_codes.hmac_store import HmacActivationCodeStore
+from src.infrastructure.activation_codes.memory_store import InMemoryActivationCodeStore
+from src.infrastructure.activation_codes.postgres_store import PostgresActivationCodeStore
+from src.infrastructure.activation_codes.redis_store import RedisActivationCodeStore
+from src.api.v1 import admin, users
 from src.domain.exceptions import (
     BaseServiceException,
     service_exception_handler,
@@ -30,6 +44,13 @@ logger = logging.getLogger(__name__)
 db_client: PostgreSQLClient = None
 rabbitmq_client: RabbitMQClient = None
 email_service: EmailService = None
+hashing_backend: PasswordHashingBackend = None
+credential_cache: VerifiedCredentialCache = None
+user_cache: UserCache = None
+email_filter: RegisteredEmailFilter = None
+email_filter_task: asyncio.Task = None
+activation_code_store: ActivationCodeStore = None
+job_scheduler: JobScheduler = None
 user_service: UserService = None
 
 
@@ -45,7 +66,8 @@ async def lifespan(app: FastAPI):
 
 async def startup_event():
     """Initialize services on startup."""
-    global db_client, rabbitmq_client, email_service, user_service
+    global db_client, rabbitmq_client, email_service, hashing_backend, credential_cache, user_cache
+    global email_filter, email_filter_task, activation_code_store, user_service, job_scheduler
     
     logger.info("Starting Dailymotion User Registration API...")
     
@@ -58,10 +80,12 @@ async def startup_event():
             username=settings.db_user,
             password=settings.db_password,
             min_connections=settings.db_min_connections,
-            max_connections=settings.db_max_connections
+            max_connections=settings.db_max_connections,
+            statements=USER_STATEMENTS
         )
         await db_client.connect()
         await db_client.create_tables()
+        await db_client.warm_up_statements()
         
         # Initialize RabbitMQ client
         rabbitmq_client = RabbitMQClient(get_rabbitmq_url())
@@ -77,19 +101,79 @@ async def startup_event():
         # Start email consumer in background
         asyncio.create_task(email_service.start_email_consumer())
         
+        # Initialize password hashing (local pool or standalone hashing service)
+        if settings.password_hashing_backend == "remote":
+            hashing_backend = RemoteHashingBackend.from_settings(settings)
+            await hashing_backend.start()
+        else:
+            hashing_backend = await LocalHashingBackend.from_settings(settings)
+        
+        # Initialize read-through user cache
+        if settings.user_cache_enabled:
+            user_cache = UserCache.from_settings(settings)
+        
+        # Initialize registered-email Bloom filter
+        if settings.email_filter_enabled:
+            email_filter = RegisteredEmailFilter.from_settings(settings)
+        
         # Initialize repositories
-        user_repository = UserRepository(db_client)
+        user_repository = UserRepository(
+            db_client,
+            hashing_backend,
+            email_precheck=settings.registration_email_precheck,
+            email_precheck_min_hash_ms=settings.registration_email_precheck_min_hash_ms,
+            user_cache=user_cache,
+            email_filter=email_filter
+        )
         activation_code_repository = ActivationCodeRepository(db_client)
         
+        # Initialize activation code store
+        if settings.activation_code_store == "memory":
+            activation_code_store = InMemoryActivationCodeStore(settings.activation_code_memory_max_entries)
+        elif settings.activation_code_store == "redis":
+            activation_code_store = RedisActivationCodeStore.from_settings(settings)
+        elif settings.activation_code_store == "hmac":
+            activation_code_store = HmacActivationCodeStore.from_settings(settings, user_repository)
+        else:
+            activation_code_store = PostgresActivationCodeStore(
+                activation_code_repository,
+                cleaner=ActivationCodeCleaner.from_settings(
+                    settings, activation_code_repository, replication_lag=db_client.replication_lag_seconds
+                )
+            )
+        
+        # Initialize verified credential cache
+        if settings.credential_cache_enabled:
+            credential_cache = VerifiedCredentialCache.from_settings(settings)
+        
         # Initialize user service
         user_service = UserService(
             user_repository=user_repository,
             activation_code_repository=activation_code_repository,
-            email_service=email_service
+            email_service=email_service,
+            credential_cache=credential_cache,
+            unit_of_work=db_client.unit_of_work,
+            activation_code_store=activation_code_store
         )
         
         # Set up dependency injection for routes
         users.user_service = user_service
+        users.internal_api_token = settings.internal_api_token
+        admin.user_service = user_service
+        admin.admin_api_token = settings.admin_api_token
+        admin.export_batch_size = settings.user_export_batch_size
+        admin.user_importer = UserImporter.from_settings(
+            settings, user_repository, activation_code_store, email_service
+        )
+        
+        # Warm the email filter in the background; it is bypassed until ready
+        if email_filter:
+            email_filter_task = asyncio.create_task(warm_up_email_filter(user_repository))
+        
+        # Start periodic maintenance jobs
+        if settings.scheduler_enabled:
+            job_scheduler = build_job_scheduler()
+            job_scheduler.start()
         
         logger.info("All services initialized successfully")
         
@@ -98,13 +182,61 @@ async def startup_event():
         raise
 
 
+def build_job_scheduler() -> JobScheduler:
+    """Register the maintenance jobs."""
+    scheduler = JobScheduler(db_client)
+    jitter = settings.scheduler_jitter_seconds
+    # In-process codes live in every worker, so every worker cleans its own
+    scheduler.register(
+        "activation_code_cleanup",
+        user_service.cleanup_expired_codes,
+        settings.activation_code_cleanup_interval_seconds,
+        jitter,
+        exclusive=settings.activation_code_store != "memory"
+    )
+    scheduler.register(
+        "user_stats_reconcile",
+        user_service.reconcile_user_stats,
+        settings.user_stats_reconcile_interval_seconds,
+        jitter
+    )
+    if settings.pending_user_max_age_hours > 0:
+        scheduler.register(
+            "pending_user_purge",
+            lambda: user_service.purge_stale_pending_users(settings.pending_user_max_age_hours * 3600),
+            settings.pending_user_purge_interval_seconds,
+            jitter
+        )
+    return scheduler
+
+
+async def warm_up_email_filter(user_repository: UserRepository):
+    """Fill the email filter from the users table and snapshot it."""
+    try:
+        await email_filter.warm_up(user_repository)
+        if email_filter.snapshot_owner:
+            email_filter.save(settings.email_filter_snapshot_path)
+    except Exception as e:
+        logger.error(f"Email filter warm-up failed, registration keeps the pre-check: {str(e)}")
+
+
 async def shutdown_event():
     """Clean up resources on shutdown."""
-    global db_client, rabbitmq_client
+    global db_client, rabbitmq_client, hashing_backend
     
     logger.info("Shutting down services...")
     
     try:
+        if job_scheduler:
+            await job_scheduler.stop()
+        if email_filter_task and not email_filter_task.done():
+            email_filter_task.cancel()
+        if email_filter and email_filter.ready and email_filter.snapshot_owner:
+            email_filter.save(settings.email_filter_snapshot_path)
+        if hashing_backend:
+            await hashing_backend.close()
+        if activation_code_store is not None:
+            await activation_code_store.close()
         if db_client:
             await db_client.disconnect()
         if rabbitmq_client:
@@ -159,6 +291,7 @@ app.add_exception_handler(Exception, generic_exception_handler)
 
 # Include routers
 app.include_router(users.router)
+app.include_router(admin.router)
 
 
 @app.get("/", tags=["Root"])
@@ -173,7 +306,13 @@ async def root():
             "register": "POST /api/v1/users/register",
             "activate": "POST /api/v1/users/activate",
             "resend": "POST /api/v1/users/resend-activation",
-            "health": "GET /api/v1/users/health"
+            "health": "GET /api/v1/users/health",
+            "status_lookup": "POST /api/v1/users/status:batch",
+            "admin_list": "GET /api/v1/admin/users",
+            "admin_search": "GET /api/v1/admin/users/search",
+            "admin_export": "GET /api/v1/admin/users/export",
+            "admin_import": "POST /api/v1/admin/users/import",
+            "admin_status": "POST /api/v1/admin/users/status"
         }
     }
 
@@ -185,7 +324,8 @@ async def health_check():
         "service": settings.app_name,
         "version": settings.app_version,
         "status": "healthy",
-        "components": {}
+        "components": {},
+        "metrics": {}
     }
     
     # Check database health
@@ -209,6 +349,20 @@ async def health_check():
     else:
         health_status["components"]["email_service"] = "not_initialized"
     
+    # Password hashing metrics
+    if hashing_backend:
+        health_status["metrics"]["password_hashing"] = hashing_backend.get_metrics()
+    if credential_cache:
+        health_status["metrics"]["credential_cache"] = credential_cache.get_metrics()
+    if user_cache:
+        health_status["metrics"]["user_cache"] = user_cache.get_metrics()
+    if email_filter:
+        health_status["metrics"]["email_filter"] = email_filter.get_metrics()
+    if activation_code_store is not None:
+        health_status["metrics"]["activation_codes"] = activation_code_store.get_metrics()
+    if job_scheduler:
+        health_status["metrics"]["jobs"] = job_scheduler.get_metrics()
+    
     # Overall health status
     component_statuses = list(health_status["components"].values())
     if all(status == "healthy" for status in component_statuses):
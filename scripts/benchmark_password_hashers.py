@@ -0,0 +1,120 @@
+"""
+Compare password hashers on this host.
+
+For every algorithm/parameter set, runs a batch of verifications in a fresh
+child process and reports verify latency (p50/p99), peak memory added by the
+hasher and single-core throughput (verifications per second).
+
+Usage:
+    python scripts/benchmark_password_hashers.py [--iterations 20] [--json]
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from pathlib import Path
+
+# Add the app directory to the path so we can import our modules
+app_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(app_dir))
+
+from src.infrastructure.hashing import password_hasher
+from src.infrastructure.hashing.cost_calibration import percentile
+from src.infrastructure.hashing.password_hasher import Argon2idHasher, BcryptHasher, ScryptHasher
+
+PASSWORD = "benchmark-password-1"
+
+
+def candidate_hashers():
+    """Algorithm/parameter sets to compare."""
+    hashers = [
+        BcryptHasher(rounds=10),
+        BcryptHasher(rounds=11),
+        BcryptHasher(rounds=12),
+        BcryptHasher(rounds=13),
+        ScryptHasher(n_log2=14, r=8, p=1),
+        ScryptHasher(n_log2=15, r=8, p=1),
+        ScryptHasher(n_log2=16, r=8, p=1),
+    ]
+    if password_hasher.argon2 is not None:
+        hashers += [
+            Argon2idHasher(time_cost=2, memory_cost_kib=19456, parallelism=1),
+            Argon2idHasher(time_cost=3, memory_cost_kib=65536, parallelism=1),
+            Argon2idHasher(time_cost=1, memory_cost_kib=262144, parallelism=1),
+        ]
+    return hashers
+
+
+def _max_rss_kib() -> int:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB on Linux
+    return usage // 1024 if sys.platform == "darwin" else usage
+
+
+def _measure(hasher, iterations: int, results) -> None:
+    """Run in a child process so peak RSS belongs to this hasher alone."""
+    baseline_kib = _max_rss_kib()
+    password_hash = hasher.hash(PASSWORD)
+
+    durations = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        if not hasher.verify(PASSWORD, password_hash):
+            raise RuntimeError(f"{hasher.algorithm} failed to verify its own hash")
+        durations.append((time.perf_counter() - started_at) * 1000)
+
+    mean_ms = sum(durations) / len(durations)
+    results.put({
+        "algorithm": hasher.algorithm,
+        "parameters": hasher.parameters(),
+        "p50_ms": round(percentile(durations, 50), 2),
+        "p99_ms": round(percentile(durations, 99), 2),
+        "peak_memory_mib": round((_max_rss_kib() - baseline_kib) / 1024, 1),
+        "verifies_per_core_per_s": round(1000 / mean_ms, 1),
+        "hash_length": len(password_hash),
+    })
+
+
+def run_benchmark(iterations: int):
+    """Benchmark every candidate hasher, one child process each."""
+    context = multiprocessing.get_context("spawn")
+    reports = []
+    for hasher in candidate_hashers():
+        results = context.Queue()
+        process = context.Process(target=_measure, args=(hasher, iterations, results))
+        process.start()
+        report = results.get()
+        process.join()
+        reports.append(report)
+    return reports
+
+
+def print_table(reports) -> None:
+    header = f"{'algorithm':<10} {'parameters':<52} {'p50 ms':>8} {'p99 ms':>8} {'mem MiB':>8} {'verify/s/core':>14}"
+    print(header)
+    print("-" * len(header))
+    for report in reports:
+        parameters = ",".join(f"{key}={value}" for key, value in report["parameters"].items())
+        print(
+            f"{report['algorithm']:<10} {parameters:<52} {report['p50_ms']:>8} {report['p99_ms']:>8} "
+            f"{report['peak_memory_mib']:>8} {report['verifies_per_core_per_s']:>14}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark password hashers on this host")
+    parser.add_argument("--iterations", type=int, default=20, help="Verifications per parameter set")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    reports = run_benchmark(args.iterations)
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_table(reports)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Compare CSV and NDJSON user export throughput.
+
+By default rows are generated in memory, so the numbers are the encoding
+cost alone; with --database they come from the users table through the
+server-side cursor, as in the real export. Peak memory is traced per run
+and should not grow with --rows.
+
+Usage:
+    python scripts/benchmark_user_export.py [--rows 200000] [--batch-size 1000] [--database] [--json]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+# Add the app directory to the path so we can import our modules
+app_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(app_dir))
+
+from src.domain.user.entities import utc_now
+from src.domain.user.export import ExportFormat, encode_export
+
+
+async def generated_rows(count: int):
+    """Users rows as the export statement returns them."""
+    now = utc_now()
+    for i in range(count):
+        yield {
+            'user_id': uuid.UUID(int=i + 1),
+            'email': f'benchmark.user{i}@example.com',
+            'status': 'ACTIVE',
+            'created_at': now,
+            'updated_at': now,
+            'activated_at': now if i % 2 else None,
+        }
+
+
+async def drain(export_format: ExportFormat, rows, batch_size: int):
+    """Run one export to nowhere, returning (rows, bytes, seconds)."""
+    row_count = 0
+
+    async def counted():
+        nonlocal row_count
+        async for row in rows:
+            row_count += 1
+            yield row
+
+    started = time.perf_counter()
+    written = 0
+    async for chunk in encode_export(counted(), export_format, batch_size):
+        written += len(chunk)
+    return row_count, written, time.perf_counter() - started
+
+
+async def measure(export_format: ExportFormat, make_rows, batch_size: int):
+    """
+    Time one export, then trace peak memory in a second one.
+
+    Tracing slows allocation-heavy code several times over, so it is kept
+    out of the timed run.
+    """
+    row_count, written, elapsed = await drain(export_format, make_rows(), batch_size)
+    tracemalloc.start()
+    await drain(export_format, make_rows(), batch_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "format": export_format.value,
+        "rows": row_count,
+        "rows_per_second": round(row_count / elapsed) if elapsed else None,
+        "mib": round(written / 2 ** 20, 1),
+        "peak_kib": peak // 1024,
+    }
+
+
+async def run_benchmark(row_count: int, batch_size: int, use_database: bool):
+    if not use_database:
+        return [
+            await measure(export_format, lambda: generated_rows(row_count), batch_size)
+            for export_format in ExportFormat
+        ]
+
+    from config import settings
+    from src.domain.user.repository import UserRepository
+    from src.domain.user.statements import USER_STATEMENTS
+    from src.infrastructure.database.postgresql_client import PostgreSQLClient
+
+    db_client = PostgreSQLClient(
+        host=settings.db_host,
+        port=settings.db_port,
+        database=settings.db_name,
+        username=settings.db_user,
+        password=settings.db_password,
+        min_connections=1,
+        max_connections=1,
+        statements=USER_STATEMENTS
+    )
+    await db_client.connect()
+    try:
+        repository = UserRepository(db_client)
+        return [
+            await measure(export_format, lambda: repository.stream_export(None, batch_size), batch_size)
+            for export_format in ExportFormat
+        ]
+    finally:
+        await db_client.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV vs NDJSON user export")
+    parser.add_argument("--rows", type=int, default=200000, help="Generated rows per format")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per fetch and output chunk")
+    parser.add_argument("--database", action="store_true",
+                        help="Export the users table instead of generated rows")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    reports = asyncio.run(run_benchmark(args.rows, args.batch_size, args.database))
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print(f"{'format':<8}{'rows':>10}{'rows/s':>12}{'MiB':>8}{'peak KiB':>10}")
+        for report in reports:
+            print(f"{report['format']:<8}{report['rows']:>10}{report['rows_per_second']:>12}"
+                  f"{report['mib']:>8}{report['peak_kib']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import sys
+import uuid
+from pathlib import Path
+
+# Add the app directory to the path so we can import our modules
+app_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(app_dir))
+
+from config import settings
+from src.domain.user.code_cleaner import ActivationCodeCleaner
+from src.domain.user.repository import ActivationCodeRepository
+from src.domain.user.statements import USER_STATEMENTS
+from src.infrastructure.database.postgresql_client import PostgreSQLClient
+
+
+# Configure logging
+logging.basicConfig(
+    level=getattr(logging, settings.log_level.upper()),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def read_checkpoint(path: Path):
+    """Get the user_id to resume after from a checkpoint file, if any."""
+    if not path.exists():
+        return None
+    checkpoint = json.loads(path.read_text())
+    return None if checkpoint.get("finished") else uuid.UUID(checkpoint["last_user_id"])
+
+
+def write_checkpoint(path: Path, progress) -> None:
+    """Save progress so an interrupted run can be resumed."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(progress.to_dict()))
+    tmp_path.replace(path)
+
+
+async def main(args):
+    """Main entry point."""
+    db_client = PostgreSQLClient(
+        host=settings.db_host,
+        port=settings.db_port,
+        database=settings.db_name,
+        username=settings.db_user,
+        password=settings.db_password,
+        min_connections=1,
+        max_connections=2,
+        statements=USER_STATEMENTS
+    )
+    await db_client.connect()
+
+    cleaner = ActivationCodeCleaner(
+        ActivationCodeRepository(db_client),
+        batch_size=args.batch_size,
+        max_rows_per_second=args.max_rows_per_second,
+        replication_lag=db_client.replication_lag_seconds,
+        max_replication_lag_seconds=args.max_replication_lag
+    )
+
+    checkpoint = Path(args.checkpoint) if args.checkpoint else None
+    start_after = args.resume_after or (read_checkpoint(checkpoint) if checkpoint else None)
+
+    def on_batch(progress):
+        if checkpoint:
+            write_checkpoint(checkpoint, progress)
+        if progress.batches % args.report_every == 0:
+            logger.info(f"Progress: {progress.to_dict()}")
+
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        if start_after:
+            logger.info(f"Resuming after user_id {start_after}")
+        progress = await cleaner.run(start_after=start_after, stop=stop, on_batch=on_batch)
+        if not progress.finished:
+            logger.info(f"Interrupted. Resume with --resume-after {progress.last_user_id}")
+        print(json.dumps(progress.to_dict(), indent=2))
+    finally:
+        await db_client.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete expired and used activation codes in paced batches")
+    parser.add_argument("--batch-size", type=int, default=settings.activation_code_cleanup_batch_size,
+                        help="Code rows scanned per statement")
+    parser.add_argument("--max-rows-per-second", type=float,
+                        default=settings.activation_code_cleanup_max_rows_per_second,
+                        help="Delete rate cap (0 for none)")
+    parser.add_argument("--max-replication-lag", type=float,
+                        default=settings.activation_code_cleanup_max_replication_lag_seconds,
+                        help="Pause while standbys lag more than this many seconds (0 to ignore)")
+    parser.add_argument("--resume-after", type=uuid.UUID, default=None,
+                        help="user_id reported by an interrupted run")
+    parser.add_argument("--checkpoint", default=None,
+                        help="JSON file to save progress to after every batch and resume from")
+    parser.add_argument("--report-every", type=int, default=100,
+                        help="Log progress every N batches")
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -0,0 +1,113 @@
+"""
+Export all users as NDJSON or CSV.
+
+Rows are read through a server-side cursor and written as they arrive, so
+memory stays flat whatever the table size.
+
+Usage:
+    python scripts/export_users.py [--format ndjson|csv] [--status ACTIVE] [--output users.ndjson]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add the app directory to the path so we can import our modules
+app_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(app_dir))
+
+from config import settings
+from src.domain.user.entities import UserStatus
+from src.domain.user.export import ExportFormat, encode_export
+from src.domain.user.repository import UserRepository
+from src.domain.user.statements import USER_STATEMENTS
+from src.infrastructure.database.postgresql_client import PostgreSQLClient
+
+
+# Configure logging; stdout may carry the export itself
+logging.basicConfig(
+    level=getattr(logging, settings.log_level.upper()),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    stream=sys.stderr
+)
+logger = logging.getLogger(__name__)
+
+
+class CountingRows:
+    """Pass rows through, counting them."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.count = 0
+
+    async def __aiter__(self):
+        async for row in self.rows:
+            self.count += 1
+            yield row
+
+
+async def main(args):
+    """Main entry point."""
+    db_client = PostgreSQLClient(
+        host=settings.db_host,
+        port=settings.db_port,
+        database=settings.db_name,
+        username=settings.db_user,
+        password=settings.db_password,
+        min_connections=1,
+        max_connections=1,
+        statements=USER_STATEMENTS
+    )
+    await db_client.connect()
+
+    export_format = ExportFormat(args.format)
+    rows = CountingRows(UserRepository(db_client).stream_export(args.status, args.batch_size))
+    output_path = Path(args.output) if args.output else None
+    # Written next to the target and renamed at the end, so a failed run
+    # never leaves a truncated export in place
+    tmp_path = output_path.with_name(output_path.name + ".tmp") if output_path else None
+
+    started = time.perf_counter()
+    written = 0
+    try:
+        output = tmp_path.open("wb") if tmp_path else sys.stdout.buffer
+        try:
+            async for chunk in encode_export(rows, export_format, args.batch_size):
+                output.write(chunk)
+                written += len(chunk)
+        finally:
+            if tmp_path:
+                output.close()
+            else:
+                output.flush()
+        if tmp_path:
+            tmp_path.replace(output_path)
+    finally:
+        await db_client.disconnect()
+
+    elapsed = time.perf_counter() - started
+    logger.info(json.dumps({
+        "format": export_format.value,
+        "rows": rows.count,
+        "bytes": written,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows.count / elapsed) if elapsed else None,
+    }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export users as NDJSON or CSV")
+    parser.add_argument("--format", choices=[f.value for f in ExportFormat], default=ExportFormat.NDJSON.value,
+                        help="Output format")
+    parser.add_argument("--status", type=UserStatus, default=None,
+                        help="Only export users in this status")
+    parser.add_argument("--batch-size", type=int, default=settings.user_export_batch_size,
+                        help="Rows fetched per cursor round trip")
+    parser.add_argument("--output", default=None,
+                        help="File to write (default: stdout)")
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+from pathlib import Path
+
+# Add the app directory to the path so we can import our modules
+app_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(app_dir))
+
+from config import settings
+from src.infrastructure.hashing.hashing_backend import LocalHashingBackend
+from src.infrastructure.hashing.hashing_server import HashingServer
+
+
+# Configure logging
+logging.basicConfig(
+    level=getattr(logging, settings.log_level.upper()),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def main(url: str, mode: str, workers: int):
+    """Main entry point."""
+    worker_settings = settings.model_copy(update={
+        "password_hash_executor_mode": mode,
+        "password_hash_workers": workers or settings.password_hash_workers,
+    })
+    backend = await LocalHashingBackend.from_settings(worker_settings)
+    server = HashingServer(url, backend)
+
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        await server.start()
+        logger.info("Hashing worker is running. Press Ctrl+C to stop.")
+        await stop.wait()
+    except Exception as e:
+        logger.error(f"Hashing worker error: {e}")
+        raise
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Standalone password hashing worker")
+    parser.add_argument("--url", default=settings.hashing_service_url,
+                        help="unix:///path/to.sock or tcp://host:port to listen on")
+    parser.add_argument("--mode", default="process", choices=["process", "thread"],
+                        help="Worker pool type")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Worker pool size (default: PASSWORD_HASH_WORKERS)")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.mode, args.workers))
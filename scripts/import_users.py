@@ -0,0 +1,158 @@
+"""
+Register users in bulk from a CSV with email and password columns.
+
+Passwords are hashed on a process pool of this script's own, so the import
+uses every core here without taking hashing workers from the API. Rejected
+rows are written to --rejects as they happen; the run ends with a JSON
+report of counts, per-stage time and throughput.
+
+Usage:
+    python scripts/import_users.py users.csv [--workers 8] [--rejects rejects.csv] [--send-activation]
+"""
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Add the app directory to the path so we can import our modules
+app_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(app_dir))
+
+from config import settings, get_rabbitmq_url
+from src.domain.user.bulk_import import UserImporter
+from src.domain.user.repository import ActivationCodeRepository, UserRepository
+from src.domain.user.statements import USER_STATEMENTS
+from src.infrastructure.activation_codes.hmac_store import HmacActivationCodeStore
+from src.infrastructure.activation_codes.postgres_store import PostgresActivationCodeStore
+from src.infrastructure.activation_codes.redis_store import RedisActivationCodeStore
+from src.infrastructure.database.postgresql_client import PostgreSQLClient
+from src.infrastructure.email.email_service import EmailService
+from src.infrastructure.hashing.hashing_backend import LocalHashingBackend
+from src.infrastructure.hashing.hashing_executor import PROCESS_MODE
+from src.infrastructure.messaging.rabbitmq_client import RabbitMQClient
+
+
+# Configure logging
+logging.basicConfig(
+    level=getattr(logging, settings.log_level.upper()),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def read_lines(path: Path):
+    """Lines of the import file, read as the importer asks for them."""
+    with path.open(encoding="utf-8-sig", newline="") as file:
+        for line in file:
+            yield line.rstrip("\n")
+
+
+def build_activation_code_store(db_client, user_repository):
+    """The API's activation code store, so imported users can activate."""
+    if settings.activation_code_store == "redis":
+        return RedisActivationCodeStore.from_settings(settings)
+    if settings.activation_code_store == "hmac":
+        return HmacActivationCodeStore.from_settings(settings, user_repository)
+    if settings.activation_code_store == "memory":
+        raise SystemExit("--send-activation needs a shared activation code store, not 'memory'")
+    return PostgresActivationCodeStore(ActivationCodeRepository(db_client))
+
+
+async def main(args):
+    """Main entry point."""
+    db_client = PostgreSQLClient(
+        host=settings.db_host,
+        port=settings.db_port,
+        database=settings.db_name,
+        username=settings.db_user,
+        password=settings.db_password,
+        min_connections=1,
+        max_connections=2,
+        statements=USER_STATEMENTS
+    )
+    await db_client.connect()
+
+    # Same hashers and calibrated cost as the API, on a local process pool
+    hashing_backend = await LocalHashingBackend.from_settings(settings.model_copy(update={
+        "password_hash_executor_mode": PROCESS_MODE,
+        "password_hash_workers": args.workers,
+        "password_hash_max_queue_size": args.workers,
+    }))
+    user_repository = UserRepository(db_client, hashing_backend)
+
+    rabbitmq_client = None
+    activation_code_store = email_service = None
+    if args.send_activation:
+        rabbitmq_client = RabbitMQClient(get_rabbitmq_url())
+        await rabbitmq_client.connect()
+        email_service = EmailService(
+            rabbitmq_client=rabbitmq_client,
+            email_service_url=settings.email_service_url,
+            queue_name=settings.email_queue_name
+        )
+        activation_code_store = build_activation_code_store(db_client, user_repository)
+
+    importer = UserImporter(
+        user_repository,
+        activation_code_store=activation_code_store,
+        email_service=email_service,
+        batch_size=args.batch_size,
+        hash_concurrency=args.workers
+    )
+
+    rejects_file = open(args.rejects, "w", newline="", encoding="utf-8") if args.rejects else None
+    rejects_writer = csv.writer(rejects_file) if rejects_file else None
+    if rejects_writer:
+        rejects_writer.writerow(["line", "email", "reason"])
+
+    def on_reject(reject):
+        if rejects_writer:
+            rejects_writer.writerow([reject.line, reject.email or "", reject.reason.value])
+
+    def on_batch(report):
+        if report.batches % args.report_every == 0:
+            progress = report.to_dict()
+            del progress["rejects"]
+            logger.info(f"Progress: {progress}")
+
+    try:
+        report = await importer.run(
+            read_lines(Path(args.file)),
+            send_activation=args.send_activation,
+            on_reject=on_reject,
+            on_batch=on_batch
+        )
+        result = report.to_dict()
+        # Every reject is in the rejects file
+        if rejects_file:
+            del result["rejects"]
+        print(json.dumps(result, indent=2))
+    finally:
+        if rejects_file:
+            rejects_file.close()
+        await hashing_backend.close()
+        if rabbitmq_client:
+            await rabbitmq_client.disconnect()
+        await db_client.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Register users in bulk from a CSV file")
+    parser.add_argument("file", help="UTF-8 CSV with email and password columns")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Hashing processes")
+    parser.add_argument("--batch-size", type=int, default=settings.bulk_import_batch_size,
+                        help="Rows validated, deduplicated, hashed and copied together")
+    parser.add_argument("--rejects", default=None,
+                        help="CSV file to write every rejected row to")
+    parser.add_argument("--send-activation", action="store_true",
+                        help="Issue activation codes and queue activation emails")
+    parser.add_argument("--report-every", type=int, default=10,
+                        help="Log progress every N batches")
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -2,6 +2,7 @@
 
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- Create users table
 CREATE TABLE IF NOT EXISTS users (
@@ -12,6 +13,7 @@ CREATE TABLE IF NOT EXISTS users (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     activated_at TIMESTAMP WITH TIME ZONE NULL,
+    activation_nonce INTEGER NOT NULL DEFAULT 0,
     
     CONSTRAINT users_email_format CHECK (email ~ '^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$'),
     CONSTRAINT users_status_valid CHECK (status IN ('PENDING', 'ACTIVE', 'INACTIVE', 'SUSPENDED'))
@@ -20,25 +22,48 @@ CREATE TABLE IF NOT EXISTS users (
 -- Create indexes for users table
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_users_status ON users(status);
-CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at);
+-- Keyset pages of the admin listing and the export
+CREATE INDEX IF NOT EXISTS idx_users_created_at_user_id ON users(created_at, user_id);
+CREATE INDEX IF NOT EXISTS idx_users_pending_created_at ON users(created_at) WHERE status = 'PENDING';
+-- Covers the admin listing by status, for index-only scans
+CREATE INDEX IF NOT EXISTS idx_users_status_created_at_user_id
+    ON users(status, created_at, user_id) INCLUDE (email, activated_at);
+CREATE INDEX IF NOT EXISTS idx_users_email_trgm ON users USING gin (email gin_trgm_ops);
 
--- Create activation_codes table
+-- Create activation_codes table: at most one code row per user, replaced
+-- in place on resend. No indexes besides the primary key, so that the
+-- replacing UPDATE can be HOT within the free space the fillfactor leaves.
 CREATE TABLE IF NOT EXISTS activation_codes (
-    user_id UUID NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    user_id UUID PRIMARY KEY REFERENCES users(user_id) ON DELETE CASCADE,
     code VARCHAR(4) NOT NULL,
     expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     used_at TIMESTAMP WITH TIME ZONE NULL,
     is_used BOOLEAN DEFAULT FALSE,
     
-    PRIMARY KEY (user_id, code),
     CONSTRAINT activation_codes_code_format CHECK (code ~ '^[0-9]{4}$')
-);
+) WITH (fillfactor = 70);
+
+-- User counts by status, in 16 shard rows per status written by the
+-- statements that change users. Half of each page is left free, so the
+-- counter updates can stay HOT.
+CREATE TABLE IF NOT EXISTS user_counters (
+    status VARCHAR(50) NOT NULL,
+    shard SMALLINT NOT NULL,
+    user_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (status, shard)
+) WITH (fillfactor = 50);
 
--- Create indexes for activation_codes table
-CREATE INDEX IF NOT EXISTS idx_activation_codes_expires_at ON activation_codes(expires_at);
-CREATE INDEX IF NOT EXISTS idx_activation_codes_is_used ON activation_codes(is_used);
-CREATE INDEX IF NOT EXISTS idx_activation_codes_created_at ON activation_codes(created_at);
+-- Last run of each scheduled maintenance job across the fleet
+CREATE TABLE IF NOT EXISTS scheduled_jobs (
+    name VARCHAR(100) PRIMARY KEY,
+    last_started_at TIMESTAMP WITH TIME ZONE,
+    last_finished_at TIMESTAMP WITH TIME ZONE,
+    last_duration_ms INTEGER,
+    last_outcome VARCHAR(20),
+    last_error TEXT,
+    last_runner VARCHAR(255)
+);
 
 -- Create function to automatically update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -66,4 +91,9 @@ BEGIN
         
         RAISE NOTICE 'Sample data inserted for development';
     END IF;
-END $$;
\ No newline at end of file
+END $$;
+
+-- Counters only receive deltas: start them from the users inserted above
+INSERT INTO user_counters (status, shard, user_count)
+SELECT status, 0, count(*) FROM users GROUP BY status
+ON CONFLICT (status, shard) DO NOTHING;
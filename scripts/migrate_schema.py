@@ -0,0 +1,64 @@
+"""
+Bring an existing database to the schema the API creates on a fresh one.
+
+The API only creates tables and indexes on an empty database. Run this
+once before rolling out a release that changes the schema: every step
+checks the catalog first, so running it again changes nothing. Indexes on
+users are built with CREATE INDEX CONCURRENTLY, without blocking writes;
+steps that do lock tables the API writes to say so in their docstring (see
+src/infrastructure/database/schema_migrations.py).
+
+Usage:
+    python scripts/migrate_schema.py
+"""
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Add the app directory to the path so we can import our modules
+app_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(app_dir))
+
+from config import settings
+from src.domain.user.statements import USER_STATEMENTS
+from src.infrastructure.database.postgresql_client import PostgreSQLClient
+from src.infrastructure.database.schema_migrations import SCHEMA_MIGRATION_LOCK_KEY, run_migrations
+
+
+# Configure logging
+logging.basicConfig(
+    level=getattr(logging, settings.log_level.upper()),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    """Main entry point."""
+    db_client = PostgreSQLClient(
+        host=settings.db_host,
+        port=settings.db_port,
+        database=settings.db_name,
+        username=settings.db_user,
+        password=settings.db_password,
+        min_connections=1,
+        max_connections=2,
+        statements=USER_STATEMENTS
+    )
+    await db_client.connect()
+
+    try:
+        # One migration run at a time; the lock goes with the connection
+        async with db_client.advisory_lock(SCHEMA_MIGRATION_LOCK_KEY) as connection:
+            if connection is None:
+                raise SystemExit("Another schema migration is running")
+            applied = await run_migrations(db_client)
+        print(json.dumps(applied, indent=2))
+    finally:
+        await db_client.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,301 @@
+import base64
+import binascii
+import hmac
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Mapping, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from src.domain.exceptions import AdminAccessDeniedException, InvalidQueryException
+from src.domain.user.bulk_import import UserImporter, iter_lines
+from src.domain.user.entities import UserStatus
+from src.domain.user.export import ExportFormat, encode_export
+from src.domain.user.service import UserService
+from src.schemas.common.errors import ErrorHandling
+from src.schemas.user import ApiResponse, BulkStatusChangeRequest
+
+router = APIRouter(
+    prefix="/api/v1/admin/users",
+    tags=["User Administration"]
+)
+
+# Dependency injection will be set up in main.py
+user_service = None
+admin_api_token = None
+export_batch_size = 1000
+user_importer = None
+
+MAX_PAGE_SIZE = 1000
+
+# Cursor of the first page: sorts after every real (created_at, user_id)
+_FIRST_PAGE = (datetime.max.replace(tzinfo=timezone.utc), uuid.UUID(int=(1 << 128) - 1))
+
+
+def get_user_service() -> UserService:
+    """Dependency injection for UserService."""
+    if user_service is None:
+        raise HTTPException(
+            status_code=500,
+            detail="User service not initialized"
+        )
+    return user_service
+
+
+def get_user_importer() -> UserImporter:
+    """Dependency injection for UserImporter."""
+    if user_importer is None:
+        raise HTTPException(
+            status_code=500,
+            detail="User importer not initialized"
+        )
+    return user_importer
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """
+    Allow the request only with the configured admin token.
+
+    Admin endpoints stay closed while no token is configured.
+
+    Raises:
+        AdminAccessDeniedException: If the token is missing or wrong
+    """
+    if not admin_api_token or not x_admin_token or not hmac.compare_digest(
+        x_admin_token.encode("utf-8"), admin_api_token.encode("utf-8")
+    ):
+        raise AdminAccessDeniedException()
+
+
+def encode_cursor(created_at: datetime, user_id: uuid.UUID) -> str:
+    """Opaque cursor pointing after a user in newest-first order."""
+    raw = json.dumps([created_at.isoformat(), str(user_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[datetime, uuid.UUID]:
+    """
+    Read a cursor from ``encode_cursor``; no cursor means the first page.
+
+    Raises:
+        InvalidQueryException: If the cursor was not produced by this API
+    """
+    if not cursor:
+        return _FIRST_PAGE
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, user_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(user_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidQueryException("Invalid pagination cursor")
+
+
+async def stream_page(rows: AsyncIterator[Mapping[str, Any]], limit: int) -> AsyncIterator[bytes]:
+    """
+    Write a page of users as the usual ``{"status", "data"}`` JSON envelope.
+
+    Each row is encoded and sent as it comes off the database cursor, so
+    server memory does not depend on the page size. ``next_cursor`` is null
+    on the last page.
+    """
+    yield b'{"status":"success","data":{"users":['
+    count = 0
+    last = None
+    async for row in rows:
+        item = {
+            "user_id": str(row["user_id"]),
+            "email": row["email"],
+            "status": row["status"],
+            "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+            "activated_at": row["activated_at"].isoformat() if row["activated_at"] else None,
+        }
+        yield (b"," if count else b"") + json.dumps(item, separators=(",", ":")).encode("utf-8")
+        count += 1
+        last = row
+
+    next_cursor = encode_cursor(last["created_at"], last["user_id"]) if count == limit else None
+    yield b'],"count":%d,"next_cursor":%s}}' % (count, json.dumps(next_cursor).encode("utf-8"))
+
+
+@router.get(
+    "",
+    dependencies=[Depends(require_admin)],
+    responses={
+        400: {"model": ErrorHandling, "description": "Invalid cursor"},
+        403: {"model": ErrorHandling, "description": "Admin access denied"},
+        422: {"model": ErrorHandling, "description": "Validation Error"}
+    }
+)
+async def list_users(
+        status: Optional[UserStatus] = None,
+        cursor: Optional[str] = None,
+        limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+        service: UserService = Depends(get_user_service)
+) -> StreamingResponse:
+    """
+    List users, newest first.
+
+    **Query Parameters:**
+    - status: Only users in this status
+    - cursor: `next_cursor` from the previous page
+    - limit: Page size (1-1000)
+
+    **Response:**
+    - users: user_id, email, status, created_at and activated_at of each user
+    - count: Number of users in this page
+    - next_cursor: Cursor for the next page, null on the last page
+
+    Requires the `X-Admin-Token` header.
+    """
+    before_created_at, before_user_id = decode_cursor(cursor)
+    rows = service.list_users(status, before_created_at, before_user_id, limit)
+    return StreamingResponse(stream_page(rows, limit), media_type="application/json")
+
+
+@router.get(
+    "/search",
+    dependencies=[Depends(require_admin)],
+    responses={
+        400: {"model": ErrorHandling, "description": "Search term too short or invalid cursor"},
+        403: {"model": ErrorHandling, "description": "Admin access denied"},
+        422: {"model": ErrorHandling, "description": "Validation Error"}
+    }
+)
+async def search_users(
+        q: str = Query(..., description="Case-insensitive substring of the email, 3+ characters"),
+        status: Optional[UserStatus] = None,
+        cursor: Optional[str] = None,
+        limit: int = Query(default=100, ge=1, le=MAX_PAGE_SIZE),
+        service: UserService = Depends(get_user_service)
+) -> StreamingResponse:
+    """
+    Search users by email substring, newest first.
+
+    Served by a trigram index on email, so it does not scan the table.
+    Paginated like the listing, with `cursor` and `limit`.
+
+    Requires the `X-Admin-Token` header.
+    """
+    before_created_at, before_user_id = decode_cursor(cursor)
+    rows = service.search_users_by_email(q, status, before_created_at, before_user_id, limit)
+    return StreamingResponse(stream_page(rows, limit), media_type="application/json")
+
+
+@router.get(
+    "/export",
+    dependencies=[Depends(require_admin)],
+    responses={
+        200: {"content": {"application/x-ndjson": {}, "text/csv": {}}, "description": "All users"},
+        403: {"model": ErrorHandling, "description": "Admin access denied"},
+        422: {"model": ErrorHandling, "description": "Validation Error"}
+    }
+)
+async def export_users(
+        format: ExportFormat = ExportFormat.NDJSON,
+        status: Optional[UserStatus] = None,
+        service: UserService = Depends(get_user_service)
+) -> StreamingResponse:
+    """
+    Export all users as NDJSON or CSV.
+
+    The body is streamed from a server-side cursor in chunks, so the export
+    does not load the table into memory, whatever its size.
+
+    **Query Parameters:**
+    - format: `ndjson` (default) or `csv`
+    - status: Only users in this status
+
+    Requires the `X-Admin-Token` header.
+    """
+    rows = service.export_users(status, export_batch_size)
+    return StreamingResponse(
+        encode_export(rows, format, export_batch_size),
+        media_type=format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{format.value}"'}
+    )
+
+
+@router.post(
+    "/import",
+    response_model=ApiResponse,
+    dependencies=[Depends(require_admin)],
+    responses={
+        400: {"model": ErrorHandling, "description": "File is not a CSV with email and password columns"},
+        403: {"model": ErrorHandling, "description": "Admin access denied"},
+        422: {"model": ErrorHandling, "description": "Validation Error"}
+    }
+)
+async def import_users(
+        request: Request,
+        send_activation: bool = False,
+        importer: UserImporter = Depends(get_user_importer)
+) -> ApiResponse:
+    """
+    Register users in bulk from a CSV request body.
+
+    The body is a UTF-8 CSV whose header names `email` and `password`
+    columns (others are ignored), sent as `text/csv`. It is read as it
+    arrives and imported in batches. Rows that are invalid, repeated or
+    already registered are rejected one by one without failing the import.
+
+    **Query Parameters:**
+    - send_activation: Issue codes and queue activation emails to imported users
+
+    **Response:**
+    - imported / rejected: Row counts
+    - rejects: The first 1000 rejected rows, with line number and reason
+    - rejects_by_reason: Count of every reject reason
+    - stage_seconds, rows_per_second: Where the time went
+
+    Requires the `X-Admin-Token` header. Hashing makes this slow (about a
+    hashing-pool slot per row), so files of more than a few thousand rows
+    are better imported with `scripts/import_users.py`.
+    """
+    report = await importer.run(iter_lines(request.stream()), send_activation=send_activation)
+    return ApiResponse(
+        status="success",
+        data=report.to_dict()
+    )
+
+
+@router.post(
+    "/status",
+    response_model=ApiResponse,
+    dependencies=[Depends(require_admin)],
+    responses={
+        400: {"model": ErrorHandling, "description": "No users, too many users or transition not allowed"},
+        403: {"model": ErrorHandling, "description": "Admin access denied"},
+        422: {"model": ErrorHandling, "description": "Validation Error"}
+    }
+)
+async def change_users_status(
+        request: BulkStatusChangeRequest,
+        service: UserService = Depends(get_user_service)
+) -> ApiResponse:
+    """
+    Move up to 10000 users to one status, e.g. to suspend them.
+
+    **Request Body:**
+    - status: New status (ACTIVE, INACTIVE or SUSPENDED)
+    - user_ids or emails: The users to change
+    - from_statuses: Only change users currently in these statuses
+
+    **Response:**
+    - updated: IDs of the users changed
+    - skipped: For each user left unchanged, the reason (NOT_FOUND,
+      ALREADY_IN_STATUS, NOT_ALLOWED or CHANGED_CONCURRENTLY)
+
+    Requires the `X-Admin-Token` header.
+    """
+    result = await service.change_users_status(
+        request.status,
+        user_ids=request.user_ids,
+        emails=request.emails,
+        from_statuses=request.from_statuses
+    )
+    return ApiResponse(
+        status="success",
+        data=result.to_dict()
+    )
@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 
 from src.schemas.user import (
     UserRegistrationRequest,
@@ -6,9 +9,13 @@ from src.schemas.user import (
     ActivationRequest,
     ActivationResponse,
     ResendActivationRequest,
+    UserStatsResponse,
+    UserStatusLookupRequest,
+    UserStatusLookupResponse,
     ApiResponse
 )
 from src.schemas.common.errors import ErrorHandling
+from src.domain.exceptions import InternalAccessDeniedException
 from src.domain.user.service import UserService
 
 router = APIRouter(
@@ -18,6 +25,7 @@ router = APIRouter(
 
 # Dependency injection will be set up in main.py
 user_service = None
+internal_api_token = None
 
 
 def get_user_service() -> UserService:
@@ -30,6 +38,21 @@ def get_user_service() -> UserService:
     return user_service
 
 
+def require_internal_caller(x_internal_token: Optional[str] = Header(default=None)) -> None:
+    """
+    Allow the request only with the configured internal service token.
+
+    Internal endpoints stay closed while no token is configured.
+
+    Raises:
+        InternalAccessDeniedException: If the token is missing or wrong
+    """
+    if not internal_api_token or not x_internal_token or not hmac.compare_digest(
+        x_internal_token.encode("utf-8"), internal_api_token.encode("utf-8")
+    ):
+        raise InternalAccessDeniedException()
+
+
 @router.post(
     "/register",
     response_model=ApiResponse,
@@ -37,7 +60,8 @@ def get_user_service() -> UserService:
     responses={
         409: {"model": ErrorHandling, "description": "Email already exists"},
         422: {"model": ErrorHandling, "description": "Validation Error"},
-        500: {"model": ErrorHandling, "description": "Internal Server Error"}
+        500: {"model": ErrorHandling, "description": "Internal Server Error"},
+        503: {"model": ErrorHandling, "description": "Service busy, retry later"}
     }
 )
 async def register_user(
@@ -82,7 +106,8 @@ async def register_user(
         401: {"model": ErrorHandling, "description": "Invalid email or password"},
         404: {"model": ErrorHandling, "description": "User not found"},
         422: {"model": ErrorHandling, "description": "Validation Error"},
-        500: {"model": ErrorHandling, "description": "Internal Server Error"}
+        500: {"model": ErrorHandling, "description": "Internal Server Error"},
+        503: {"model": ErrorHandling, "description": "Service busy, retry later"}
     }
 )
 async def activate_user(
@@ -134,7 +159,8 @@ async def activate_user(
         401: {"model": ErrorHandling, "description": "Invalid email or password"},
         404: {"model": ErrorHandling, "description": "User not found"},
         422: {"model": ErrorHandling, "description": "Validation Error"},
-        500: {"model": ErrorHandling, "description": "Internal Server Error"}
+        500: {"model": ErrorHandling, "description": "Internal Server Error"},
+        503: {"model": ErrorHandling, "description": "Service busy, retry later"}
     }
 )
 async def resend_activation_code(
@@ -166,6 +192,74 @@ async def resend_activation_code(
     )
 
 
+@router.get(
+    "/stats",
+    response_model=ApiResponse,
+    responses={
+        500: {"model": ErrorHandling, "description": "Internal Server Error"}
+    }
+)
+async def get_user_stats(
+        service: UserService = Depends(get_user_service)
+) -> ApiResponse:
+    """
+    Get user registration statistics.
+
+    Counts are read from per-status counters maintained alongside every
+    registration, activation and status change, so this is cheap enough to
+    poll.
+
+    **Response:**
+    - total_users: Number of registered users
+    - active_users: Number of activated users
+    - pending_users: Number of users awaiting activation
+    - by_status: Number of users in each status
+    """
+    stats = await service.get_user_stats()
+
+    return ApiResponse(
+        status="success",
+        data=UserStatsResponse(**stats).model_dump()
+    )
+
+
+@router.post(
+    "/status:batch",
+    response_model=ApiResponse,
+    dependencies=[Depends(require_internal_caller)],
+    responses={
+        400: {"model": ErrorHandling, "description": "No keys or too many keys"},
+        403: {"model": ErrorHandling, "description": "Internal access denied"},
+        422: {"model": ErrorHandling, "description": "Validation Error"}
+    }
+)
+async def get_user_statuses(
+        request: UserStatusLookupRequest,
+        service: UserService = Depends(get_user_service)
+) -> ApiResponse:
+    """
+    Look up whether up to 5000 users are registered, and their status.
+
+    For other services, e.g. before sending invites. The whole batch is
+    resolved with one indexed query.
+
+    **Request Body:**
+    - emails or user_ids: The users to look up
+
+    **Response:**
+    - statuses: Status of each email or user_id as sent, null if not registered.
+      Emails are matched case-insensitively in the domain, as at registration.
+
+    Requires the `X-Internal-Token` header.
+    """
+    statuses = await service.get_user_statuses(user_ids=request.user_ids, emails=request.emails)
+
+    return ApiResponse(
+        status="success",
+        data=UserStatusLookupResponse(statuses=statuses).model_dump(mode="json")
+    )
+
+
 @router.get(
     "/health",
     response_model=ApiResponse,
@@ -186,6 +186,97 @@ class AuthenticationException(BaseServiceException):
         )
 
 
+class HashingCapacityException(BaseServiceException):
+    """Exception for when the password hashing pool is saturated."""
+
+    def __init__(self):
+        super().__init__(
+            err_code=DmErrorCode.DM_REG_0011.value,
+            err_status_code=ErrorStatusCode.STATUS_503,
+            err_type=ErrorType.SERVER_NOT_AVAILABLE,
+            err_message=ErrorMessage.MESSAGE_REG_0011[0],
+            err_handling=ErrorMessage.MESSAGE_REG_0011[1]
+        )
+
+
+class AdminAccessDeniedException(BaseServiceException):
+    """Exception for admin endpoints called without a valid admin token."""
+
+    def __init__(self):
+        super().__init__(
+            err_code=DmErrorCode.DM_REG_0012.value,
+            err_status_code=ErrorStatusCode.STATUS_403,
+            err_type=ErrorType.AUTHENTICATION_FAILED,
+            err_message=ErrorMessage.MESSAGE_REG_0012[0],
+            err_handling=ErrorMessage.MESSAGE_REG_0012[1]
+        )
+
+
+class InvalidQueryException(BaseServiceException):
+    """Exception for malformed listing cursors or search terms."""
+
+    def __init__(self, message: str = None):
+        super().__init__(
+            err_code=DmErrorCode.DM_REG_0013.value,
+            err_status_code=ErrorStatusCode.STATUS_400,
+            err_type=ErrorType.INVALID_REQUEST_ERROR,
+            err_message=message or ErrorMessage.MESSAGE_REG_0013[0],
+            err_handling=ErrorMessage.MESSAGE_REG_0013[1]
+        )
+
+
+class InvalidImportFileException(BaseServiceException):
+    """Exception for bulk import files that cannot be read at all."""
+
+    def __init__(self, message: str = None):
+        super().__init__(
+            err_code=DmErrorCode.DM_REG_0014.value,
+            err_status_code=ErrorStatusCode.STATUS_400,
+            err_type=ErrorType.INVALID_REQUEST_ERROR,
+            err_message=message or ErrorMessage.MESSAGE_REG_0014[0],
+            err_handling=ErrorMessage.MESSAGE_REG_0014[1]
+        )
+
+
+class InvalidStatusChangeException(BaseServiceException):
+    """Exception for bulk status changes that cannot be applied as asked."""
+
+    def __init__(self, message: str = None):
+        super().__init__(
+            err_code=DmErrorCode.DM_REG_0015.value,
+            err_status_code=ErrorStatusCode.STATUS_400,
+            err_type=ErrorType.INVALID_REQUEST_ERROR,
+            err_message=message or ErrorMessage.MESSAGE_REG_0015[0],
+            err_handling=ErrorMessage.MESSAGE_REG_0015[1]
+        )
+
+
+class InternalAccessDeniedException(BaseServiceException):
+    """Exception for internal endpoints called without a valid service token."""
+
+    def __init__(self):
+        super().__init__(
+            err_code=DmErrorCode.DM_REG_0016.value,
+            err_status_code=ErrorStatusCode.STATUS_403,
+            err_type=ErrorType.AUTHENTICATION_FAILED,
+            err_message=ErrorMessage.MESSAGE_REG_0016[0],
+            err_handling=ErrorMessage.MESSAGE_REG_0016[1]
+        )
+
+
+class InvalidStatusLookupException(BaseServiceException):
+    """Exception for status lookups without keys or with too many."""
+
+    def __init__(self, message: str = None):
+        super().__init__(
+            err_code=DmErrorCode.DM_REG_0017.value,
+            err_status_code=ErrorStatusCode.STATUS_400,
+            err_type=ErrorType.INVALID_REQUEST_ERROR,
+            err_message=message or ErrorMessage.MESSAGE_REG_0017[0],
+            err_handling=ErrorMessage.MESSAGE_REG_0017[1]
+        )
+
+
 # Exception Handlers
 async def service_exception_handler(
         request: Request,
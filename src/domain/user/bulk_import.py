@@ -0,0 +1,411 @@
+import asyncio
+import codecs
+import csv
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from src.domain.exceptions import (
+    HashingCapacityException,
+    InvalidImportFileException,
+    ValidationException
+)
+from src.domain.user.entities import PasswordValidator, User, normalize_email
+from src.domain.user.repository import UserRepository
+from src.infrastructure.activation_codes.activation_code_store import ActivationCodeStore
+from src.infrastructure.email.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+# A quoted field may span lines; a record longer than this is malformed
+MAX_RECORD_CHARS = 65536
+
+
+class ImportRejectReason(str, Enum):
+    """Why a row of an import file was not imported."""
+    MALFORMED_ROW = "malformed_row"
+    INVALID_EMAIL = "invalid_email"
+    INVALID_PASSWORD = "invalid_password"
+    DUPLICATE_IN_FILE = "duplicate_in_file"
+    ALREADY_REGISTERED = "already_registered"
+    HASHING_FAILED = "hashing_failed"
+
+
+@dataclass
+class ImportReject:
+    """A row left out of the import."""
+
+    line: int
+    email: Optional[str]
+    reason: ImportRejectReason
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert reject to dictionary."""
+        return {"line": self.line, "email": self.email, "reason": self.reason.value}
+
+
+@dataclass
+class ImportReport:
+    """Counts, stage timings and rejects of an import run."""
+
+    rows: int = 0
+    imported: int = 0
+    rejected: int = 0
+    batches: int = 0
+    rejects_by_reason: Dict[str, int] = field(default_factory=dict)
+    # The first rejects only; every one is passed to ``on_reject``
+    rejects: List[ImportReject] = field(default_factory=list)
+    activation_emails_sent: int = 0
+    activation_email_failures: int = 0
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.monotonic)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert report to dictionary."""
+        elapsed = time.monotonic() - self.started_at
+        return {
+            "rows": self.rows,
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "rejects_by_reason": dict(self.rejects_by_reason),
+            "rejects": [reject.to_dict() for reject in self.rejects],
+            "activation_emails_sent": self.activation_emails_sent,
+            "activation_email_failures": self.activation_email_failures,
+            "stage_seconds": {stage: round(seconds, 3) for stage, seconds in self.stage_seconds.items()},
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.rows / elapsed, 1) if elapsed else None,
+        }
+
+
+# (line number, email, password) of a row that parsed
+ImportRow = Tuple[int, str, str]
+
+
+@contextmanager
+def _timed(report: ImportReport, stage: str):
+    """Add the time spent in the block to one of the report's stages."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        report.stage_seconds[stage] = report.stage_seconds.get(stage, 0.0) + time.perf_counter() - started
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of UTF-8 bytes into lines.
+
+    Raises:
+        InvalidImportFileException: If the bytes are not UTF-8
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise InvalidImportFileException("Import file is not valid UTF-8")
+    if pending:
+        yield pending
+
+
+def _parse_record(record: str) -> Optional[List[str]]:
+    """Fields of one CSV record, or None if it does not parse."""
+    try:
+        return next(csv.reader([record]))
+    except csv.Error:
+        return None
+
+
+async def iter_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Optional[List[str]]]]:
+    """
+    Group lines into CSV records, joining the lines of quoted fields.
+
+    Blank lines between records are skipped. A record that is still inside
+    quotes at the end of the file, or past ``MAX_RECORD_CHARS``, is
+    malformed.
+
+    Yields:
+        (number of the record's first line, its fields or None if malformed)
+    """
+    line_number = 0
+    record: Optional[str] = None
+    first_line = 0
+    quotes = 0
+    async for line in lines:
+        line_number += 1
+        line = line.rstrip("\r")
+        if record is None:
+            if not line.strip():
+                continue
+            record, first_line, quotes = line, line_number, 0
+        else:
+            record += "\n" + line
+        # Escaped quotes come in pairs, so an odd count is an open field
+        quotes += line.count('"')
+        if quotes % 2 and len(record) <= MAX_RECORD_CHARS:
+            continue
+        yield first_line, None if quotes % 2 else _parse_record(record)
+        record = None
+    if record is not None:
+        yield first_line, None
+
+
+class UserImporter:
+    """
+    Imports users from a CSV with ``email`` and ``password`` columns.
+
+    The file is streamed and handled ``batch_size`` rows at a time, each
+    batch through the same stages: validate (normalizing emails as the
+    registration endpoint does), drop emails already registered (one COPY
+    into a temporary table and a join, before any hashing is spent on
+    them), hash the passwords ``hash_concurrency`` at a time on the hashing
+    backend's pool, load with COPY, then optionally issue codes and queue
+    activation emails. Bad rows are rejected one by one and never abort
+    their batch.
+
+    Rows are not imported in one transaction: a stopped run leaves its
+    finished batches in place, and running the same file again skips them
+    as already registered.
+    """
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        activation_code_store: Optional[ActivationCodeStore] = None,
+        email_service: Optional[EmailService] = None,
+        batch_size: int = 1000,
+        hash_concurrency: int = 4,
+        max_reported_rejects: int = 1000,
+        hash_retry_seconds: float = 0.1,
+        hash_retries: int = 50,
+        activation_concurrency: int = 10
+    ):
+        if batch_size < 1:
+            raise ValueError("Import batch size must be at least 1")
+        if hash_concurrency < 1:
+            raise ValueError("Import hash concurrency must be at least 1")
+        if activation_concurrency < 1:
+            raise ValueError("Import activation concurrency must be at least 1")
+        self.user_repository = user_repository
+        self.activation_code_store = activation_code_store
+        self.email_service = email_service
+        self.batch_size = batch_size
+        self.hash_concurrency = hash_concurrency
+        self.max_reported_rejects = max_reported_rejects
+        self.hash_retry_seconds = hash_retry_seconds
+        self.hash_retries = hash_retries
+        self.activation_concurrency = activation_concurrency
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings,
+        user_repository: UserRepository,
+        activation_code_store: Optional[ActivationCodeStore] = None,
+        email_service: Optional[EmailService] = None
+    ) -> 'UserImporter':
+        """Build an importer from application settings."""
+        return cls(
+            user_repository,
+            activation_code_store=activation_code_store,
+            email_service=email_service,
+            batch_size=settings.bulk_import_batch_size,
+            hash_concurrency=settings.bulk_import_hash_concurrency
+        )
+
+    async def run(
+        self,
+        lines: AsyncIterator[str],
+        send_activation: bool = False,
+        on_reject: Optional[Callable[[ImportReject], None]] = None,
+        on_batch: Optional[Callable[[ImportReport], None]] = None
+    ) -> ImportReport:
+        """
+        Import every row of a CSV.
+
+        Args:
+            lines: Lines of the file, the header first; quoted fields may
+                span lines, and rejects give the first line of their row
+            send_activation: Issue an activation code to each imported user
+                and queue its email
+            on_reject: Called with every rejected row
+            on_batch: Called with the report after every batch
+
+        Returns:
+            The final report
+
+        Raises:
+            InvalidImportFileException: If the header lacks email or password
+        """
+        if send_activation and (self.activation_code_store is None or self.email_service is None):
+            raise ValueError("Sending activation emails needs a code store and an email service")
+
+        report = ImportReport()
+        columns = None
+        batch: List[ImportRow] = []
+
+        async for line_number, fields in iter_records(lines):
+            if columns is None:
+                columns = self._read_header(fields)
+                continue
+
+            report.rows += 1
+            email_column, password_column = columns
+            if fields is None or len(fields) <= max(email_column, password_column):
+                self._reject(report, ImportReject(line_number, None, ImportRejectReason.MALFORMED_ROW), on_reject)
+                continue
+            batch.append((line_number, fields[email_column].strip(), fields[password_column]))
+            if len(batch) >= self.batch_size:
+                await self._import_batch(batch, report, send_activation, on_reject)
+                batch = []
+                if on_batch:
+                    on_batch(report)
+
+        if columns is None:
+            raise InvalidImportFileException("Import file is empty")
+        if batch:
+            await self._import_batch(batch, report, send_activation, on_reject)
+            if on_batch:
+                on_batch(report)
+
+        logger.info(
+            f"User import finished: {report.imported} imported, {report.rejected} rejected "
+            f"of {report.rows} rows in {report.batches} batches"
+        )
+        return report
+
+    @staticmethod
+    def _read_header(fields: Optional[List[str]]) -> Tuple[int, int]:
+        names = [name.strip().lower() for name in fields or []]
+        if "email" not in names or "password" not in names:
+            raise InvalidImportFileException("Import file header must have email and password columns")
+        return names.index("email"), names.index("password")
+
+    async def _import_batch(
+        self,
+        rows: List[ImportRow],
+        report: ImportReport,
+        send_activation: bool,
+        on_reject: Optional[Callable[[ImportReject], None]]
+    ) -> None:
+        report.batches += 1
+
+        with _timed(report, "validate"):
+            candidates: Dict[str, Tuple[int, User, str]] = {}
+            for line, email, password in rows:
+                try:
+                    PasswordValidator.validate(password)
+                except ValidationException:
+                    self._reject(report, ImportReject(line, email, ImportRejectReason.INVALID_PASSWORD), on_reject)
+                    continue
+                try:
+                    # Stored like an API registration, so duplicates match
+                    email = normalize_email(email)
+                    # Hashed later, once the email is known to be new
+                    user = User(email=email, password_hash="")
+                except ValidationException:
+                    self._reject(report, ImportReject(line, email, ImportRejectReason.INVALID_EMAIL), on_reject)
+                    continue
+                if email in candidates:
+                    self._reject(report, ImportReject(line, email, ImportRejectReason.DUPLICATE_IN_FILE), on_reject)
+                    continue
+                candidates[email] = (line, user, password)
+        if not candidates:
+            return
+
+        with _timed(report, "dedupe"):
+            registered = await self.user_repository.find_registered_emails(list(candidates))
+            for email in registered:
+                line, _, _ = candidates.pop(email)
+                self._reject(report, ImportReject(line, email, ImportRejectReason.ALREADY_REGISTERED), on_reject)
+        if not candidates:
+            return
+
+        with _timed(report, "hash"):
+            semaphore = asyncio.Semaphore(self.hash_concurrency)
+
+            async def hash_one(user: User, password: str) -> bool:
+                async with semaphore:
+                    user.password_hash = await self._hash_password(password)
+                    return user.password_hash is not None
+
+            hashed = await asyncio.gather(*(hash_one(user, password) for _, user, password in candidates.values()))
+            for email, ok in zip(list(candidates), hashed):
+                if not ok:
+                    line, _, _ = candidates.pop(email)
+                    self._reject(report, ImportReject(line, email, ImportRejectReason.HASHING_FAILED), on_reject)
+        if not candidates:
+            return
+
+        with _timed(report, "load"):
+            inserted = await self.user_repository.import_users([user for _, user, _ in candidates.values()])
+            for email in list(candidates):
+                if email not in inserted:
+                    line, _, _ = candidates.pop(email)
+                    self._reject(report, ImportReject(line, email, ImportRejectReason.ALREADY_REGISTERED), on_reject)
+            report.imported += len(candidates)
+
+        if send_activation:
+            with _timed(report, "activation"):
+                await self._send_activation_codes([user for _, user, _ in candidates.values()], report)
+
+    async def _hash_password(self, password: str) -> Optional[str]:
+        """Hash on the shared pool, backing off while it is saturated."""
+        for _ in range(self.hash_retries):
+            try:
+                return await self.user_repository.hashing_backend.hash_password(password)
+            except HashingCapacityException:
+                await asyncio.sleep(self.hash_retry_seconds)
+            except Exception as e:
+                logger.error(f"Failed to hash an imported password: {str(e)}")
+                return None
+        return None
+
+    async def _send_activation_codes(self, users: List[User], report: ImportReport) -> None:
+        """
+        Issue a code to each user and queue the emails, one batch at a time.
+
+        At most ``activation_concurrency`` users are in flight, so a batch
+        does not take every connection from the pool or flood the broker.
+        """
+        semaphore = asyncio.Semaphore(self.activation_concurrency)
+
+        async def send(user: User) -> bool:
+            async with semaphore:
+                try:
+                    activation_code = await self.activation_code_store.issue(user)
+                    await self.email_service.send_activation_code(
+                        email=user.email,
+                        activation_code=activation_code.code,
+                        user_id=user.user_id
+                    )
+                    return True
+                except Exception as e:
+                    logger.error(f"Failed to send activation code to imported user {user.user_id}: {str(e)}")
+                    return False
+
+        sent = await asyncio.gather(*(send(user) for user in users))
+        report.activation_emails_sent += sum(sent)
+        report.activation_email_failures += len(sent) - sum(sent)
+
+    def _reject(
+        self,
+        report: ImportReport,
+        reject: ImportReject,
+        on_reject: Optional[Callable[[ImportReject], None]]
+    ) -> None:
+        report.rejected += 1
+        report.rejects_by_reason[reject.reason.value] = report.rejects_by_reason.get(reject.reason.value, 0) + 1
+        if len(report.rejects) < self.max_reported_rejects:
+            report.rejects.append(reject)
+        if on_reject:
+            on_reject(reject)
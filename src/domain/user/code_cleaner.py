@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.domain.user.repository import ActivationCodeRepository
+
+logger = logging.getLogger(__name__)
+
+_NO_USER_ID = uuid.UUID(int=0)
+
+
+@dataclass
+class CleanupProgress:
+    """Where a cleanup run is, and how to resume it."""
+
+    last_user_id: uuid.UUID = _NO_USER_ID
+    batches: int = 0
+    scanned: int = 0
+    deleted: int = 0
+    throttled_seconds: float = 0.0
+    finished: bool = False
+    started_at: float = field(default_factory=time.monotonic)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert progress to dictionary."""
+        return {
+            "last_user_id": str(self.last_user_id),
+            "batches": self.batches,
+            "scanned": self.scanned,
+            "deleted": self.deleted,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "finished": self.finished,
+            "elapsed_seconds": round(time.monotonic() - self.started_at, 3),
+        }
+
+
+class ActivationCodeCleaner:
+    """
+    Deletes expired and used activation codes in small, paced batches.
+
+    Each batch is one short statement over the next ``batch_size`` rows in
+    primary key order, skipping rows a concurrent activation has locked.
+    Between batches the cleaner sleeps to stay under ``max_rows_per_second``
+    and waits while standbys lag more than ``max_replication_lag_seconds``,
+    so that a large backlog drains without a lock or WAL spike.
+
+    The primary key cursor is the resume point: a run stopped through
+    ``stop`` (or cancelled) reports ``last_user_id``, and a run started
+    after it picks up where the first one left off.
+    """
+
+    def __init__(
+        self,
+        activation_code_repository: ActivationCodeRepository,
+        batch_size: int = 1000,
+        max_rows_per_second: float = 0.0,
+        replication_lag: Optional[Callable[[], Awaitable[float]]] = None,
+        max_replication_lag_seconds: float = 0.0,
+        lag_poll_seconds: float = 1.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if batch_size < 1:
+            raise ValueError("Cleanup batch size must be at least 1")
+        self.activation_code_repository = activation_code_repository
+        self.batch_size = batch_size
+        self.max_rows_per_second = max_rows_per_second
+        self.replication_lag = replication_lag
+        self.max_replication_lag_seconds = max_replication_lag_seconds
+        self.lag_poll_seconds = lag_poll_seconds
+        self._sleep = sleep
+        self._clock = clock
+        self.progress: Optional[CleanupProgress] = None
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings,
+        activation_code_repository: ActivationCodeRepository,
+        replication_lag: Optional[Callable[[], Awaitable[float]]] = None
+    ) -> 'ActivationCodeCleaner':
+        """Build a cleaner from application settings."""
+        return cls(
+            activation_code_repository,
+            batch_size=settings.activation_code_cleanup_batch_size,
+            max_rows_per_second=settings.activation_code_cleanup_max_rows_per_second,
+            replication_lag=replication_lag,
+            max_replication_lag_seconds=settings.activation_code_cleanup_max_replication_lag_seconds
+        )
+
+    async def run(
+        self,
+        start_after: Optional[uuid.UUID] = None,
+        stop: Optional[asyncio.Event] = None,
+        on_batch: Optional[Callable[[CleanupProgress], None]] = None
+    ) -> CleanupProgress:
+        """
+        Clean up until the end of the table or until ``stop`` is set.
+
+        Args:
+            start_after: user_id to resume after, from an earlier run
+            stop: Event that ends the run after the current batch
+            on_batch: Called with the progress after every batch
+
+        Returns:
+            Final progress; ``finished`` is False if the run was stopped
+        """
+        progress = self.progress = CleanupProgress(last_user_id=start_after or _NO_USER_ID)
+
+        while stop is None or not stop.is_set():
+            batch_started = self._clock()
+            last_user_id, scanned, deleted = await self.activation_code_repository.delete_expired_codes_batch(
+                progress.last_user_id, self.batch_size
+            )
+            progress.batches += 1
+            progress.scanned += scanned
+            progress.deleted += deleted
+            if last_user_id is not None:
+                progress.last_user_id = last_user_id
+            if on_batch:
+                on_batch(progress)
+
+            if scanned < self.batch_size:
+                progress.finished = True
+                break
+            await self._throttle(progress, deleted, self._clock() - batch_started)
+
+        logger.info(
+            f"Activation code cleanup {'finished' if progress.finished else 'stopped'}: "
+            f"deleted {progress.deleted} of {progress.scanned} scanned in {progress.batches} batches"
+        )
+        return progress
+
+    async def _throttle(self, progress: CleanupProgress, deleted: int, batch_seconds: float) -> None:
+        """Sleep off the rate limit, then wait for standbys to catch up."""
+        if self.max_rows_per_second > 0 and deleted:
+            pause = deleted / self.max_rows_per_second - batch_seconds
+            if pause > 0:
+                progress.throttled_seconds += pause
+                await self._sleep(pause)
+
+        if self.replication_lag is None or self.max_replication_lag_seconds <= 0:
+            return
+        while (lag := await self.replication_lag()) > self.max_replication_lag_seconds:
+            logger.info(f"Activation code cleanup waiting for replication lag of {lag:.1f}s")
+            progress.throttled_seconds += self.lag_poll_seconds
+            await self._sleep(self.lag_poll_seconds)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get the progress of the current or last run."""
+        return self.progress.to_dict() if self.progress else {}
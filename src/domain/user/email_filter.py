@@ -0,0 +1,169 @@
+import asyncio
+import fcntl
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from src.infrastructure.cache.bloom_filter import ScalableBloomFilter
+
+logger = logging.getLogger(__name__)
+
+_START_OF_TIME = datetime.min.replace(tzinfo=timezone.utc)
+_NO_USER_ID = uuid.UUID(int=0)
+
+# Emails added between yields to the event loop during warm-up
+WARM_UP_YIELD_EVERY = 500
+
+
+class RegisteredEmailFilter:
+    """
+    Bloom filter of registered emails, in front of the registration pre-check.
+
+    "Not in the filter" means the email is definitely new, so registration
+    can skip the lookup on ``users.email``. A false "maybe" only costs the
+    lookup. Emails registered through another worker since the last warm-up
+    are not in this process's filter, but a missed duplicate still ends in
+    the insert's ON CONFLICT and a clean 409, just after a wasted hash.
+
+    Warm-up streams the users table in (created_at, user_id) order from the
+    watermark stored with the snapshot, so a restart with a snapshot only
+    reads the rows added since. ``created_at`` is set before the insert
+    commits, so a row can become visible after rows with a later value;
+    warm-up re-reads the last ``watermark_overlap_seconds`` before the
+    watermark to pick those up.
+
+    All workers load the same snapshot file, but only the one holding its
+    lock file writes it.
+    """
+
+    def __init__(
+        self,
+        bloom: ScalableBloomFilter,
+        batch_size: int = 10000,
+        watermark_overlap_seconds: float = 300.0
+    ):
+        self.bloom = bloom
+        self.batch_size = batch_size
+        self.watermark_overlap_seconds = watermark_overlap_seconds
+        self.ready = False
+        self.warm_up_seconds: Optional[float] = None
+        self.snapshot_owner = False
+        self._snapshot_lock = None
+
+    @classmethod
+    def from_settings(cls, settings) -> 'RegisteredEmailFilter':
+        """Load the snapshot if there is a usable one, else start empty."""
+        path = settings.email_filter_snapshot_path
+        bloom = None
+        if path and os.path.exists(path):
+            try:
+                bloom = ScalableBloomFilter.load(path)
+                logger.info(f"Loaded email filter snapshot with {len(bloom)} emails from {path}")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring email filter snapshot: {str(e)}")
+        if bloom is None:
+            bloom = ScalableBloomFilter(
+                initial_capacity=settings.email_filter_capacity,
+                error_rate=settings.email_filter_error_rate
+            )
+        email_filter = cls(
+            bloom,
+            batch_size=settings.email_filter_warmup_batch_size,
+            watermark_overlap_seconds=settings.email_filter_watermark_overlap_seconds
+        )
+        if path:
+            email_filter.claim_snapshot(path)
+        return email_filter
+
+    def claim_snapshot(self, path: str) -> bool:
+        """
+        Become the one process that writes the snapshot at ``path``.
+
+        Takes an exclusive lock on ``<path>.lock``, held for the life of the
+        process, so workers sharing the path do not overwrite each other.
+
+        Returns:
+            True if this process now owns the snapshot
+        """
+        try:
+            lock_file = open(f"{path}.lock", "a")
+        except OSError as e:
+            logger.warning(f"Email filter snapshot will not be saved: {str(e)}")
+            return False
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._snapshot_lock = lock_file
+        self.snapshot_owner = True
+        return True
+
+    def might_exist(self, email: str) -> bool:
+        """False only if the email is certainly not registered."""
+        return not self.ready or email in self.bloom
+
+    def add(self, email: str) -> None:
+        """Record a registered email."""
+        self.bloom.add(email)
+
+    async def warm_up(self, user_repository) -> int:
+        """
+        Add every email registered since the watermark.
+
+        Yields to the event loop every few hundred emails, so requests are
+        still served while a large table is read.
+
+        Args:
+            user_repository: Repository to stream emails from
+
+        Returns:
+            Number of rows read
+        """
+        started_at = time.perf_counter()
+        watermark = self.bloom.metadata.get("watermark")
+        after_created_at, after_user_id = _START_OF_TIME, _NO_USER_ID
+        if watermark:
+            after_created_at = datetime.fromisoformat(watermark["created_at"]) - timedelta(
+                seconds=self.watermark_overlap_seconds
+            )
+
+        rows = 0
+        async for batch in user_repository.stream_registered_emails(
+            after_created_at, after_user_id, self.batch_size
+        ):
+            # Hashing a full batch would hold the loop for tens of ms
+            for start in range(0, len(batch), WARM_UP_YIELD_EVERY):
+                for record in batch[start:start + WARM_UP_YIELD_EVERY]:
+                    self.bloom.add(record['email'])
+                await asyncio.sleep(0)
+            rows += len(batch)
+            last = batch[-1]
+            after_created_at, after_user_id = last['created_at'], last['user_id']
+            self.bloom.metadata["watermark"] = {
+                "created_at": after_created_at.isoformat(),
+                "user_id": str(after_user_id),
+            }
+
+        self.ready = True
+        self.warm_up_seconds = time.perf_counter() - started_at
+        logger.info(f"Email filter warmed up: {rows} new rows, {len(self.bloom)} emails in {self.warm_up_seconds:.2f}s")
+        return rows
+
+    def save(self, path: str) -> None:
+        """Write a snapshot (with the watermark) for the next start."""
+        self.bloom.save(path)
+        logger.info(f"Saved email filter snapshot to {path}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get filter size and state."""
+        return {
+            "ready": self.ready,
+            "emails": len(self.bloom),
+            "stages": len(self.bloom.filters),
+            "size_bytes": self.bloom.size_bytes,
+            "warm_up_seconds": round(self.warm_up_seconds, 3) if self.warm_up_seconds is not None else None,
+        }
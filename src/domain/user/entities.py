@@ -3,9 +3,11 @@ import uuid
 import random
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, FrozenSet, List, Mapping
 from dataclasses import dataclass, field
 
+from email_validator import EmailNotValidError, validate_email
+
 from src.domain.exceptions import ValidationException
 from src.schemas.common.errors import DmErrorCode, ErrorMessage
 
@@ -15,6 +17,26 @@ def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def normalize_email(email: str) -> str:
+    """
+    Normalize an email the way the API's ``EmailStr`` fields do.
+
+    Emails that skip request validation (import files, lookup keys) go
+    through this, so they match the stored spelling.
+
+    Raises:
+        ValidationException: If the email is not valid
+    """
+    try:
+        return validate_email(email, check_deliverability=False).normalized
+    except EmailNotValidError:
+        raise ValidationException(
+            err_message=ErrorMessage.MESSAGE_REG_0001[0],
+            err_handling=ErrorMessage.MESSAGE_REG_0001[1],
+            err_code=DmErrorCode.DM_REG_0001.value
+        )
+
+
 class UserStatus(str, Enum):
     PENDING = "PENDING"
     ACTIVE = "ACTIVE"
@@ -22,23 +44,85 @@ class UserStatus(str, Enum):
     SUSPENDED = "SUSPENDED"
 
 
+class CodeConsumeResult(str, Enum):
+    """Result of consuming an activation code from a code store."""
+    CONSUMED = "CONSUMED"
+    NOT_FOUND = "NOT_FOUND"
+    USED = "USED"
+    EXPIRED = "EXPIRED"
+
+
+# Decodes stored status strings to the interned members without going
+# through Enum.__call__
+USER_STATUS_BY_VALUE: Dict[str, UserStatus] = {status.value: status for status in UserStatus}
+
+
+# Statuses an operator can move users to, each with the statuses it may be
+# reached from. Users never go back to PENDING, and leave it for ACTIVE
+# only through their activation code.
+STATUS_TRANSITIONS: Dict[UserStatus, FrozenSet[UserStatus]] = {
+    UserStatus.ACTIVE: frozenset({UserStatus.INACTIVE, UserStatus.SUSPENDED}),
+    UserStatus.INACTIVE: frozenset({UserStatus.PENDING, UserStatus.ACTIVE, UserStatus.SUSPENDED}),
+    UserStatus.SUSPENDED: frozenset({UserStatus.PENDING, UserStatus.ACTIVE, UserStatus.INACTIVE}),
+}
+
+
+class StatusChangeSkip(str, Enum):
+    """Why a bulk status change left a user as it was."""
+    NOT_FOUND = "NOT_FOUND"
+    ALREADY_IN_STATUS = "ALREADY_IN_STATUS"
+    NOT_ALLOWED = "NOT_ALLOWED"
+    CHANGED_CONCURRENTLY = "CHANGED_CONCURRENTLY"
+
+
 @dataclass
+class BulkStatusChange:
+    """Outcome of moving a list of users to one status."""
+
+    status: UserStatus
+    updated: List[uuid.UUID] = field(default_factory=list)
+    # Keyed by the user_id or email as given
+    skipped: Dict[str, StatusChangeSkip] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the outcome to dictionary."""
+        return {
+            'status': self.status.value,
+            'updated_count': len(self.updated),
+            'updated': [str(user_id) for user_id in self.updated],
+            'skipped': {key: reason.value for key, reason in self.skipped.items()},
+        }
+
+
+class ActivationOutcome(str, Enum):
+    """Result of a single-statement activation attempt."""
+    ACTIVATED = "ACTIVATED"
+    USER_NOT_FOUND = "USER_NOT_FOUND"
+    ALREADY_ACTIVE = "ALREADY_ACTIVE"
+    CODE_NOT_FOUND = "CODE_NOT_FOUND"
+    CODE_USED = "CODE_USED"
+    CODE_EXPIRED = "CODE_EXPIRED"
+
+
+@dataclass(slots=True)
 class User:
     """User domain entity."""
     
     email: str
     password_hash: str
     status: UserStatus = UserStatus.PENDING
-    user_id: Optional[str] = None
+    user_id: Optional[uuid.UUID] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     activated_at: Optional[datetime] = None
+    # Bumped on every resend; derived (HMAC) activation codes depend on it
+    activation_nonce: int = 0
     
     def __post_init__(self):
         """Validate user data after initialization."""
         self.validate_email()
         if not self.user_id:
-            self.user_id = str(uuid.uuid4())
+            self.user_id = uuid.uuid4()
         if not self.created_at:
             self.created_at = utc_now()
         self.updated_at = utc_now()
@@ -66,7 +150,7 @@ class User:
     def to_dict(self) -> Dict[str, Any]:
         """Convert user to dictionary."""
         return {
-            'user_id': self.user_id,
+            'user_id': str(self.user_id) if self.user_id else None,
             'email': self.email,
             'password_hash': self.password_hash,
             'status': self.status.value,
@@ -88,6 +172,39 @@ class User:
             activated_at=datetime.fromisoformat(data['activated_at']) if data.get('activated_at') else None,
         )
     
+    @classmethod
+    def from_record(cls, record: Mapping[str, Any]) -> 'User':
+        """
+        Create user from a trusted database record.
+        
+        Rows from our own tables are already valid, so this skips
+        ``__post_init__``: no email regex, no clock reads, no new UUID, and
+        the stored ``updated_at`` is kept. ``user_id`` stays a ``uuid.UUID``.
+        """
+        user = cls.__new__(cls)
+        user.user_id = record['user_id']
+        user.email = record['email']
+        user.password_hash = record['password_hash']
+        user.status = USER_STATUS_BY_VALUE[record['status']]
+        user.created_at = record['created_at']
+        user.updated_at = record['updated_at']
+        user.activated_at = record['activated_at']
+        user.activation_nonce = record['activation_nonce']
+        return user
+    
+    def freeze(self) -> 'FrozenUser':
+        """Get an immutable copy, e.g. to share from a cache."""
+        return FrozenUser(
+            self.email,
+            self.password_hash,
+            self.status,
+            self.user_id,
+            self.created_at,
+            self.updated_at,
+            self.activated_at,
+            self.activation_nonce
+        )
+    
     @classmethod
     def from_db_row(cls, row: tuple) -> 'User':
         """Create user from database row."""
@@ -102,11 +219,56 @@ class User:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class FrozenUser:
+    """Immutable, slotted user snapshot for caches and bulk reads."""
+    
+    email: str
+    password_hash: str
+    status: UserStatus
+    user_id: uuid.UUID
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    activated_at: Optional[datetime] = None
+    activation_nonce: int = 0
+    
+    def is_active(self) -> bool:
+        """Check if user is active."""
+        return self.status == UserStatus.ACTIVE
+    
+    @classmethod
+    def from_record(cls, record: Mapping[str, Any]) -> 'FrozenUser':
+        """Create a snapshot from a trusted database record."""
+        return cls(
+            record['email'],
+            record['password_hash'],
+            USER_STATUS_BY_VALUE[record['status']],
+            record['user_id'],
+            record['created_at'],
+            record['updated_at'],
+            record['activated_at'],
+            record['activation_nonce']
+        )
+    
+    def thaw(self) -> User:
+        """Get a mutable User with the same values, skipping validation."""
+        user = User.__new__(User)
+        user.user_id = self.user_id
+        user.email = self.email
+        user.password_hash = self.password_hash
+        user.status = self.status
+        user.created_at = self.created_at
+        user.updated_at = self.updated_at
+        user.activated_at = self.activated_at
+        user.activation_nonce = self.activation_nonce
+        return user
+
+
+@dataclass(slots=True)
 class ActivationCode:
     """Activation code domain entity."""
     
-    user_id: str
+    user_id: uuid.UUID
     code: str
     expires_at: datetime
     created_at: Optional[datetime] = None
@@ -119,7 +281,7 @@ class ActivationCode:
             self.created_at = utc_now()
     
     @classmethod
-    def generate_for_user(cls, user_id: str) -> 'ActivationCode':
+    def generate_for_user(cls, user_id: uuid.UUID) -> 'ActivationCode':
         """Generate a new activation code for user."""
         code = f"{random.randint(1000, 9999):04d}"
         expires_at = utc_now() + timedelta(minutes=1)
@@ -149,7 +311,7 @@ class ActivationCode:
     def to_dict(self) -> Dict[str, Any]:
         """Convert activation code to dictionary."""
         return {
-            'user_id': self.user_id,
+            'user_id': str(self.user_id),
             'code': self.code,
             'expires_at': self.expires_at.isoformat(),
             'created_at': self.created_at.isoformat() if self.created_at else None,
@@ -169,6 +331,29 @@ class ActivationCode:
             is_used=data.get('is_used', False),
         )
     
+    @classmethod
+    def from_record(cls, record: Mapping[str, Any]) -> 'ActivationCode':
+        """Create activation code from a trusted database record, skipping ``__post_init__``."""
+        activation_code = cls.__new__(cls)
+        activation_code.user_id = record['user_id']
+        activation_code.code = record['code']
+        activation_code.expires_at = record['expires_at']
+        activation_code.created_at = record['created_at']
+        activation_code.used_at = record['used_at']
+        activation_code.is_used = record['is_used']
+        return activation_code
+    
+    def freeze(self) -> 'FrozenActivationCode':
+        """Get an immutable copy."""
+        return FrozenActivationCode(
+            self.user_id,
+            self.code,
+            self.expires_at,
+            self.created_at,
+            self.used_at,
+            self.is_used
+        )
+    
     @classmethod
     def from_db_row(cls, row: tuple) -> 'ActivationCode':
         """Create activation code from database row."""
@@ -182,6 +367,34 @@ class ActivationCode:
         )
 
 
+@dataclass(frozen=True, slots=True)
+class FrozenActivationCode:
+    """Immutable, slotted activation code snapshot."""
+    
+    user_id: uuid.UUID
+    code: str
+    expires_at: datetime
+    created_at: Optional[datetime] = None
+    used_at: Optional[datetime] = None
+    is_used: bool = False
+    
+    def is_expired(self) -> bool:
+        """Check if activation code is expired."""
+        return utc_now() >= self.expires_at
+    
+    @classmethod
+    def from_record(cls, record: Mapping[str, Any]) -> 'FrozenActivationCode':
+        """Create a snapshot from a trusted database record."""
+        return cls(
+            record['user_id'],
+            record['code'],
+            record['expires_at'],
+            record['created_at'],
+            record['used_at'],
+            record['is_used']
+        )
+
+
 class PasswordValidator:
     """Password validation utility."""
     
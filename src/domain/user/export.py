@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, List, Mapping, Optional
+
+EXPORT_COLUMNS = ("user_id", "email", "status", "created_at", "updated_at", "activated_at")
+
+
+class ExportFormat(str, Enum):
+    """Output formats of the user export."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        return "application/x-ndjson" if self is ExportFormat.NDJSON else "text/csv"
+
+
+def _values(row: Mapping[str, Any]) -> List[Optional[str]]:
+    return [
+        str(row["user_id"]),
+        row["email"],
+        row["status"],
+        row["created_at"].isoformat() if row["created_at"] else None,
+        row["updated_at"].isoformat() if row["updated_at"] else None,
+        row["activated_at"].isoformat() if row["activated_at"] else None,
+    ]
+
+
+def _ndjson_line(row: Mapping[str, Any]) -> str:
+    return json.dumps(dict(zip(EXPORT_COLUMNS, _values(row))), separators=(",", ":")) + "\n"
+
+
+async def encode_ndjson(rows: AsyncIterator[Mapping[str, Any]], rows_per_chunk: int = 1000) -> AsyncIterator[bytes]:
+    """
+    Encode rows as one JSON object per line.
+
+    Args:
+        rows: User records
+        rows_per_chunk: Rows joined into each yielded chunk
+
+    Yields:
+        UTF-8 chunks of ``rows_per_chunk`` lines (fewer for the last one)
+    """
+    async for chunk in _chunked(rows, rows_per_chunk, _ndjson_line):
+        yield chunk
+
+
+async def encode_csv(rows: AsyncIterator[Mapping[str, Any]], rows_per_chunk: int = 1000) -> AsyncIterator[bytes]:
+    """
+    Encode rows as CSV with a header line; NULLs become empty fields.
+
+    Args:
+        rows: User records
+        rows_per_chunk: Rows joined into each yielded chunk
+
+    Yields:
+        UTF-8 chunks, the header first
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def line(row: Mapping[str, Any]) -> str:
+        writer.writerow(_values(row))
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    yield (",".join(EXPORT_COLUMNS) + "\n").encode("utf-8")
+    async for chunk in _chunked(rows, rows_per_chunk, line):
+        yield chunk
+
+
+async def _chunked(
+    rows: AsyncIterator[Mapping[str, Any]],
+    rows_per_chunk: int,
+    encode: Callable[[Mapping[str, Any]], str]
+) -> AsyncIterator[bytes]:
+    # One write per chunk instead of per row; at most one chunk is held
+    lines: List[str] = []
+    async for row in rows:
+        lines.append(encode(row))
+        if len(lines) >= rows_per_chunk:
+            yield "".join(lines).encode("utf-8")
+            lines = []
+    if lines:
+        yield "".join(lines).encode("utf-8")
+
+
+ENCODERS = {
+    ExportFormat.NDJSON: encode_ndjson,
+    ExportFormat.CSV: encode_csv,
+}
+
+
+def encode_export(
+    rows: AsyncIterator[Mapping[str, Any]],
+    export_format: ExportFormat,
+    rows_per_chunk: int = 1000
+) -> AsyncIterator[bytes]:
+    """Encode rows in the given export format."""
+    return ENCODERS[export_format](rows, rows_per_chunk)
@@ -1,14 +1,34 @@
 import logging
-from typing import Optional, List
+import uuid
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional, List, Set, Tuple
 from datetime import datetime
-import bcrypt
 
 from src.infrastructure.database.postgresql_client import PostgreSQLClient
-from src.domain.user.entities import User, ActivationCode, UserStatus
+from src.infrastructure.hashing.hashing_backend import PasswordHashingBackend, LocalHashingBackend
+from src.infrastructure.hashing.hashing_executor import HashingExecutor
+from src.infrastructure.hashing.password_hasher import PasswordHasherRegistry, BcryptHasher
+from src.infrastructure.cache.user_cache import UserCache
+from src.domain.user.email_filter import RegisteredEmailFilter
+from src.domain.user.statements import (
+    IMPORT_EMAILS_TABLE,
+    IMPORT_EXISTING_EMAILS,
+    IMPORT_USERS_LOAD,
+    IMPORT_USERS_TABLE
+)
+from src.domain.user.entities import (
+    FrozenUser,
+    User,
+    ActivationCode,
+    ActivationOutcome,
+    CodeConsumeResult,
+    UserStatus,
+    utc_now
+)
 from src.domain.exceptions import (
     DatabaseException,
     UserNotFoundException,
-    EmailAlreadyExistsException
+    EmailAlreadyExistsException,
+    HashingCapacityException
 )
 
 logger = logging.getLogger(__name__)
@@ -17,8 +37,41 @@ logger = logging.getLogger(__name__)
 class UserRepository:
     """Repository for user-related database operations."""
 
-    def __init__(self, db_client: PostgreSQLClient):
+    def __init__(
+        self,
+        db_client: PostgreSQLClient,
+        hashing_backend: Optional[PasswordHashingBackend] = None,
+        email_precheck: str = "auto",
+        email_precheck_min_hash_ms: float = 50.0,
+        user_cache: Optional[UserCache] = None,
+        email_filter: Optional[RegisteredEmailFilter] = None
+    ):
+        if email_precheck not in ("auto", "always", "never"):
+            raise ValueError(f"Unknown email pre-check mode: {email_precheck}")
         self.db_client = db_client
+        self.hashing_backend = hashing_backend or LocalHashingBackend(
+            HashingExecutor(), PasswordHasherRegistry(BcryptHasher())
+        )
+        self.email_precheck = email_precheck
+        self.email_precheck_min_hash_ms = email_precheck_min_hash_ms
+        self.user_cache = user_cache
+        self.email_filter = email_filter
+
+    def _should_precheck_email(self, email: str) -> bool:
+        """
+        Decide whether to look up the email before hashing.
+        
+        The insert alone detects duplicates; the extra round trip only pays
+        off when a hash is expensive enough that wasting one on a duplicate
+        costs more than the lookup. Until a hash has been timed, assume it is.
+        An email the filter has never seen is certainly new: no lookup.
+        """
+        if self.email_filter and not self.email_filter.might_exist(email):
+            return False
+        if self.email_precheck != "auto":
+            return self.email_precheck == "always"
+        average_hash_ms = self.hashing_backend.average_hash_ms()
+        return average_hash_ms is None or average_hash_ms >= self.email_precheck_min_hash_ms
 
     async def create_user(self, email: str, password: str) -> User:
         """
@@ -33,41 +86,122 @@ class UserRepository:
             
         Raises:
             EmailAlreadyExistsException: If email already exists
+            HashingCapacityException: If hashing capacity is exhausted
             DatabaseException: For database errors
         """
-        # Check if email already exists
-        existing_user = await self.get_user_by_email(email, raise_if_not_found=False)
-        if existing_user:
-            raise EmailAlreadyExistsException()
+        user = await self._build_new_user(email, password)
+
+        # Insert into database; a concurrent registration of the same email
+        # loses on the unique constraint and gets no row back
+        try:
+            created_id = await self.db_client.execute_statement(
+                "users.create",
+                user.user_id,
+                user.email,
+                user.password_hash,
+                user.status.value,
+                user.created_at,
+                user.updated_at
+            )
+        except Exception as e:
+            logger.error(f"Failed to create user: {str(e)}")
+            raise DatabaseException(f"Failed to create user: {str(e)}")
 
-        # Hash password
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=12)).decode('utf-8')
+        if self.user_cache:
+            self.user_cache.invalidate(email=user.email)
 
-        # Create user entity
-        user = User(email=email, password_hash=password_hash)
+        if self.email_filter:
+            self.email_filter.add(user.email)
 
-        # Insert into database
-        query = """
-            INSERT INTO users (user_id, email, password_hash, status, created_at, updated_at)
-            VALUES ($1, $2, $3, $4, $5, $6)
+        if created_id is None:
+            raise EmailAlreadyExistsException()
+
+        logger.info(f"User created successfully: {user.user_id}")
+        return user
+
+    async def create_user_with_activation_code(
+        self,
+        email: str,
+        password: str
+    ) -> Tuple[User, ActivationCode]:
         """
+        Create a new user and its first activation code in one statement.
         
+        Both rows are written by a single data-modifying CTE, so registration
+        costs one round trip and one commit, and a user row never exists
+        without its code.
+        
+        Args:
+            email: User email
+            password: Plain text password (will be hashed)
+            
+        Returns:
+            Tuple of the created user and its activation code
+            
+        Raises:
+            EmailAlreadyExistsException: If email already exists
+            HashingCapacityException: If hashing capacity is exhausted
+            DatabaseException: For database errors
+        """
+        user = await self._build_new_user(email, password)
+        activation_code = ActivationCode.generate_for_user(user.user_id)
+
+        # No code is inserted when the user insert hits the email conflict
         try:
-            await self.db_client.execute_query(
-                query,
+            created_id = await self.db_client.execute_statement(
+                "users.create_with_code",
                 user.user_id,
                 user.email,
                 user.password_hash,
                 user.status.value,
                 user.created_at,
-                user.updated_at
+                user.updated_at,
+                activation_code.code,
+                activation_code.expires_at,
+                activation_code.created_at
             )
-            logger.info(f"User created successfully: {user.user_id}")
-            return user
         except Exception as e:
             logger.error(f"Failed to create user: {str(e)}")
             raise DatabaseException(f"Failed to create user: {str(e)}")
 
+        if self.user_cache:
+            self.user_cache.invalidate(email=user.email)
+
+        if self.email_filter:
+            self.email_filter.add(user.email)
+
+        if created_id is None:
+            raise EmailAlreadyExistsException()
+
+        logger.info(f"User created with activation code: {user.user_id}")
+        return user, activation_code
+
+    async def _build_new_user(self, email: str, password: str) -> User:
+        """
+        Build a new user entity with a hashed password.
+        
+        Args:
+            email: User email
+            password: Plain text password
+            
+        Returns:
+            User: Unsaved user entity
+            
+        Raises:
+            EmailAlreadyExistsException: If the pre-check finds the email
+            HashingCapacityException: If hashing capacity is exhausted
+        """
+        # Cheap duplicate check, only when it saves an expensive hash
+        if self._should_precheck_email(email):
+            existing_user = await self.get_user_by_email(email, raise_if_not_found=False)
+            if existing_user:
+                raise EmailAlreadyExistsException()
+
+        # Hash password off the event loop
+        password_hash = await self.hashing_backend.hash_password(password)
+
+        return User(email=email, password_hash=password_hash)
+
     async def get_user_by_email(self, email: str, raise_if_not_found: bool = True) -> Optional[User]:
         """
         Get user by email address.
@@ -82,28 +216,22 @@ class UserRepository:
         Raises:
             UserNotFoundException: If user not found and raise_if_not_found is True
         """
-        query = """
-            SELECT user_id, email, password_hash, status, created_at, updated_at, activated_at
-            FROM users WHERE email = $1
-        """
-        
         try:
-            result = await self.db_client.execute_query(query, email, fetch='one')
+            if self.user_cache:
+                cached = await self.user_cache.get_by_email(
+                    email, lambda: self._load_frozen_user("users.by_email", email)
+                )
+                user = cached.thaw() if cached else None
+            else:
+                result = await self.db_client.execute_statement("users.by_email", email)
+                user = User.from_record(result) if result else None
             
-            if not result:
+            if user is None:
                 if raise_if_not_found:
                     raise UserNotFoundException()
                 return None
             
-            return User(
-                user_id=str(result['user_id']),
-                email=result['email'],
-                password_hash=result['password_hash'],
-                status=UserStatus(result['status']),
-                created_at=result['created_at'],
-                updated_at=result['updated_at'],
-                activated_at=result['activated_at']
-            )
+            return user
         except UserNotFoundException:
             raise
         except Exception as e:
@@ -123,32 +251,153 @@ class UserRepository:
         Raises:
             UserNotFoundException: If user not found
         """
-        query = """
-            SELECT user_id, email, password_hash, status, created_at, updated_at, activated_at
-            FROM users WHERE user_id = $1
-        """
-        
         try:
-            result = await self.db_client.execute_query(query, user_id, fetch='one')
+            if self.user_cache:
+                cached = await self.user_cache.get_by_id(
+                    user_id, lambda: self._load_frozen_user("users.by_id", user_id)
+                )
+                user = cached.thaw() if cached else None
+            else:
+                result = await self.db_client.execute_statement("users.by_id", user_id)
+                user = User.from_record(result) if result else None
             
-            if not result:
+            if user is None:
                 raise UserNotFoundException()
             
-            return User(
-                user_id=str(result['user_id']),
-                email=result['email'],
-                password_hash=result['password_hash'],
-                status=UserStatus(result['status']),
-                created_at=result['created_at'],
-                updated_at=result['updated_at'],
-                activated_at=result['activated_at']
-            )
+            return user
         except UserNotFoundException:
             raise
         except Exception as e:
             logger.error(f"Failed to get user by ID: {str(e)}")
             raise DatabaseException(f"Failed to get user by ID: {str(e)}")
 
+    async def stream_registered_emails(
+        self,
+        after_created_at: datetime,
+        after_user_id: uuid.UUID,
+        batch_size: int = 10000
+    ) -> AsyncIterator[list]:
+        """
+        Stream (email, created_at, user_id) rows in registration order.
+        
+        Keyset pagination on (created_at, user_id): each batch is one indexed
+        range scan, with no connection or cursor held between batches.
+        
+        Args:
+            after_created_at: Start after this registration time
+            after_user_id: Tie-breaker for rows with the same created_at
+            batch_size: Rows per batch
+            
+        Yields:
+            Non-empty batches of records
+        """
+        while True:
+            try:
+                batch = await self.db_client.execute_statement(
+                    "users.registered_emails_after",
+                    after_created_at,
+                    after_user_id,
+                    batch_size
+                )
+            except Exception as e:
+                logger.error(f"Failed to stream registered emails: {str(e)}")
+                raise DatabaseException(f"Failed to stream registered emails: {str(e)}")
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            after_created_at, after_user_id = batch[-1]['created_at'], batch[-1]['user_id']
+
+    async def stream_users(
+        self,
+        status: Optional[UserStatus],
+        before_created_at: datetime,
+        before_user_id: uuid.UUID,
+        limit: int
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """
+        Stream one page of users, newest first, for admin listing.
+        
+        Args:
+            status: Only users in this status, or all users
+            before_created_at: Keyset cursor: registration time of the last user seen
+            before_user_id: Keyset cursor: ID of the last user seen
+            limit: Page size
+            
+        Yields:
+            Records with user_id, email, status, created_at and activated_at
+        """
+        if status is None:
+            rows = self.db_client.stream_statement(
+                "admin.users_page", before_created_at, before_user_id, limit
+            )
+        else:
+            rows = self.db_client.stream_statement(
+                "admin.users_page_by_status", status.value, before_created_at, before_user_id, limit
+            )
+        async for row in rows:
+            yield row
+
+    async def stream_email_search(
+        self,
+        fragment: str,
+        status: Optional[UserStatus],
+        before_created_at: datetime,
+        before_user_id: uuid.UUID,
+        limit: int
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """
+        Stream one page of users whose email contains a fragment, newest first.
+        
+        Args:
+            fragment: Case-insensitive substring of the email
+            status: Only users in this status, or all users
+            before_created_at: Keyset cursor: registration time of the last user seen
+            before_user_id: Keyset cursor: ID of the last user seen
+            limit: Page size
+            
+        Yields:
+            Records with user_id, email, status, created_at and activated_at
+        """
+        escaped = fragment.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        async for row in self.db_client.stream_statement(
+            "admin.search_email",
+            f"%{escaped}%",
+            status.value if status else None,
+            before_created_at,
+            before_user_id,
+            limit
+        ):
+            yield row
+
+    async def stream_export(
+        self,
+        status: Optional[UserStatus] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """
+        Stream every user, in no particular order, for bulk export.
+        
+        Args:
+            status: Only users in this status, or all users
+            batch_size: Rows fetched from the server-side cursor per round trip
+            
+        Yields:
+            Records with user_id, email, status, created_at, updated_at and activated_at
+        """
+        async for row in self.db_client.stream_statement(
+            "export.users",
+            status.value if status else None,
+            prefetch=batch_size
+        ):
+            yield row
+
+    async def _load_frozen_user(self, statement: str, key) -> Optional[FrozenUser]:
+        """Read one user for the cache."""
+        result = await self.db_client.execute_statement(statement, key)
+        return FrozenUser.from_record(result) if result else None
+
     async def update_user_status(self, user_id: str, status: UserStatus, activated_at: Optional[datetime] = None) -> User:
         """
         Update user status.
@@ -161,28 +410,324 @@ class UserRepository:
         Returns:
             Updated user
         """
-        query = """
-            UPDATE users 
-            SET status = $2, updated_at = $3, activated_at = $4
-            WHERE user_id = $1
-        """
-        
         try:
             updated_at = datetime.utcnow()
-            await self.db_client.execute_query(
-                query, 
+            await self.db_client.execute_statement(
+                "users.update_status",
                 user_id, 
                 status.value, 
                 updated_at,
                 activated_at
             )
             
+            if self.user_cache:
+                self.user_cache.invalidate(user_id=user_id)
+            
             # Return updated user
             return await self.get_user_by_id(user_id)
         except Exception as e:
             logger.error(f"Failed to update user status: {str(e)}")
             raise DatabaseException(f"Failed to update user status: {str(e)}")
 
+    async def get_user_statuses(self, key: str, values: List[Any]) -> Dict[Any, str]:
+        """
+        Look up the status of many users in one query.
+        
+        The registered-email filter is not consulted: it only knows the
+        emails this process has seen, so other workers' registrations would
+        read as unregistered.
+        
+        Args:
+            key: "user_id" or "email", what ``values`` are
+            values: User IDs or emails
+            
+        Returns:
+            Status by user ID or email, for the users that exist
+        """
+        if key not in ("user_id", "email"):
+            raise ValueError(f"Unknown user key: {key}")
+        if not values:
+            return {}
+
+        try:
+            rows = await self.db_client.execute_statement(
+                "users.statuses_by_id" if key == "user_id" else "users.statuses_by_email",
+                values
+            )
+        except Exception as e:
+            logger.error(f"Failed to look up user statuses: {str(e)}")
+            raise DatabaseException(f"Failed to look up user statuses: {str(e)}")
+        return {row['key']: row['status'] for row in rows}
+
+    async def bulk_update_status(
+        self,
+        key: str,
+        values: List[Any],
+        status: UserStatus,
+        from_statuses: Iterable[UserStatus],
+        chunk_size: int = 1000
+    ) -> List[Mapping[str, Any]]:
+        """
+        Move many users to a status, one array UPDATE per chunk.
+        
+        Only users currently in one of ``from_statuses`` are changed. Each
+        chunk is its own statement and commit, so a long list does not
+        hold thousands of row locks at once.
+        
+        Args:
+            key: "user_id" or "email", what ``values`` are
+            values: User IDs or emails
+            status: New status
+            from_statuses: Statuses users may be moved from
+            chunk_size: Users per statement
+            
+        Returns:
+            A record per user found: user_id, email, previous_status and
+            whether it was updated
+        """
+        if key not in ("user_id", "email"):
+            raise ValueError(f"Unknown user key: {key}")
+        statement = f"users.bulk_set_status_by_{'id' if key == 'user_id' else 'email'}"
+        from_values = [from_status.value for from_status in from_statuses]
+
+        rows: List[Mapping[str, Any]] = []
+        for start in range(0, len(values), chunk_size):
+            try:
+                chunk_rows = await self.db_client.execute_statement(
+                    statement,
+                    values[start:start + chunk_size],
+                    from_values,
+                    status.value,
+                    utc_now()
+                )
+            except Exception as e:
+                logger.error(f"Failed to update user statuses: {str(e)}")
+                raise DatabaseException(f"Failed to update user statuses: {str(e)}")
+
+            if self.user_cache:
+                for row in chunk_rows:
+                    if row['updated']:
+                        self.user_cache.invalidate(user_id=row['user_id'], email=row['email'])
+            rows.extend(chunk_rows)
+        return rows
+
+    async def activate_with_code(self, user_id: str, code: str) -> Tuple[ActivationOutcome, Optional[User]]:
+        """
+        Consume an activation code and activate its user in one statement.
+        
+        The code is consumed only if it is unused and unexpired and the user
+        is still PENDING, and the user is flipped to ACTIVE in the same
+        statement. The row lock on the code makes concurrent attempts with
+        the same code serialize: exactly one of them activates.
+        
+        Args:
+            user_id: User ID
+            code: Activation code
+            
+        Returns:
+            Tuple of the outcome and, when activated, the updated user
+        """
+        try:
+            now = utc_now()
+            result = await self.db_client.execute_statement("users.activate_with_code", user_id, code, now)
+        except Exception as e:
+            logger.error(f"Failed to activate user: {str(e)}")
+            raise DatabaseException(f"Failed to activate user: {str(e)}")
+
+        # Activated, or found the cached status stale
+        if self.user_cache:
+            self.user_cache.invalidate(user_id=user_id)
+
+        if result['user_id'] is not None:
+            return ActivationOutcome.ACTIVATED, User.from_record(result)
+
+        # Work out which precondition failed, as seen by the statement
+        if result['current_status'] is None:
+            return ActivationOutcome.USER_NOT_FOUND, None
+        if result['current_status'] != UserStatus.PENDING.value:
+            return ActivationOutcome.ALREADY_ACTIVE, None
+        if result['code_is_used'] is None:
+            return ActivationOutcome.CODE_NOT_FOUND, None
+        if result['code_expires_at'] <= now:
+            return ActivationOutcome.CODE_EXPIRED, None
+        # Used before, or consumed by a concurrent attempt that won the row lock
+        return ActivationOutcome.CODE_USED, None
+
+    async def activate_user(self, user_id: str) -> Optional[User]:
+        """
+        Flip a PENDING user to ACTIVE, for code stores outside Postgres.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            The activated user, or None if the user was not PENDING
+        """
+        try:
+            result = await self.db_client.execute_statement("users.activate", user_id, utc_now())
+        except Exception as e:
+            logger.error(f"Failed to activate user: {str(e)}")
+            raise DatabaseException(f"Failed to activate user: {str(e)}")
+
+        if self.user_cache:
+            self.user_cache.invalidate(user_id=user_id)
+
+        return User.from_record(result) if result else None
+
+    async def bump_activation_nonce(self, user_id: str) -> Optional[int]:
+        """
+        Increment a PENDING user's resend counter, voiding derived codes.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            The new counter, or None if the user was not PENDING
+        """
+        try:
+            nonce = await self.db_client.execute_statement("users.bump_activation_nonce", user_id, utc_now())
+        except Exception as e:
+            logger.error(f"Failed to bump activation nonce: {str(e)}")
+            raise DatabaseException(f"Failed to bump activation nonce: {str(e)}")
+
+        if self.user_cache:
+            self.user_cache.invalidate(user_id=user_id)
+
+        return nonce
+
+    async def purge_stale_pending_users(self, created_before: datetime, batch_size: int = 1000) -> int:
+        """
+        Delete users still PENDING since before a cutoff, with their codes.
+        
+        Deletes in batches of the oldest rows, skipping rows locked by a
+        concurrent activation or resend.
+        
+        Args:
+            created_before: Registration time cutoff
+            batch_size: Users deleted per statement
+            
+        Returns:
+            Number of users deleted
+        """
+        count = 0
+        while True:
+            try:
+                deleted = await self.db_client.execute_statement(
+                    "users.delete_stale_pending", created_before, batch_size
+                )
+            except Exception as e:
+                logger.error(f"Failed to purge stale pending users: {str(e)}")
+                raise DatabaseException(f"Failed to purge stale pending users: {str(e)}")
+
+            if self.user_cache:
+                for row in deleted:
+                    self.user_cache.invalidate(user_id=row['user_id'], email=row['email'])
+            count += len(deleted)
+            if len(deleted) < batch_size:
+                break
+        logger.info(f"Purged {count} stale pending users")
+        return count
+
+    async def find_registered_emails(self, emails: Iterable[str]) -> Set[str]:
+        """
+        Find which of a batch of emails are already registered.
+        
+        The emails are copied into a temporary table and joined against
+        users, so a large batch costs one COPY and one join.
+        
+        Args:
+            emails: Candidate emails
+            
+        Returns:
+            The registered ones
+        """
+        try:
+            async with self.db_client.unit_of_work(transaction=True):
+                await self.db_client.execute_query(IMPORT_EMAILS_TABLE)
+                await self.db_client.copy_records("import_emails", [(email,) for email in emails], ["email"])
+                rows = await self.db_client.execute_query(IMPORT_EXISTING_EMAILS, fetch='all')
+        except Exception as e:
+            logger.error(f"Failed to check emails for import: {str(e)}")
+            raise DatabaseException(f"Failed to check emails for import: {str(e)}")
+        return {row['email'] for row in rows}
+
+    async def import_users(self, users: List[User]) -> Set[str]:
+        """
+        Insert a batch of new users with COPY.
+        
+        The batch is copied into a temporary table and moved into users in
+        the same transaction, skipping emails registered meanwhile, so one
+        conflicting row does not abort the batch. The user counters are
+        updated by the same statement.
+        
+        Args:
+            users: Users with hashed passwords
+            
+        Returns:
+            Emails of the users inserted; the others were already registered
+        """
+        records = [
+            (user.user_id, user.email, user.password_hash, user.status.value, user.created_at, user.updated_at)
+            for user in users
+        ]
+        try:
+            async with self.db_client.unit_of_work(transaction=True):
+                await self.db_client.execute_query(IMPORT_USERS_TABLE)
+                await self.db_client.copy_records(
+                    "import_users",
+                    records,
+                    ["user_id", "email", "password_hash", "status", "created_at", "updated_at"]
+                )
+                rows = await self.db_client.execute_query(IMPORT_USERS_LOAD, fetch='all')
+        except Exception as e:
+            logger.error(f"Failed to import users: {str(e)}")
+            raise DatabaseException(f"Failed to import users: {str(e)}")
+
+        inserted = {row['email'] for row in rows}
+        for user in users:
+            if self.user_cache:
+                self.user_cache.invalidate(email=user.email)
+            if self.email_filter and user.email in inserted:
+                self.email_filter.add(user.email)
+        return inserted
+
+    async def reconcile_user_stats(self) -> Dict[str, int]:
+        """
+        Correct any drift between the user counters and the users table.
+        
+        Counts the whole table, so it is meant for an occasional job; the
+        counters stay exact between runs unless users are changed by SQL
+        outside this repository.
+        
+        Returns:
+            Correction applied per status, for statuses that had drifted
+        """
+        try:
+            rows = await self.db_client.execute_statement("stats.reconcile")
+        except Exception as e:
+            logger.error(f"Failed to reconcile user stats: {str(e)}")
+            raise DatabaseException(f"Failed to reconcile user stats: {str(e)}")
+
+        drift = {row['status']: row['delta'] for row in rows}
+        if drift:
+            logger.warning(f"Corrected user counter drift: {drift}")
+        return drift
+
+    async def get_user_stats(self) -> Dict[str, int]:
+        """
+        Read the user counts by status from the counters.
+        
+        Returns:
+            Counts keyed by status value
+        """
+        try:
+            rows = await self.db_client.execute_statement("stats.get")
+        except Exception as e:
+            logger.error(f"Failed to get user stats: {str(e)}")
+            raise DatabaseException(f"Failed to get user stats: {str(e)}")
+
+        return {row['status']: row['user_count'] for row in rows}
+
     async def verify_password(self, user: User, password: str) -> bool:
         """
         Verify user password.
@@ -193,13 +738,67 @@ class UserRepository:
             
         Returns:
             True if password is correct
+
+        Raises:
+            HashingCapacityException: If hashing capacity is exhausted
         """
         try:
-            return bcrypt.checkpw(password.encode('utf-8'), user.password_hash.encode('utf-8'))
+            return await self.hashing_backend.verify_password(password, user.password_hash)
+        except HashingCapacityException:
+            raise
         except Exception as e:
             logger.error(f"Password verification failed: {str(e)}")
             return False
 
+    async def password_needs_rehash(self, user: User) -> bool:
+        """
+        Check whether a user's stored hash is not in the default format.
+        
+        Parses the stored hash only, no hashing; False if the check fails.
+        """
+        try:
+            return await self.hashing_backend.needs_rehash(user.password_hash)
+        except Exception as e:
+            logger.warning(f"Skipping password rehash check for user {user.user_id}: {str(e)}")
+            return False
+
+    async def rehash_password_if_needed(self, user: User, password: str) -> bool:
+        """
+        Rehash a verified password that is not in the default format.
+        
+        Covers hashes from a non-default algorithm as well as ones made with
+        out-of-band parameters. Best effort: failures are logged and the old
+        hash is kept, as it is when the hashing pool is saturated. The update
+        only applies if the stored hash has not changed in the meantime.
+        
+        Args:
+            user: User entity whose password was just verified (updated in place)
+            password: Plain text password
+            
+        Returns:
+            True if the stored hash was replaced
+        """
+        if not await self.password_needs_rehash(user):
+            return False
+
+        try:
+            new_hash = await self.hashing_backend.hash_password(password)
+            result = await self.db_client.execute_statement("users.update_password_hash", user.user_id, new_hash, user.password_hash)
+            if result != "UPDATE 1":
+                return False
+            user.password_hash = new_hash
+            if self.user_cache:
+                self.user_cache.invalidate(user_id=user.user_id)
+            logger.info(f"Password rehashed for user: {user.user_id}")
+            return True
+        except HashingCapacityException:
+            # Logins take the hashing pool first; the next login retries
+            logger.info(f"Hashing pool saturated, dropping password rehash for user {user.user_id}")
+            return False
+        except Exception as e:
+            logger.warning(f"Skipping password rehash for user {user.user_id}: {str(e)}")
+            return False
+
 
 class ActivationCodeRepository:
     """Repository for activation code operations."""
@@ -209,7 +808,10 @@ class ActivationCodeRepository:
 
     async def create_activation_code(self, activation_code: ActivationCode) -> ActivationCode:
         """
-        Create activation code in database.
+        Store a user's activation code, replacing the previous one in place.
+        
+        A user has at most one code row, so the earlier code is overwritten
+        by the same statement rather than invalidated and left behind.
         
         Args:
             activation_code: ActivationCode entity
@@ -217,17 +819,9 @@ class ActivationCodeRepository:
         Returns:
             Created activation code
         """
-        # First, invalidate any existing unused codes for this user
-        await self.invalidate_user_codes(activation_code.user_id)
-        
-        query = """
-            INSERT INTO activation_codes (user_id, code, expires_at, created_at, is_used)
-            VALUES ($1, $2, $3, $4, $5)
-        """
-        
         try:
-            await self.db_client.execute_query(
-                query,
+            await self.db_client.execute_statement(
+                "codes.upsert",
                 activation_code.user_id,
                 activation_code.code,
                 activation_code.expires_at,
@@ -251,47 +845,54 @@ class ActivationCodeRepository:
         Returns:
             ActivationCode or None
         """
-        query = """
-            SELECT user_id, code, expires_at, created_at, used_at, is_used
-            FROM activation_codes 
-            WHERE user_id = $1 AND code = $2
-        """
-        
         try:
-            result = await self.db_client.execute_query(query, user_id, code, fetch='one')
+            result = await self.db_client.execute_statement("codes.by_user_and_code", user_id, code)
             
             if not result:
                 return None
             
-            return ActivationCode(
-                user_id=str(result['user_id']),
-                code=result['code'],
-                expires_at=result['expires_at'],
-                created_at=result['created_at'],
-                used_at=result['used_at'],
-                is_used=result['is_used']
-            )
+            return ActivationCode.from_record(result)
         except Exception as e:
             logger.error(f"Failed to get activation code: {str(e)}")
             raise DatabaseException(f"Failed to get activation code: {str(e)}")
 
-    async def mark_code_as_used(self, user_id: str, code: str) -> None:
+    async def consume_code(self, user_id: str, code: str) -> CodeConsumeResult:
         """
-        Mark activation code as used.
+        Mark a code used if it is unused and unexpired, in one statement.
         
         Args:
             user_id: User ID
             code: Activation code
+            
+        Returns:
+            Whether the code was consumed, or why not
         """
-        query = """
-            UPDATE activation_codes 
-            SET is_used = TRUE, used_at = $3
-            WHERE user_id = $1 AND code = $2
+        try:
+            now = utc_now()
+            result = await self.db_client.execute_statement("codes.consume", user_id, code, now)
+        except Exception as e:
+            logger.error(f"Failed to consume activation code: {str(e)}")
+            raise DatabaseException(f"Failed to consume activation code: {str(e)}")
+
+        if result['consumed']:
+            return CodeConsumeResult.CONSUMED
+        if result['code_is_used'] is None:
+            return CodeConsumeResult.NOT_FOUND
+        if result['code_expires_at'] <= now:
+            return CodeConsumeResult.EXPIRED
+        return CodeConsumeResult.USED
+
+    async def mark_code_as_used(self, user_id: str, code: str) -> None:
         """
+        Mark activation code as used.
         
+        Args:
+            user_id: User ID
+            code: Activation code
+        """
         try:
             used_at = datetime.utcnow()
-            await self.db_client.execute_query(query, user_id, code, used_at)
+            await self.db_client.execute_statement("codes.mark_used", user_id, code, used_at)
             logger.info(f"Activation code marked as used: {user_id}")
         except Exception as e:
             logger.error(f"Failed to mark activation code as used: {str(e)}")
@@ -299,42 +900,63 @@ class ActivationCodeRepository:
 
     async def invalidate_user_codes(self, user_id: str) -> None:
         """
-        Invalidate all unused codes for a user.
+        Delete a user's activation code.
         
         Args:
             user_id: User ID
         """
-        query = """
-            UPDATE activation_codes 
-            SET is_used = TRUE, used_at = $2
-            WHERE user_id = $1 AND is_used = FALSE
-        """
-        
         try:
-            used_at = datetime.utcnow()
-            await self.db_client.execute_query(query, user_id, used_at)
+            await self.db_client.execute_statement("codes.delete_for_user", user_id)
         except Exception as e:
             logger.error(f"Failed to invalidate user codes: {str(e)}")
             raise DatabaseException(f"Failed to invalidate user codes: {str(e)}")
 
-    async def cleanup_expired_codes(self) -> int:
+    async def delete_expired_codes_batch(
+        self,
+        after_user_id: uuid.UUID,
+        batch_size: int
+    ) -> Tuple[Optional[uuid.UUID], int, int]:
         """
-        Clean up expired activation codes.
+        Delete the expired or used codes among the next batch of users.
+        
+        Walks the primary key in user_id order, so each call touches at most
+        ``batch_size`` rows and holds its locks briefly. Rows locked by a
+        concurrent activation are skipped, not waited for.
         
+        Args:
+            after_user_id: Last user_id of the previous batch
+            batch_size: Number of code rows to scan
+            
         Returns:
-            Number of codes cleaned up
-        """
-        query = """
-            DELETE FROM activation_codes 
-            WHERE expires_at < NOW() OR is_used = TRUE
+            Tuple of the last scanned user_id (None past the end), the
+            number of rows scanned and the number deleted
         """
-        
         try:
-            result = await self.db_client.execute_query(query)
-            # Extract number from result string like "DELETE 5"
-            count = int(result.split()[-1]) if result and result.split()[-1].isdigit() else 0
-            logger.info(f"Cleaned up {count} expired activation codes")
-            return count
+            result = await self.db_client.execute_statement(
+                "codes.delete_expired_batch", after_user_id, batch_size, utc_now()
+            )
         except Exception as e:
             logger.error(f"Failed to cleanup expired codes: {str(e)}")
-            raise DatabaseException(f"Failed to cleanup expired codes: {str(e)}")
\ No newline at end of file
+            raise DatabaseException(f"Failed to cleanup expired codes: {str(e)}")
+        return result['last_user_id'], result['scanned'], result['deleted']
+
+    async def cleanup_expired_codes(self, batch_size: int = 1000) -> int:
+        """
+        Clean up expired activation codes, one batch at a time.
+        
+        Args:
+            batch_size: Number of code rows scanned per statement
+        
+        Returns:
+            Number of codes cleaned up
+        """
+        after_user_id = uuid.UUID(int=0)
+        count = 0
+        while True:
+            last_user_id, scanned, deleted = await self.delete_expired_codes_batch(after_user_id, batch_size)
+            count += deleted
+            if scanned < batch_size:
+                break
+            after_user_id = last_user_id
+        logger.info(f"Cleaned up {count} expired activation codes")
+        return count
\ No newline at end of file
@@ -1,10 +1,28 @@
+import asyncio
 import logging
-from datetime import datetime
-from typing import Optional
-
-from src.domain.user.entities import User, ActivationCode, UserStatus, PasswordValidator, utc_now
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Dict, Iterable, List, Mapping, Optional, Set
+
+from src.domain.user.entities import (
+    STATUS_TRANSITIONS,
+    USER_STATUS_BY_VALUE,
+    BulkStatusChange,
+    StatusChangeSkip,
+    User,
+    ActivationOutcome,
+    CodeConsumeResult,
+    UserStatus,
+    PasswordValidator,
+    normalize_email,
+    utc_now
+)
 from src.domain.user.repository import UserRepository, ActivationCodeRepository
 from src.infrastructure.email.email_service import EmailService
+from src.infrastructure.activation_codes.activation_code_store import ActivationCodeStore
+from src.infrastructure.activation_codes.postgres_store import PostgresActivationCodeStore
+from src.infrastructure.hashing.credential_cache import VerifiedCredentialCache
 from src.domain.exceptions import (
     UserNotFoundException,
     EmailAlreadyExistsException,
@@ -12,11 +30,30 @@ from src.domain.exceptions import (
     ActivationCodeExpiredException,
     UserAlreadyActivatedException,
     AuthenticationException,
+    InvalidQueryException,
+    InvalidStatusChangeException,
+    InvalidStatusLookupException,
     ValidationException
 )
 
 logger = logging.getLogger(__name__)
 
+# Trigrams need 3 characters; a shorter fragment cannot use the email index
+MIN_EMAIL_SEARCH_LENGTH = 3
+
+# Users per bulk status change request, and per UPDATE statement
+MAX_BULK_STATUS_USERS = 10000
+BULK_STATUS_CHUNK_SIZE = 1000
+
+# Keys per batch status lookup; one query each
+MAX_STATUS_LOOKUP_KEYS = 5000
+
+
+@asynccontextmanager
+async def _no_unit_of_work(transaction: bool = False):
+    """Stand-in when no database unit of work is configured."""
+    yield None
+
 
 class UserService:
     """Service layer for user registration and activation operations."""
@@ -25,11 +62,21 @@ class UserService:
             self,
             user_repository: UserRepository,
             activation_code_repository: ActivationCodeRepository,
-            email_service: EmailService
+            email_service: EmailService,
+            credential_cache: Optional[VerifiedCredentialCache] = None,
+            unit_of_work: Optional[Callable[..., AsyncContextManager]] = None,
+            activation_code_store: Optional[ActivationCodeStore] = None
     ):
         self.user_repository = user_repository
         self.activation_code_repository = activation_code_repository
         self.email_service = email_service
+        self.credential_cache = credential_cache
+        self.unit_of_work = unit_of_work or _no_unit_of_work
+        if activation_code_store is None:
+            activation_code_store = PostgresActivationCodeStore(activation_code_repository)
+        self.activation_code_store = activation_code_store
+        # Rehashes run after the login response; keep references until done
+        self._rehash_tasks: Set[asyncio.Task] = set()
 
     async def register_user(self, email: str, password: str) -> User:
         """
@@ -51,11 +98,21 @@ class UserService:
         # Validate password
         PasswordValidator.validate(password)
 
-        # Create user in database
-        user = await self.user_repository.create_user(email, password)
+        if self.activation_code_store.colocated_with_users:
+            # Create user and its first activation code in one statement
+            user, activation_code = await self.user_repository.create_user_with_activation_code(
+                email, password
+            )
+        else:
+            user = await self.user_repository.create_user(email, password)
+            activation_code = await self.activation_code_store.issue(user)
 
-        # Generate and send activation code
-        await self._generate_and_send_activation_code(user)
+        # Send activation code via email service
+        await self.email_service.send_activation_code(
+            email=user.email,
+            activation_code=activation_code.code,
+            user_id=user.user_id
+        )
 
         logger.info(f"User registered successfully: {user.user_id}")
         return user
@@ -88,20 +145,46 @@ class UserService:
         if user.is_active():
             raise UserAlreadyActivatedException()
 
-        # Verify activation code
-        await self._verify_activation_code(user.user_id, activation_code)
+        if self.activation_code_store.colocated_with_users:
+            activated_user = await self._activate_in_one_statement(user, activation_code)
+        else:
+            activated_user = await self._activate_with_code_store(user, activation_code)
 
-        # Activate user
-        activated_user = await self.user_repository.update_user_status(
+        if self.credential_cache:
+            self.credential_cache.invalidate(user.user_id)
+
+        logger.info(f"User activated successfully: {user.user_id}")
+        return activated_user
+
+    async def _activate_in_one_statement(self, user: User, activation_code: str) -> User:
+        """Consume the code and activate the user in one statement."""
+        outcome, activated_user = await self.user_repository.activate_with_code(
             user.user_id,
-            UserStatus.ACTIVE,
-            utc_now()
+            activation_code
         )
 
-        # Mark activation code as used
-        await self.activation_code_repository.mark_code_as_used(user.user_id, activation_code)
+        if outcome == ActivationOutcome.ALREADY_ACTIVE:
+            raise UserAlreadyActivatedException()
+        if outcome == ActivationOutcome.USER_NOT_FOUND:
+            raise UserNotFoundException()
+        if outcome == ActivationOutcome.CODE_EXPIRED:
+            raise ActivationCodeExpiredException()
+        if outcome != ActivationOutcome.ACTIVATED:
+            raise InvalidActivationCodeException()
+        return activated_user
 
-        logger.info(f"User activated successfully: {user.user_id}")
+    async def _activate_with_code_store(self, user: User, activation_code: str) -> User:
+        """Consume the code from the code store, then activate the user."""
+        result = await self.activation_code_store.consume(user, activation_code)
+
+        if result == CodeConsumeResult.EXPIRED:
+            raise ActivationCodeExpiredException()
+        if result != CodeConsumeResult.CONSUMED:
+            raise InvalidActivationCodeException()
+
+        activated_user = await self.user_repository.activate_user(user.user_id)
+        if activated_user is None:
+            raise UserAlreadyActivatedException()
         return activated_user
 
     async def resend_activation_code(self, email: str, password: str) -> None:
@@ -143,6 +226,77 @@ class UserService:
         """
         return await self.user_repository.get_user_by_email(email, raise_if_not_found=False)
 
+    def list_users(
+        self,
+        status: Optional[UserStatus],
+        before_created_at: datetime,
+        before_user_id: uuid.UUID,
+        limit: int
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """
+        Stream a page of users, newest first, before a keyset cursor.
+        
+        Args:
+            status: Only users in this status, or all users
+            before_created_at: Registration time of the last user already seen
+            before_user_id: ID of the last user already seen
+            limit: Page size
+            
+        Returns:
+            Async iterator of user records (no password hashes)
+        """
+        return self.user_repository.stream_users(status, before_created_at, before_user_id, limit)
+
+    def search_users_by_email(
+        self,
+        fragment: str,
+        status: Optional[UserStatus],
+        before_created_at: datetime,
+        before_user_id: uuid.UUID,
+        limit: int
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """
+        Stream a page of users whose email contains ``fragment``.
+        
+        Args:
+            fragment: Case-insensitive email substring, at least 3 characters
+            status: Only users in this status, or all users
+            before_created_at: Registration time of the last user already seen
+            before_user_id: ID of the last user already seen
+            limit: Page size
+            
+        Returns:
+            Async iterator of user records (no password hashes)
+            
+        Raises:
+            InvalidQueryException: If the fragment is too short to use the trigram index
+        """
+        fragment = fragment.strip()
+        if len(fragment) < MIN_EMAIL_SEARCH_LENGTH:
+            raise InvalidQueryException(
+                f"Search needs at least {MIN_EMAIL_SEARCH_LENGTH} characters"
+            )
+        return self.user_repository.stream_email_search(
+            fragment, status, before_created_at, before_user_id, limit
+        )
+
+    def export_users(
+        self,
+        status: Optional[UserStatus] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[Mapping[str, Any]]:
+        """
+        Stream every user for bulk export.
+        
+        Args:
+            status: Only users in this status, or all users
+            batch_size: Rows fetched from the database per round trip
+            
+        Returns:
+            Async iterator of user records (no password hashes)
+        """
+        return self.user_repository.stream_export(status, batch_size)
+
     async def _authenticate_user(self, email: str, password: str) -> User:
         """
         Authenticate user with email and password.
@@ -166,16 +320,40 @@ class UserService:
             if user is None:
                 raise AuthenticationException()
 
+            # Skip bcrypt for a credential verified moments ago
+            if self.credential_cache and self.credential_cache.is_verified(user, password):
+                return user
+
             # Verify password
             if not await self.user_repository.verify_password(user, password):
                 raise AuthenticationException()
 
+            # Bring the stored hash cost back in band while we have the password;
+            # the check is cheap, so only stale hashes get a background task
+            if await self.user_repository.password_needs_rehash(user):
+                self._schedule_rehash(user, password)
+
+            if self.credential_cache:
+                self.credential_cache.add(user, password)
+
             return user
 
         except UserNotFoundException:
             # Don't reveal whether user exists or not
             raise AuthenticationException()
 
+    def _schedule_rehash(self, user: User, password: str) -> None:
+        """Rehash a verified password in the background, off the login path."""
+        task = asyncio.create_task(self._rehash_password(user, password))
+        self._rehash_tasks.add(task)
+        task.add_done_callback(self._rehash_tasks.discard)
+
+    async def _rehash_password(self, user: User, password: str) -> None:
+        try:
+            await self.user_repository.rehash_password_if_needed(user, password)
+        except Exception as e:
+            logger.warning(f"Password rehash failed for user {user.user_id}: {str(e)}")
+
     async def _generate_and_send_activation_code(self, user: User) -> None:
         """
         Generate and send activation code to user.
@@ -183,11 +361,9 @@ class UserService:
         Args:
             user: User entity
         """
-        # Generate activation code
-        activation_code = ActivationCode.generate_for_user(user.user_id)
-
-        # Save activation code to database
-        await self.activation_code_repository.create_activation_code(activation_code)
+        # Replace the old code; in Postgres on one connection, in one commit
+        async with self.unit_of_work(transaction=True):
+            activation_code = await self.activation_code_store.issue(user, resend=True)
 
         # Send activation code via email service
         await self.email_service.send_activation_code(
@@ -196,58 +372,167 @@ class UserService:
             user_id=user.user_id
         )
 
-    async def _verify_activation_code(self, user_id: str, code: str) -> None:
+    async def cleanup_expired_codes(self) -> int:
         """
-        Verify activation code.
+        Clean up expired activation codes.
         
-        Args:
-            user_id: User ID
-            code: Activation code to verify
-            
-        Raises:
-            InvalidActivationCodeException: If code is invalid
-            ActivationCodeExpiredException: If code is expired
+        Errors propagate, so the job scheduler records the failed run.
+        
+        Returns:
+            Number of codes cleaned up
         """
-        # Get activation code from database
-        activation_code = await self.activation_code_repository.get_activation_code(user_id, code)
-
-        if not activation_code:
-            raise InvalidActivationCodeException()
-
-        # Check if code is already used
-        if activation_code.is_used:
-            raise InvalidActivationCodeException()
+        count = await self.activation_code_store.cleanup_expired()
+        logger.info(f"Cleaned up {count} expired activation codes")
+        return count
 
-        # Check if code is expired
-        if activation_code.is_expired():
-            raise ActivationCodeExpiredException()
-
-    async def cleanup_expired_codes(self) -> int:
+    async def purge_stale_pending_users(self, max_age_seconds: float, batch_size: int = 1000) -> int:
         """
-        Clean up expired activation codes.
+        Delete accounts never activated within ``max_age_seconds`` of registering.
         
+        Args:
+            max_age_seconds: Age after which a PENDING account is dropped
+            batch_size: Users deleted per statement
+            
         Returns:
-            Number of codes cleaned up
+            Number of users deleted
         """
-        try:
-            count = await self.activation_code_repository.cleanup_expired_codes()
-            logger.info(f"Cleaned up {count} expired activation codes")
-            return count
-        except Exception as e:
-            logger.error(f"Failed to cleanup expired codes: {str(e)}")
-            return 0
+        created_before = utc_now() - timedelta(seconds=max_age_seconds)
+        return await self.user_repository.purge_stale_pending_users(created_before, batch_size)
+
+    async def reconcile_user_stats(self) -> dict:
+        """Fix counter drift; run periodically by the job scheduler."""
+        return await self.user_repository.reconcile_user_stats()
 
     async def get_user_stats(self) -> dict:
         """
         Get user registration statistics.
         
+        Read from counters kept up to date by every user insert, status
+        change and purge, so the cost does not grow with the users table.
+        
         Returns:
             Dictionary with user statistics
         """
-        # This would require additional repository methods
-        # For now, return placeholder data
+        counts = await self.user_repository.get_user_stats()
         return {
-            "total_users": 0,
-            "active_users": 0,
-            "pending_users": 0
+            "total_users": sum(counts.values()),
+            "active_users": counts.get(UserStatus.ACTIVE.value, 0),
+            "pending_users": counts.get(UserStatus.PENDING.value, 0),
+            "by_status": {status.value: counts.get(status.value, 0) for status in UserStatus}
         }
+
+    async def get_user_statuses(
+        self,
+        user_ids: Optional[List[uuid.UUID]] = None,
+        emails: Optional[List[str]] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Look up whether each of a batch of users is registered, and its status.
+        
+        Emails are normalized like registration requests before the lookup,
+        but answered under the spelling they were sent in. An email that is
+        not valid cannot be registered, so it maps to None.
+        
+        Args:
+            user_ids: Users to look up, by ID
+            emails: Users to look up, by email (instead of user_ids)
+            
+        Returns:
+            Status of every requested ID or email, None if not registered
+            
+        Raises:
+            InvalidStatusLookupException: If the keys are missing or too many
+        """
+        if (user_ids is None) == (emails is None):
+            raise InvalidStatusLookupException("Send either user_ids or emails")
+        key, values = ("user_id", user_ids) if user_ids is not None else ("email", emails)
+        values = list(dict.fromkeys(values))
+        if len(values) > MAX_STATUS_LOOKUP_KEYS:
+            raise InvalidStatusLookupException(f"At most {MAX_STATUS_LOOKUP_KEYS} users per lookup")
+
+        if key == "user_id":
+            statuses = await self.user_repository.get_user_statuses(key, values)
+            return {str(value): statuses.get(value) for value in values}
+
+        normalized: Dict[str, Optional[str]] = {}
+        for email in values:
+            try:
+                normalized[email] = normalize_email(email)
+            except ValidationException:
+                normalized[email] = None
+        lookup = list(dict.fromkeys(email for email in normalized.values() if email))
+        statuses = await self.user_repository.get_user_statuses(key, lookup) if lookup else {}
+        return {email: statuses.get(stored) if stored else None for email, stored in normalized.items()}
+
+    async def change_users_status(
+        self,
+        status: UserStatus,
+        user_ids: Optional[List[uuid.UUID]] = None,
+        emails: Optional[List[str]] = None,
+        from_statuses: Optional[Iterable[UserStatus]] = None
+    ) -> BulkStatusChange:
+        """
+        Move a list of users to a status, e.g. to suspend them.
+        
+        Users are changed by chunks of array UPDATEs, not one by one. Those
+        not found, already in the status, in a status it may not be reached
+        from, or changed by someone else meanwhile are skipped and reported.
+        
+        Args:
+            status: New status
+            user_ids: Users to change, by ID
+            emails: Users to change, by email (instead of user_ids)
+            from_statuses: Only change users in these statuses; defaults
+                to every status the transition is allowed from
+            
+        Returns:
+            The updated user IDs and the skipped users with the reason
+            
+        Raises:
+            InvalidStatusChangeException: If the list is missing, too long or
+                the transition is not allowed
+        """
+        if (user_ids is None) == (emails is None):
+            raise InvalidStatusChangeException("Send either user_ids or emails")
+        key, values = ("user_id", user_ids) if user_ids is not None else ("email", emails)
+        values = list(dict.fromkeys(values))
+        if len(values) > MAX_BULK_STATUS_USERS:
+            raise InvalidStatusChangeException(f"At most {MAX_BULK_STATUS_USERS} users per request")
+
+        allowed = STATUS_TRANSITIONS.get(status)
+        if allowed is None:
+            raise InvalidStatusChangeException(f"Users cannot be moved to {status.value}")
+        from_statuses = allowed if from_statuses is None else frozenset(from_statuses)
+        if not from_statuses <= allowed:
+            raise InvalidStatusChangeException(
+                f"Users can be moved to {status.value} only from "
+                f"{', '.join(sorted(allowed_status.value for allowed_status in allowed))}"
+            )
+
+        result = BulkStatusChange(status)
+        if not values:
+            return result
+
+        rows = await self.user_repository.bulk_update_status(
+            key, values, status, from_statuses, BULK_STATUS_CHUNK_SIZE
+        )
+        found = {row[key]: row for row in rows}
+        for value in values:
+            row = found.get(value)
+            if row is None:
+                result.skipped[str(value)] = StatusChangeSkip.NOT_FOUND
+            elif row['updated']:
+                result.updated.append(row['user_id'])
+                if self.credential_cache:
+                    self.credential_cache.invalidate(row['user_id'])
+            elif row['previous_status'] == status.value:
+                result.skipped[str(value)] = StatusChangeSkip.ALREADY_IN_STATUS
+            elif USER_STATUS_BY_VALUE[row['previous_status']] not in from_statuses:
+                result.skipped[str(value)] = StatusChangeSkip.NOT_ALLOWED
+            else:
+                result.skipped[str(value)] = StatusChangeSkip.CHANGED_CONCURRENTLY
+
+        logger.info(
+            f"Moved {len(result.updated)} users to {status.value}, skipped {len(result.skipped)}"
+        )
+        return result
@@ -0,0 +1,384 @@
+from src.infrastructure.database.statements import StatementRegistry
+
+
+# SQL used by UserRepository and ActivationCodeRepository, prepared on every
+# pooled connection at startup
+USER_STATEMENTS = StatementRegistry()
+
+# User counts by status are spread over this many rows per status. Each
+# connection adds to the shard of its backend pid, so concurrent writers
+# rarely wait on the same counter row.
+USER_COUNTER_SHARDS = 16
+
+
+def _count_users(changes: str) -> str:
+    """
+    SQL adding status deltas to the user counters.
+
+    Args:
+        changes: Subquery with ``status`` and ``delta`` columns, at most one
+            row per status
+    """
+    return f"""
+        INSERT INTO user_counters (status, shard, user_count)
+        SELECT status, pg_backend_pid() % {USER_COUNTER_SHARDS}, delta FROM {changes} AS change
+        ON CONFLICT (status, shard) DO UPDATE
+        SET user_count = user_counters.user_count + EXCLUDED.user_count
+    """
+
+
+_ACTIVATED_COUNTS = _count_users(
+    "(SELECT v.status, v.delta FROM activated, (VALUES ('PENDING', -1), ('ACTIVE', 1)) AS v (status, delta))"
+)
+
+USER_STATEMENTS.register("users.create", f"""
+    WITH new_user AS (
+        INSERT INTO users (user_id, email, password_hash, status, created_at, updated_at)
+        VALUES ($1, $2, $3, $4, $5, $6)
+        ON CONFLICT (email) DO NOTHING
+        RETURNING user_id, status
+    ), counted AS ({_count_users("(SELECT status, 1 AS delta FROM new_user)")})
+    SELECT user_id FROM new_user
+""", fetch='val')
+
+USER_STATEMENTS.register("users.create_with_code", f"""
+    WITH new_user AS (
+        INSERT INTO users (user_id, email, password_hash, status, created_at, updated_at)
+        VALUES ($1, $2, $3, $4, $5, $6)
+        ON CONFLICT (email) DO NOTHING
+        RETURNING user_id, status
+    ), new_code AS (
+        INSERT INTO activation_codes (user_id, code, expires_at, created_at, is_used)
+        SELECT user_id, $7, $8, $9, FALSE FROM new_user
+        RETURNING user_id
+    ), counted AS ({_count_users("(SELECT status, 1 AS delta FROM new_user)")})
+    SELECT user_id FROM new_code
+""", fetch='val')
+
+USER_STATEMENTS.register("users.by_email", """
+    SELECT user_id, email, password_hash, status, created_at, updated_at, activated_at, activation_nonce
+    FROM users WHERE email = $1
+""", fetch='one')
+
+USER_STATEMENTS.register("users.by_id", """
+    SELECT user_id, email, password_hash, status, created_at, updated_at, activated_at, activation_nonce
+    FROM users WHERE user_id = $1
+""", fetch='one')
+
+# Batch status lookups: one index probe per key, on the email and primary
+# key indexes
+USER_STATEMENTS.register("users.statuses_by_email", """
+    SELECT email AS key, status FROM users WHERE email = ANY($1::varchar[])
+""", fetch='all')
+
+USER_STATEMENTS.register("users.statuses_by_id", """
+    SELECT user_id AS key, status FROM users WHERE user_id = ANY($1::uuid[])
+""", fetch='all')
+
+USER_STATEMENTS.register("users.registered_emails_after", """
+    SELECT email, created_at, user_id
+    FROM users
+    WHERE (created_at, user_id) > ($1, $2)
+    ORDER BY created_at, user_id
+    LIMIT $3
+""", fetch='all')
+
+_STATUS_CHANGE_COUNTS = _count_users("""(
+        SELECT old_status AS status, -1 AS delta FROM updated WHERE old_status <> new_status
+        UNION ALL
+        SELECT new_status, 1 FROM updated WHERE old_status <> new_status
+    )""")
+
+USER_STATEMENTS.register("users.update_status", f"""
+    WITH previous AS (
+        SELECT user_id, status FROM users WHERE user_id = $1 FOR UPDATE
+    ), updated AS (
+        UPDATE users u
+        SET status = $2, updated_at = $3, activated_at = $4
+        FROM previous p
+        WHERE u.user_id = p.user_id
+        RETURNING p.status AS old_status, u.status AS new_status
+    ), counted AS ({_STATUS_CHANGE_COUNTS})
+    SELECT count(*) FROM updated
+""")
+
+_BULK_STATUS_CHANGE_COUNTS = _count_users("""(
+        SELECT status, sum(delta) AS delta FROM (
+            SELECT old_status AS status, -1 AS delta FROM updated
+            UNION ALL
+            SELECT new_status, 1 FROM updated
+        ) AS change_rows
+        GROUP BY status
+    )""")
+
+
+def _bulk_set_status(key: str, key_type: str) -> str:
+    """
+    SQL moving the users whose ``key`` is in $1 and status in $2 to $3.
+
+    Rows are locked in user_id order so that overlapping bulk changes
+    cannot deadlock. A row changed by someone else while waiting for its
+    lock is re-checked against $2 and left alone if it no longer matches.
+    Returns every user found, with its status before the statement and
+    whether it was updated.
+    """
+    return f"""
+    WITH matched AS (
+        SELECT user_id, email, status FROM users WHERE {key} = ANY($1::{key_type}[])
+    ), target AS (
+        SELECT user_id, status FROM users
+        WHERE {key} = ANY($1::{key_type}[]) AND status = ANY($2::varchar[])
+        ORDER BY user_id
+        FOR UPDATE
+    ), updated AS (
+        UPDATE users u
+        SET status = $3::varchar,
+            updated_at = $4,
+            activated_at = CASE WHEN $3::varchar = 'ACTIVE' THEN coalesce(u.activated_at, $4) ELSE u.activated_at END
+        FROM target t
+        WHERE u.user_id = t.user_id
+        RETURNING u.user_id, t.status AS old_status, u.status AS new_status
+    ), counted AS ({_BULK_STATUS_CHANGE_COUNTS})
+    SELECT m.user_id, m.email, m.status AS previous_status, (up.user_id IS NOT NULL) AS updated
+    FROM matched m LEFT JOIN updated up ON up.user_id = m.user_id
+"""
+
+
+USER_STATEMENTS.register("users.bulk_set_status_by_id", _bulk_set_status("user_id", "uuid"), fetch='all')
+
+USER_STATEMENTS.register("users.bulk_set_status_by_email", _bulk_set_status("email", "varchar"), fetch='all')
+
+USER_STATEMENTS.register("users.activate_with_code", f"""
+    WITH code AS (
+        SELECT is_used, expires_at
+        FROM activation_codes
+        WHERE user_id = $1 AND code = $2
+    ), consumed AS (
+        UPDATE activation_codes ac
+        SET is_used = TRUE, used_at = $3
+        FROM users u
+        WHERE ac.user_id = $1 AND ac.code = $2
+          AND ac.is_used = FALSE AND ac.expires_at > $3
+          AND u.user_id = ac.user_id AND u.status = 'PENDING'
+        RETURNING ac.user_id
+    ), activated AS (
+        UPDATE users
+        SET status = 'ACTIVE', activated_at = $3, updated_at = $3
+        WHERE user_id IN (SELECT user_id FROM consumed) AND status = 'PENDING'
+        RETURNING user_id, email, password_hash, status, created_at, updated_at, activated_at, activation_nonce
+    ), counted AS ({_ACTIVATED_COUNTS})
+    SELECT
+        a.user_id, a.email, a.password_hash, a.status,
+        a.created_at, a.updated_at, a.activated_at, a.activation_nonce,
+        u.status AS current_status,
+        c.is_used AS code_is_used,
+        c.expires_at AS code_expires_at
+    FROM (SELECT 1) AS attempt
+    LEFT JOIN users u ON u.user_id = $1
+    LEFT JOIN code c ON TRUE
+    LEFT JOIN activated a ON TRUE
+""", fetch='one')
+
+USER_STATEMENTS.register("users.activate", f"""
+    WITH activated AS (
+        UPDATE users
+        SET status = 'ACTIVE', activated_at = $2, updated_at = $2
+        WHERE user_id = $1 AND status = 'PENDING'
+        RETURNING user_id, email, password_hash, status, created_at, updated_at, activated_at, activation_nonce
+    ), counted AS ({_ACTIVATED_COUNTS})
+    SELECT * FROM activated
+""", fetch='one')
+
+USER_STATEMENTS.register("users.bump_activation_nonce", """
+    UPDATE users
+    SET activation_nonce = activation_nonce + 1, updated_at = $2
+    WHERE user_id = $1 AND status = 'PENDING'
+    RETURNING activation_nonce
+""", fetch='val')
+
+USER_STATEMENTS.register("users.update_password_hash", """
+    UPDATE users
+    SET password_hash = $2, updated_at = NOW()
+    WHERE user_id = $1 AND password_hash = $3
+""")
+
+USER_STATEMENTS.register("users.delete_stale_pending", f"""
+    WITH deleted AS (
+        DELETE FROM users
+        WHERE user_id IN (
+            SELECT user_id
+            FROM users
+            WHERE status = 'PENDING' AND created_at < $1
+            ORDER BY created_at
+            LIMIT $2
+            FOR UPDATE SKIP LOCKED
+        ) AND status = 'PENDING'
+        RETURNING user_id, email
+    ), counted AS ({_count_users(
+        "(SELECT 'PENDING' AS status, -count(*) AS delta FROM deleted HAVING count(*) > 0)"
+    )})
+    SELECT user_id, email FROM deleted
+""", fetch='all')
+
+# Admin listing and search, newest first, with a (created_at, user_id)
+# keyset cursor. The by-status listing is covered by
+# idx_users_status_created_at_user_id; email search by the trigram index.
+USER_STATEMENTS.register("admin.users_page", """
+    SELECT user_id, email, status, created_at, activated_at
+    FROM users
+    WHERE (created_at, user_id) < ($1, $2)
+    ORDER BY created_at DESC, user_id DESC
+    LIMIT $3
+""", fetch='all')
+
+USER_STATEMENTS.register("admin.users_page_by_status", """
+    SELECT user_id, email, status, created_at, activated_at
+    FROM users
+    WHERE status = $1 AND (created_at, user_id) < ($2, $3)
+    ORDER BY created_at DESC, user_id DESC
+    LIMIT $4
+""", fetch='all')
+
+USER_STATEMENTS.register("admin.search_email", """
+    SELECT user_id, email, status, created_at, activated_at
+    FROM users
+    WHERE email ILIKE $1
+      AND ($2::varchar IS NULL OR status = $2)
+      AND (created_at, user_id) < ($3, $4)
+    ORDER BY created_at DESC, user_id DESC
+    LIMIT $5
+""", fetch='all')
+
+# Whole-table export: no ORDER BY, so Postgres streams a sequential scan
+# through the cursor instead of sorting or walking an index first
+USER_STATEMENTS.register("export.users", """
+    SELECT user_id, email, status, created_at, updated_at, activated_at
+    FROM users
+    WHERE $1::varchar IS NULL OR status = $1
+""", fetch='all')
+
+# Counts and counters are read from one snapshot, in which every user
+# change and its counter delta are either both visible or both not. The
+# difference is added (not assigned), so it commutes with concurrent
+# writers' deltas.
+USER_STATEMENTS.register("stats.reconcile", f"""
+    WITH actual AS (
+        SELECT status, count(*) AS user_count FROM users GROUP BY status
+    ), counted AS (
+        SELECT status, sum(user_count) AS user_count FROM user_counters GROUP BY status
+    ), drift AS (
+        SELECT status, COALESCE(a.user_count, 0) - COALESCE(c.user_count, 0) AS delta
+        FROM actual a FULL JOIN counted c USING (status)
+    ), corrected AS ({_count_users("(SELECT status, delta FROM drift WHERE delta <> 0)")})
+    SELECT status, delta FROM drift WHERE delta <> 0
+""", fetch='all')
+
+USER_STATEMENTS.register("stats.get", """
+    SELECT status, sum(user_count)::bigint AS user_count
+    FROM user_counters
+    GROUP BY status
+""", fetch='all')
+
+USER_STATEMENTS.register("codes.upsert", """
+    INSERT INTO activation_codes (user_id, code, expires_at, created_at, used_at, is_used)
+    VALUES ($1, $2, $3, $4, NULL, $5)
+    ON CONFLICT (user_id) DO UPDATE
+    SET code = EXCLUDED.code,
+        expires_at = EXCLUDED.expires_at,
+        created_at = EXCLUDED.created_at,
+        used_at = NULL,
+        is_used = EXCLUDED.is_used
+""")
+
+USER_STATEMENTS.register("codes.by_user_and_code", """
+    SELECT user_id, code, expires_at, created_at, used_at, is_used
+    FROM activation_codes
+    WHERE user_id = $1 AND code = $2
+""", fetch='one')
+
+USER_STATEMENTS.register("codes.consume", """
+    WITH code AS (
+        SELECT is_used, expires_at
+        FROM activation_codes
+        WHERE user_id = $1 AND code = $2
+    ), consumed AS (
+        UPDATE activation_codes
+        SET is_used = TRUE, used_at = $3
+        WHERE user_id = $1 AND code = $2 AND is_used = FALSE AND expires_at > $3
+        RETURNING user_id
+    )
+    SELECT
+        EXISTS (SELECT 1 FROM consumed) AS consumed,
+        c.is_used AS code_is_used,
+        c.expires_at AS code_expires_at
+    FROM (SELECT 1) AS attempt
+    LEFT JOIN code c ON TRUE
+""", fetch='one')
+
+USER_STATEMENTS.register("codes.mark_used", """
+    UPDATE activation_codes
+    SET is_used = TRUE, used_at = $3
+    WHERE user_id = $1 AND code = $2
+""")
+
+USER_STATEMENTS.register("codes.delete_for_user", """
+    DELETE FROM activation_codes
+    WHERE user_id = $1
+""")
+
+USER_STATEMENTS.register("codes.delete_expired_batch", """
+    WITH scanned AS (
+        SELECT user_id
+        FROM activation_codes
+        WHERE user_id > $1
+        ORDER BY user_id
+        LIMIT $2
+    ), doomed AS (
+        SELECT ctid
+        FROM activation_codes
+        WHERE user_id IN (SELECT user_id FROM scanned)
+          AND (expires_at < $3 OR is_used = TRUE)
+        FOR UPDATE SKIP LOCKED
+    ), deleted AS (
+        DELETE FROM activation_codes
+        WHERE ctid = ANY (ARRAY (SELECT ctid FROM doomed))
+        RETURNING 1
+    )
+    SELECT
+        (SELECT user_id FROM scanned ORDER BY user_id DESC LIMIT 1) AS last_user_id,
+        (SELECT count(*) FROM scanned) AS scanned,
+        (SELECT count(*) FROM deleted) AS deleted
+""", fetch='one')
+
+# Bulk import. These read temporary tables that only exist inside the
+# importing transaction, so they are plain SQL: registered statements are
+# prepared on every new connection, where the tables do not exist.
+IMPORT_EMAILS_TABLE = """
+    CREATE TEMP TABLE import_emails (email VARCHAR(255) NOT NULL) ON COMMIT DROP
+"""
+
+IMPORT_EXISTING_EMAILS = """
+    SELECT i.email FROM import_emails i JOIN users u ON u.email = i.email
+"""
+
+IMPORT_USERS_TABLE = """
+    CREATE TEMP TABLE import_users (
+        user_id UUID NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        password_hash VARCHAR(255) NOT NULL,
+        status VARCHAR(50) NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL
+    ) ON COMMIT DROP
+"""
+
+# Emails registered since the dedupe check are skipped, not fatal
+IMPORT_USERS_LOAD = f"""
+    WITH new_user AS (
+        INSERT INTO users (user_id, email, password_hash, status, created_at, updated_at)
+        SELECT user_id, email, password_hash, status, created_at, updated_at FROM import_users
+        ON CONFLICT (email) DO NOTHING
+        RETURNING email, status
+    ), counted AS ({_count_users("(SELECT status, count(*) AS delta FROM new_user GROUP BY status)")})
+    SELECT email FROM new_user
+"""
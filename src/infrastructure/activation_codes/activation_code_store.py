@@ -0,0 +1,68 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+from src.domain.user.entities import ActivationCode, CodeConsumeResult, User
+
+
+class ActivationCodeStore(ABC):
+    """
+    Where activation codes live between registration and activation.
+
+    A user has at most one live code: ``issue`` replaces any earlier one.
+    ``consume`` is atomic, so a code can activate only once even under
+    concurrent attempts.
+    """
+
+    #: True when codes share the users database, so registration and
+    #: activation can write the user row and the code in one statement
+    colocated_with_users = False
+
+    @abstractmethod
+    async def issue(self, user: User, resend: bool = False) -> ActivationCode:
+        """
+        Create the user's next code, invalidating the previous one.
+
+        Args:
+            user: User the code is for
+            resend: False for the code sent at registration
+
+        Returns:
+            The code to send to the user
+        """
+
+    @abstractmethod
+    async def consume(self, user: User, code: str) -> CodeConsumeResult:
+        """Use up a code if it is live."""
+
+    @abstractmethod
+    async def invalidate_user(self, user_id: Any) -> None:
+        """Drop every live code of a user."""
+
+    async def cleanup_expired(self) -> int:
+        """Remove expired codes. Returns how many were removed."""
+        return 0
+
+    async def close(self) -> None:
+        """Release resources."""
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get store metrics."""
+        return {}
+
+
+class StoredActivationCodeStore(ActivationCodeStore):
+    """
+    A store that persists each code it issues.
+
+    ``issue`` generates a random code and hands it to ``put``; stores that
+    derive codes instead (see ``HmacActivationCodeStore``) have no ``put``.
+    """
+
+    async def issue(self, user: User, resend: bool = False) -> ActivationCode:
+        activation_code = ActivationCode.generate_for_user(user.user_id)
+        await self.put(activation_code)
+        return activation_code
+
+    @abstractmethod
+    async def put(self, activation_code: ActivationCode) -> None:
+        """Store a code, invalidating the user's previous one."""
@@ -0,0 +1,101 @@
+import hashlib
+import hmac
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict
+
+from src.domain.user.entities import ActivationCode, CodeConsumeResult, User
+from src.domain.user.repository import UserRepository
+from src.infrastructure.activation_codes.activation_code_store import ActivationCodeStore
+
+
+class HmacActivationCodeStore(ActivationCodeStore):
+    """
+    Codes derived from the user instead of stored, TOTP-style.
+
+    A code is an HMAC-SHA256 of (user_id, time step, resend counter) under
+    the application secret, truncated to ``digits`` decimal digits as in
+    RFC 4226. Registration writes nothing, and verifying recomputes the
+    code from the user row the caller already loaded: no table lookup.
+
+    A code issued during step ``t`` is accepted through step
+    ``t + valid_steps - 1``. Resending bumps ``users.activation_nonce``,
+    which voids every earlier code. Nothing here enforces single use: the
+    PENDING -> ACTIVE update that follows a successful ``consume`` does.
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        user_repository: UserRepository,
+        step_seconds: int = 60,
+        valid_steps: int = 2,
+        expired_lookback_steps: int = 5,
+        digits: int = 4,
+        clock: Callable[[], float] = time.time
+    ):
+        if step_seconds < 1 or valid_steps < 1:
+            raise ValueError("Code steps must last at least one second and one step")
+        # Key derived for this one purpose, not the raw application secret
+        self._key = hmac.new(secret_key.encode("utf-8"), b"activation-code", hashlib.sha256).digest()
+        self.user_repository = user_repository
+        self.step_seconds = step_seconds
+        self.valid_steps = valid_steps
+        self.expired_lookback_steps = expired_lookback_steps
+        self.digits = digits
+        self._modulus = 10 ** digits
+        self._clock = clock
+
+    @classmethod
+    def from_settings(cls, settings, user_repository: UserRepository) -> 'HmacActivationCodeStore':
+        """Build a derived-code store from application settings."""
+        return cls(
+            settings.secret_key,
+            user_repository,
+            step_seconds=settings.activation_code_hmac_step_seconds,
+            valid_steps=settings.activation_code_hmac_valid_steps
+        )
+
+    def derive_code(self, user_id: Any, step: int, nonce: int) -> str:
+        """Compute the code of a user for one time step and resend counter."""
+        message = f"{user_id}:{step}:{nonce}".encode("utf-8")
+        digest = hmac.new(self._key, message, hashlib.sha256).digest()
+        offset = digest[-1] & 0x0F
+        value = int.from_bytes(digest[offset:offset + 4], "big") & 0x7FFFFFFF
+        return f"{value % self._modulus:0{self.digits}d}"
+
+    def _current_step(self) -> int:
+        return int(self._clock() // self.step_seconds)
+
+    async def issue(self, user: User, resend: bool = False) -> ActivationCode:
+        nonce = user.activation_nonce
+        if resend:
+            bumped = await self.user_repository.bump_activation_nonce(user.user_id)
+            if bumped is not None:
+                nonce = user.activation_nonce = bumped
+
+        step = self._current_step()
+        expires_at = datetime.fromtimestamp((step + self.valid_steps) * self.step_seconds, timezone.utc)
+        return ActivationCode(
+            user_id=user.user_id,
+            code=self.derive_code(user.user_id, step, nonce),
+            expires_at=expires_at
+        )
+
+    async def consume(self, user: User, code: str) -> CodeConsumeResult:
+        step = self._current_step()
+        for age in range(self.valid_steps + self.expired_lookback_steps):
+            expected = self.derive_code(user.user_id, step - age, user.activation_nonce)
+            if hmac.compare_digest(expected, code):
+                return CodeConsumeResult.CONSUMED if age < self.valid_steps else CodeConsumeResult.EXPIRED
+        return CodeConsumeResult.NOT_FOUND
+
+    async def invalidate_user(self, user_id: Any) -> None:
+        await self.user_repository.bump_activation_nonce(user_id)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "backend": "hmac",
+            "step_seconds": self.step_seconds,
+            "valid_steps": self.valid_steps,
+        }
@@ -0,0 +1,106 @@
+import heapq
+import itertools
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.domain.user.entities import ActivationCode, CodeConsumeResult, User
+from src.infrastructure.activation_codes.activation_code_store import StoredActivationCodeStore
+
+
+class InMemoryActivationCodeStore(StoredActivationCodeStore):
+    """
+    Codes in a dict keyed by user, expired through a min-heap of deadlines.
+
+    Every method runs without yielding to the event loop, so consume and
+    replace are atomic for coroutines. Expired entries are purged from the
+    heap top on each call. When the store is full, the code closest to
+    expiry is evicted.
+
+    Codes only exist in this process: use it for single-worker deployments,
+    or where activation requests are routed to the worker that registered
+    the user. Restarting the process drops all codes (users can resend).
+    """
+
+    def __init__(self, max_entries: int = 100000, clock: Callable[[], float] = time.time):
+        if max_entries < 1:
+            raise ValueError("Code store needs room for at least one code")
+        self.max_entries = max_entries
+        self._clock = clock
+        # user_id -> (code, expires_at timestamp, entry sequence)
+        self._codes: Dict[str, Tuple[str, float, int]] = {}
+        # (expires_at timestamp, entry sequence, user_id); stale items are skipped
+        self._deadlines: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+
+        # Metrics
+        self.expirations = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def _purge_expired(self, now: float) -> int:
+        purged = 0
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            _, sequence, user_id = heapq.heappop(deadlines)
+            entry = self._codes.get(user_id)
+            if entry is not None and entry[2] == sequence:
+                del self._codes[user_id]
+                purged += 1
+        self.expirations += purged
+        return purged
+
+    def _evict_soonest(self) -> None:
+        while self._deadlines:
+            _, sequence, user_id = heapq.heappop(self._deadlines)
+            entry = self._codes.get(user_id)
+            if entry is not None and entry[2] == sequence:
+                del self._codes[user_id]
+                self.evictions += 1
+                return
+
+    async def put(self, activation_code: ActivationCode) -> None:
+        self._purge_expired(self._clock())
+        user_id = str(activation_code.user_id)
+        if user_id not in self._codes and len(self._codes) >= self.max_entries:
+            self._evict_soonest()
+
+        expires_at = activation_code.expires_at.timestamp()
+        sequence = next(self._sequence)
+        self._codes[user_id] = (activation_code.code, expires_at, sequence)
+        heapq.heappush(self._deadlines, (expires_at, sequence, user_id))
+
+        # Replaced codes leave stale heap items; rebuild if they pile up
+        if len(self._deadlines) > 2 * self.max_entries:
+            self._deadlines = [(entry[1], entry[2], key) for key, entry in self._codes.items()]
+            heapq.heapify(self._deadlines)
+
+    async def consume(self, user: User, code: str) -> CodeConsumeResult:
+        now = self._clock()
+        key = str(user.user_id)
+        entry = self._codes.get(key)
+        if entry is None or entry[0] != code:
+            self._purge_expired(now)
+            return CodeConsumeResult.NOT_FOUND
+        if entry[1] <= now:
+            del self._codes[key]
+            self.expirations += 1
+            return CodeConsumeResult.EXPIRED
+        del self._codes[key]
+        return CodeConsumeResult.CONSUMED
+
+    async def invalidate_user(self, user_id: Any) -> None:
+        self._codes.pop(str(user_id), None)
+
+    async def cleanup_expired(self) -> int:
+        return self._purge_expired(self._clock())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "size": len(self._codes),
+            "max_entries": self.max_entries,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
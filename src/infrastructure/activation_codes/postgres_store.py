@@ -0,0 +1,40 @@
+from typing import Any, Dict, Optional
+
+from src.domain.user.code_cleaner import ActivationCodeCleaner
+from src.domain.user.entities import ActivationCode, CodeConsumeResult, User
+from src.domain.user.repository import ActivationCodeRepository
+from src.infrastructure.activation_codes.activation_code_store import StoredActivationCodeStore
+
+
+class PostgresActivationCodeStore(StoredActivationCodeStore):
+    """Codes in the activation_codes table, next to the users they belong to."""
+
+    colocated_with_users = True
+
+    def __init__(
+        self,
+        activation_code_repository: ActivationCodeRepository,
+        cleaner: Optional[ActivationCodeCleaner] = None
+    ):
+        self.activation_code_repository = activation_code_repository
+        self.cleaner = cleaner
+
+    async def put(self, activation_code: ActivationCode) -> None:
+        await self.activation_code_repository.create_activation_code(activation_code)
+
+    async def consume(self, user: User, code: str) -> CodeConsumeResult:
+        return await self.activation_code_repository.consume_code(user.user_id, code)
+
+    async def invalidate_user(self, user_id: Any) -> None:
+        await self.activation_code_repository.invalidate_user_codes(user_id)
+
+    async def cleanup_expired(self) -> int:
+        if self.cleaner is not None:
+            return (await self.cleaner.run()).deleted
+        return await self.activation_code_repository.cleanup_expired_codes()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = {"backend": "postgres"}
+        if self.cleaner is not None:
+            metrics["cleanup"] = self.cleaner.get_metrics()
+        return metrics
@@ -0,0 +1,86 @@
+import logging
+import time
+from typing import Any, Callable, Dict
+
+from src.domain.exceptions import DatabaseException
+from src.domain.user.entities import ActivationCode, CodeConsumeResult, User
+from src.infrastructure.activation_codes.activation_code_store import StoredActivationCodeStore
+from src.infrastructure.redis.resp_client import RespClient, RespError
+
+logger = logging.getLogger(__name__)
+
+
+class RedisActivationCodeStore(StoredActivationCodeStore):
+    """
+    Codes in Redis (6.2+), shared by every API worker.
+
+    Each code is its own key, ``<prefix>code:<user_id>:<code>``, holding its
+    expiry in epoch milliseconds. GETDEL on that key is the atomic consume,
+    and a wrong guess touches nothing else. ``<prefix>user:<user_id>`` points
+    at the user's live code, so ``put`` and ``invalidate_user`` can drop it.
+    Keys outlive the code by ``expired_grace_seconds`` so that a late
+    attempt is reported as expired rather than unknown, and then Redis
+    deletes them: there is nothing to clean up.
+    """
+
+    def __init__(
+        self,
+        client: RespClient,
+        prefix: str = "dm:activation:",
+        expired_grace_seconds: float = 300.0,
+        clock: Callable[[], float] = time.time
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.expired_grace_ms = int(expired_grace_seconds * 1000)
+        self._clock = clock
+
+    @classmethod
+    def from_settings(cls, settings) -> 'RedisActivationCodeStore':
+        """Build a Redis code store from application settings."""
+        return cls(RespClient(settings.redis_url), prefix=settings.activation_code_redis_prefix)
+
+    def _user_key(self, user_id: Any) -> str:
+        return f"{self.prefix}user:{user_id}"
+
+    def _code_key(self, user_id: Any, code: str) -> str:
+        return f"{self.prefix}code:{user_id}:{code}"
+
+    async def _call(self, operation: str, *commands):
+        try:
+            return await self.client.pipeline(*commands)
+        except (ConnectionError, RespError) as e:
+            logger.error(f"Activation code store failed to {operation}: {str(e)}")
+            raise DatabaseException(f"Activation code store failed to {operation}: {str(e)}")
+
+    async def put(self, activation_code: ActivationCode) -> None:
+        user_id = activation_code.user_id
+        expires_ms = int(activation_code.expires_at.timestamp() * 1000)
+        keep_ms = max(1, expires_ms - int(self._clock() * 1000)) + self.expired_grace_ms
+
+        previous, _ = await self._call(
+            "store code",
+            ("SET", self._user_key(user_id), activation_code.code, "PX", keep_ms, "GET"),
+            ("SET", self._code_key(user_id, activation_code.code), expires_ms, "PX", keep_ms)
+        )
+        if previous is not None and previous.decode("utf-8") != activation_code.code:
+            await self._call("invalidate code", ("DEL", self._code_key(user_id, previous.decode("utf-8"))))
+
+    async def consume(self, user: User, code: str) -> CodeConsumeResult:
+        (expires_ms,) = await self._call("consume code", ("GETDEL", self._code_key(user.user_id, code)))
+        if expires_ms is None:
+            return CodeConsumeResult.NOT_FOUND
+        if int(expires_ms) <= self._clock() * 1000:
+            return CodeConsumeResult.EXPIRED
+        return CodeConsumeResult.CONSUMED
+
+    async def invalidate_user(self, user_id: Any) -> None:
+        (code,) = await self._call("invalidate codes", ("GETDEL", self._user_key(user_id)))
+        if code is not None:
+            await self._call("invalidate codes", ("DEL", self._code_key(user_id, code.decode("utf-8"))))
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"backend": "redis", "url": f"redis://{self.client.host}:{self.client.port}/{self.client.db}"}
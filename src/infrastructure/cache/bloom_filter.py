@@ -0,0 +1,209 @@
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+from typing import Any, Dict, List, Optional, Union
+
+_MAGIC = b"BLMF"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHI")  # magic, version, metadata length
+_ALIGNMENT = 8
+
+Bits = Union[bytearray, memoryview]
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Sized for ``capacity`` items at false-positive rate ``error_rate``.
+    Positions come from double hashing one 128-bit BLAKE2b digest.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[Bits] = None, count: int = 0):
+        if capacity < 1:
+            raise ValueError("Bloom filter capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("Bloom filter error rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        size = (self.num_bits + 7) // 8
+        if bits is not None and len(bits) != size:
+            raise ValueError(f"Expected {size} bytes of filter bits, got {len(bits)}")
+        self.bits: Bits = bits if bits is not None else bytearray(size)
+        self.count = count
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> bool:
+        """Add an item. Returns True if it was (probably) not there before."""
+        bits = self.bits
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows by adding tighter filters as it fills up.
+
+    Each new stage has ``growth`` times the capacity of the previous one and
+    a false-positive rate multiplied by ``tightening``, which keeps the
+    compound rate under ``error_rate`` however many items are added.
+
+    Snapshots are written to a file that ``load`` memory-maps copy-on-write:
+    pages are read lazily, and later additions stay private to the process.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        growth: int = 2,
+        tightening: float = 0.5
+    ):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: List[BloomFilter] = []
+        self.metadata: Dict[str, Any] = {}
+        self._mmap: Optional[mmap.mmap] = None
+
+    def _new_stage(self) -> BloomFilter:
+        stage = len(self.filters)
+        stage_filter = BloomFilter(
+            capacity=self.initial_capacity * (self.growth ** stage),
+            error_rate=self.error_rate * (1 - self.tightening) * (self.tightening ** stage)
+        )
+        self.filters.append(stage_filter)
+        return stage_filter
+
+    def add(self, item: str) -> bool:
+        """Add an item. Returns True if it was (probably) not there before."""
+        if item in self:
+            return False
+        current = self.filters[-1] if self.filters else None
+        if current is None or current.is_full:
+            current = self._new_stage()
+        return current.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        return any(item in stage_filter for stage_filter in reversed(self.filters))
+
+    def __len__(self) -> int:
+        return sum(stage_filter.count for stage_filter in self.filters)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(len(stage_filter.bits) for stage_filter in self.filters)
+
+    def save(self, path: str) -> None:
+        """
+        Write a snapshot atomically (temp file + rename).
+
+        Args:
+            path: Snapshot file path
+        """
+        stages = []
+        offset = 0
+        for stage_filter in self.filters:
+            stages.append({
+                "capacity": stage_filter.capacity,
+                "error_rate": stage_filter.error_rate,
+                "count": stage_filter.count,
+                "offset": offset,
+                "size": len(stage_filter.bits),
+            })
+            offset += -(-len(stage_filter.bits) // _ALIGNMENT) * _ALIGNMENT
+
+        metadata = json.dumps({
+            "initial_capacity": self.initial_capacity,
+            "error_rate": self.error_rate,
+            "growth": self.growth,
+            "tightening": self.tightening,
+            "stages": stages,
+            "metadata": self.metadata,
+        }).encode("utf-8")
+        header = _HEADER.pack(_MAGIC, _VERSION, len(metadata)) + metadata
+        header += b"\x00" * (-len(header) % _ALIGNMENT)
+
+        temp_path = f"{path}.tmp.{os.getpid()}"
+        with open(temp_path, "wb") as snapshot:
+            snapshot.write(header)
+            for stage_filter in self.filters:
+                snapshot.write(stage_filter.bits)
+                snapshot.write(b"\x00" * (-len(stage_filter.bits) % _ALIGNMENT))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'ScalableBloomFilter':
+        """
+        Memory-map a snapshot copy-on-write.
+
+        Args:
+            path: Snapshot file path
+
+        Returns:
+            Filter backed by the mapped file
+
+        Raises:
+            ValueError: If the file is not a filter snapshot
+        """
+        with open(path, "rb") as snapshot:
+            mapped = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        try:
+            magic, version, metadata_length = _HEADER.unpack_from(mapped, 0)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"Not a Bloom filter snapshot: {path}")
+            metadata_end = _HEADER.size + metadata_length
+            metadata = json.loads(bytes(mapped[_HEADER.size:metadata_end]).decode("utf-8"))
+            data_start = metadata_end + (-metadata_end % _ALIGNMENT)
+
+            bloom = cls(
+                initial_capacity=metadata["initial_capacity"],
+                error_rate=metadata["error_rate"],
+                growth=metadata["growth"],
+                tightening=metadata["tightening"]
+            )
+            bloom.metadata = metadata["metadata"]
+            view = memoryview(mapped)
+            for stage in metadata["stages"]:
+                start = data_start + stage["offset"]
+                bloom.filters.append(BloomFilter(
+                    capacity=stage["capacity"],
+                    error_rate=stage["error_rate"],
+                    bits=view[start:start + stage["size"]],
+                    count=stage["count"]
+                ))
+        except (struct.error, KeyError, TypeError, ValueError) as e:
+            # Views into the map may still be alive; leave closing to the GC
+            raise ValueError(f"Unreadable Bloom filter snapshot {path}: {str(e)}")
+
+        bloom._mmap = mapped
+        return bloom
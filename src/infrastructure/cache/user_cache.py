@@ -0,0 +1,145 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from src.domain.user.entities import FrozenUser
+from src.infrastructure.cache.ttl_cache import TTLCache
+
+# Cached "no such user"
+_NEGATIVE = object()
+_MISSING = object()
+
+
+class UserCache:
+    """
+    Read-through cache of users by email and by id.
+
+    Holds immutable ``FrozenUser`` snapshots under both keys, and short-lived
+    negative entries for lookups that found nothing. Concurrent misses for
+    the same key share one database load. Any invalidation bumps a
+    generation counter, and a load that started before it does not fill the
+    cache, so a write racing a read never leaves a stale entry behind.
+
+    The cache is per process: writes made by other workers are only picked
+    up when entries expire, so keep the TTL short.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        negative_ttl_seconds: float = 2.0,
+        max_entries: int = 10000
+    ):
+        if negative_ttl_seconds <= 0:
+            raise ValueError("Negative entry TTL must be positive")
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._cache: TTLCache[Any] = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._loads: Dict[Hashable, asyncio.Task] = {}
+        self._generation = 0
+
+        # Metrics
+        self.negative_hits = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> 'UserCache':
+        """Build a user cache from application settings."""
+        return cls(
+            ttl_seconds=settings.user_cache_ttl_seconds,
+            negative_ttl_seconds=settings.user_cache_negative_ttl_seconds,
+            max_entries=settings.user_cache_max_entries
+        )
+
+    async def get_by_email(
+        self,
+        email: str,
+        loader: Callable[[], Awaitable[Optional[FrozenUser]]]
+    ) -> Optional[FrozenUser]:
+        """
+        Get a user by email, loading it on a miss.
+
+        Args:
+            email: User email
+            loader: Coroutine factory reading the user from the database
+
+        Returns:
+            Cached or loaded user, or None if there is no such user
+        """
+        return await self._get(("email", email), loader)
+
+    async def get_by_id(
+        self,
+        user_id: Any,
+        loader: Callable[[], Awaitable[Optional[FrozenUser]]]
+    ) -> Optional[FrozenUser]:
+        """
+        Get a user by id, loading it on a miss.
+
+        Args:
+            user_id: User ID
+            loader: Coroutine factory reading the user from the database
+
+        Returns:
+            Cached or loaded user, or None if there is no such user
+        """
+        return await self._get(("id", str(user_id)), loader)
+
+    async def _get(self, key: Hashable, loader) -> Optional[FrozenUser]:
+        cached = self._cache.get(key, _MISSING)
+        if cached is _NEGATIVE:
+            self.negative_hits += 1
+            return None
+        if cached is not _MISSING:
+            return cached
+
+        load = self._loads.get(key)
+        if load is None:
+            load = asyncio.ensure_future(self._load(key, loader))
+            self._loads[key] = load
+            load.add_done_callback(lambda _: self._loads.pop(key, None))
+        else:
+            self.coalesced += 1
+        # Shielded: a cancelled caller must not cancel the load others wait on
+        return await asyncio.shield(load)
+
+    async def _load(self, key: Hashable, loader) -> Optional[FrozenUser]:
+        generation = self._generation
+        user = await loader()
+        if generation == self._generation:
+            if user is None:
+                self._cache.set(key, _NEGATIVE, ttl_seconds=self.negative_ttl_seconds)
+            else:
+                self._store(user)
+        return user
+
+    def _store(self, user: FrozenUser) -> None:
+        self._cache.set(("email", user.email), user)
+        self._cache.set(("id", str(user.user_id)), user)
+
+    def invalidate(self, user_id: Any = None, email: Optional[str] = None) -> None:
+        """
+        Drop a user's entries after a write.
+
+        Args:
+            user_id: User ID; the cached email for this id is dropped too
+            email: User email, e.g. to clear a negative entry after creation
+        """
+        self._generation += 1
+        self.invalidations += 1
+        if user_id is not None:
+            cached = self._cache.get(("id", str(user_id)), _MISSING)
+            if isinstance(cached, FrozenUser):
+                self._cache.delete(("email", cached.email))
+            self._cache.delete(("id", str(user_id)))
+        if email is not None:
+            self._cache.delete(("email", email))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache counters."""
+        return {
+            **self._cache.get_metrics(),
+            "negative_hits": self.negative_hits,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "loads_in_flight": len(self._loads),
+        }
@@ -1,13 +1,30 @@
 import asyncpg
 import logging
-from typing import Optional, List, Dict, Any
-from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional, List, Dict, Any
+from contextlib import AsyncExitStack, asynccontextmanager
 
 from src.domain.exceptions import DatabaseException
+from src.infrastructure.database.statements import Statement, StatementRegistry
+from src.infrastructure.database.schema_migrations import (
+    EMAIL_SEARCH_INDEX,
+    SCHEDULED_JOBS_TABLE,
+    SCHEMA_CREATE_LOCK_KEY,
+    USER_COUNTERS_TABLE,
+    USERS_INDEXES
+)
 
 logger = logging.getLogger(__name__)
 
 
+class StatementConnection(asyncpg.Connection):
+    """Connection that keeps its prepared registry statements by name."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements: Dict[str, asyncpg.prepared_stmt.PreparedStatement] = {}
+
+
 class PostgreSQLClient:
     """PostgreSQL client for managing database connections."""
 
@@ -19,7 +36,8 @@ class PostgreSQLClient:
         username: str,
         password: str,
         min_connections: int = 10,
-        max_connections: int = 20
+        max_connections: int = 20,
+        statements: Optional[StatementRegistry] = None
     ):
         self.host = host
         self.port = port
@@ -28,7 +46,14 @@ class PostgreSQLClient:
         self.password = password
         self.min_connections = min_connections
         self.max_connections = max_connections
+        self.statements = statements or StatementRegistry()
         self.pool: Optional[asyncpg.Pool] = None
+        # Prepare statements on new connections once the schema is known good
+        self._statements_ready = False
+        # Connection pinned by the unit of work running in the current task
+        self._current_connection: ContextVar[Optional[asyncpg.Connection]] = ContextVar(
+            f"pg_connection_{id(self)}", default=None
+        )
 
     async def connect(self):
         """Create connection pool."""
@@ -44,22 +69,124 @@ class PostgreSQLClient:
                 command_timeout=30,
                 server_settings={
                     'timezone': 'UTC'
-                }
+                },
+                connection_class=StatementConnection,
+                init=self._init_connection
             )
             logger.info("PostgreSQL connection pool created successfully")
         except Exception as e:
             logger.error(f"Failed to create PostgreSQL connection pool: {str(e)}")
             raise DatabaseException(f"Failed to connect to PostgreSQL: {str(e)}")
 
+    async def _init_connection(self, connection: StatementConnection) -> None:
+        """Pool init hook: prepare every registered statement on a new connection."""
+        if self._statements_ready:
+            for statement in self.statements:
+                await self._prepare(connection, statement)
+
+    @staticmethod
+    async def _prepare(connection, statement: Statement):
+        prepared = connection.prepared_statements.get(statement.name)
+        if prepared is None:
+            prepared = await connection.prepare(statement.sql, name=statement.name)
+            connection.prepared_statements[statement.name] = prepared
+        return prepared
+
+    async def warm_up_statements(self) -> None:
+        """
+        Prepare every registered statement on the pool's idle connections.
+        
+        Run after the schema exists. A statement that does not prepare
+        against the live schema fails startup instead of the first request
+        that uses it. Connections opened later prepare in the init hook.
+        
+        Raises:
+            DatabaseException: If any statement fails to prepare
+        """
+        if not self.pool:
+            raise DatabaseException("Database pool not initialized")
+
+        async with AsyncExitStack() as stack:
+            connections = [
+                await stack.enter_async_context(self.pool.acquire())
+                for _ in range(max(1, min(self.min_connections, self.pool.get_size())))
+            ]
+
+            failures = []
+            for statement in self.statements:
+                try:
+                    await self._prepare(connections[0], statement)
+                except Exception as e:
+                    failures.append(f"{statement.name}: {str(e)}")
+            if failures:
+                logger.error(f"Statements failed to prepare: {'; '.join(failures)}")
+                raise DatabaseException(f"Statements failed to prepare: {'; '.join(failures)}")
+
+            for connection in connections[1:]:
+                for statement in self.statements:
+                    await self._prepare(connection, statement)
+
+        self._statements_ready = True
+        logger.info(f"Prepared {len(self.statements)} statements on {len(connections)} connections")
+
     async def disconnect(self):
         """Close connection pool."""
         if self.pool:
             await self.pool.close()
             logger.info("PostgreSQL connection pool closed")
 
+    @asynccontextmanager
+    async def unit_of_work(self, transaction: bool = False):
+        """
+        Pin one pooled connection for a block of repository calls.
+        
+        Every query issued from the current task inside the block, through
+        any repository, runs on the same connection instead of acquiring
+        its own. Nested units of work reuse the outer connection; a nested
+        transaction becomes a savepoint.
+        
+        Don't await slow non-database work (password hashing, email) inside
+        the block: the connection stays checked out for its whole duration.
+        
+        Args:
+            transaction: Wrap the block in one transaction, committed on
+                success and rolled back on error
+            
+        Yields:
+            The pinned connection
+        """
+        pinned = self._current_connection.get()
+        if pinned is not None:
+            if transaction:
+                async with pinned.transaction():
+                    yield pinned
+            else:
+                yield pinned
+            return
+
+        if not self.pool:
+            raise DatabaseException("Database pool not initialized")
+
+        async with self.pool.acquire() as connection:
+            token = self._current_connection.set(connection)
+            try:
+                if transaction:
+                    async with connection.transaction():
+                        yield connection
+                else:
+                    yield connection
+            finally:
+                self._current_connection.reset(token)
+
     @asynccontextmanager
     async def get_connection(self):
         """Get connection from pool with context manager."""
+        pinned = self._current_connection.get()
+        if pinned is not None:
+            # Inside a unit of work: reuse its connection
+            yield pinned
+            return
+
         if not self.pool:
             raise DatabaseException("Database pool not initialized")
         
@@ -70,6 +197,35 @@ class PostgreSQLClient:
                 logger.error(f"Database operation failed: {str(e)}")
                 raise DatabaseException(f"Database operation failed: {str(e)}")
 
+    @asynccontextmanager
+    async def advisory_lock(self, key: int):
+        """
+        Hold a session-level advisory lock for the block, if it is free.
+        
+        The lock lives on a dedicated pooled connection, outside any unit of
+        work and without an open transaction, so a long block does not hold
+        back vacuum. If the process dies, the connection closes and the
+        lock is released with it.
+        
+        Args:
+            key: 64-bit lock key
+            
+        Yields:
+            The connection holding the lock, or None if another session has it
+        """
+        if not self.pool:
+            raise DatabaseException("Database pool not initialized")
+
+        async with self.pool.acquire() as connection:
+            acquired = await connection.fetchval("SELECT pg_try_advisory_lock($1)", key)
+            if not acquired:
+                yield None
+                return
+            try:
+                yield connection
+            finally:
+                await connection.fetchval("SELECT pg_advisory_unlock($1)", key)
+
     async def execute_query(
         self,
         query: str,
@@ -104,6 +260,94 @@ class PostgreSQLClient:
                 logger.error(f"Query execution failed: {query} - {str(e)}")
                 raise DatabaseException(f"Query execution failed: {str(e)}")
 
+    async def execute_statement(self, name: str, *args) -> Any:
+        """
+        Execute a registered statement by name.
+        
+        Args:
+            name: Statement name in the registry
+            *args: Statement parameters
+            
+        Returns:
+            Result shaped by the statement's fetch mode: list of records,
+            record (or None), single value, or the command status for None.
+            Records are returned as-is, without a dict copy.
+        """
+        try:
+            statement = self.statements.get(name)
+        except KeyError:
+            raise DatabaseException(f"Unknown statement: {name}")
+
+        async with self.get_connection() as conn:
+            try:
+                prepared = await self._prepare(conn, statement)
+                if statement.fetch == 'all':
+                    return await prepared.fetch(*args)
+                elif statement.fetch == 'one':
+                    return await prepared.fetchrow(*args)
+                elif statement.fetch == 'val':
+                    return await prepared.fetchval(*args)
+                else:
+                    await prepared.fetch(*args)
+                    return prepared.get_statusmsg()
+            except Exception as e:
+                logger.error(f"Statement execution failed: {name} - {str(e)}")
+                raise DatabaseException(f"Statement execution failed: {str(e)}")
+
+    async def stream_statement(self, name: str, *args, prefetch: int = 100) -> AsyncIterator[asyncpg.Record]:
+        """
+        Iterate over the rows of a registered statement through a server-side cursor.
+        
+        Rows are fetched ``prefetch`` at a time, so memory does not grow
+        with the result size. The connection and its read-only transaction
+        stay open until the iteration ends or the iterator is closed.
+        
+        Args:
+            name: Statement name in the registry
+            *args: Statement parameters
+            prefetch: Rows fetched per round trip
+            
+        Yields:
+            Records, as-is
+        """
+        try:
+            statement = self.statements.get(name)
+        except KeyError:
+            raise DatabaseException(f"Unknown statement: {name}")
+
+        async with self.get_connection() as conn:
+            try:
+                prepared = await self._prepare(conn, statement)
+                async with conn.transaction(readonly=True):
+                    async for record in prepared.cursor(*args, prefetch=prefetch):
+                        yield record
+            except Exception as e:
+                logger.error(f"Statement streaming failed: {name} - {str(e)}")
+                raise DatabaseException(f"Statement streaming failed: {str(e)}")
+
+    async def copy_records(self, table: str, records: List[tuple], columns: List[str]) -> int:
+        """
+        Load rows into a table with binary COPY.
+        
+        Inside a unit of work this runs on its connection, so it can fill a
+        temporary table that later statements of the same transaction read.
+        
+        Args:
+            table: Target table
+            records: Row tuples, in ``columns`` order
+            columns: Target columns
+            
+        Returns:
+            Number of rows copied
+        """
+        async with self.get_connection() as conn:
+            try:
+                status = await conn.copy_records_to_table(table, records=records, columns=columns)
+                return int(status.split()[-1])
+            except Exception as e:
+                logger.error(f"COPY into {table} failed: {str(e)}")
+                raise DatabaseException(f"COPY into {table} failed: {str(e)}")
+
     async def execute_transaction(self, queries: List[tuple]) -> None:
         """
         Execute multiple queries in a transaction.
@@ -121,7 +365,15 @@ class PostgreSQLClient:
                     raise DatabaseException(f"Transaction failed: {str(e)}")
 
     async def create_tables(self):
-        """Create database tables if they don't exist."""
+        """
+        Create the schema on a fresh database.
+        
+        Does nothing once the users table exists: plain CREATE INDEX on a
+        large table blocks writes for the whole build, so changes to an
+        existing database go through ``scripts/migrate_schema.py``, run
+        before the rollout. Workers starting together on a fresh database
+        take turns on an advisory lock.
+        """
         
         # Users table
         users_table = """
@@ -132,37 +384,76 @@ class PostgreSQLClient:
             status VARCHAR(50) NOT NULL DEFAULT 'PENDING',
             created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
             updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-            activated_at TIMESTAMP WITH TIME ZONE NULL
+            activated_at TIMESTAMP WITH TIME ZONE NULL,
+            activation_nonce INTEGER NOT NULL DEFAULT 0
         );
-        
-        CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
-        CREATE INDEX IF NOT EXISTS idx_users_status ON users(status);
         """
+        users_indexes = "".join(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {definition};\n" for name, definition in USERS_INDEXES
+        )
 
-        # Activation codes table
+        # Trigram index for substring search on email
+        search_index_name, search_index_definition = EMAIL_SEARCH_INDEX
+        email_search_index = f"""
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS {search_index_name} ON {search_index_definition};
+        """
+
+        # Activation codes table: one row per user, rewritten in place on
+        # resend. The free space left by the fillfactor and the lack of
+        # indexes on rewritten columns let those updates be HOT.
         activation_codes_table = """
         CREATE TABLE IF NOT EXISTS activation_codes (
-            user_id UUID NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+            user_id UUID PRIMARY KEY REFERENCES users(user_id) ON DELETE CASCADE,
             code VARCHAR(4) NOT NULL,
             expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
             created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
             used_at TIMESTAMP WITH TIME ZONE NULL,
-            is_used BOOLEAN DEFAULT FALSE,
-            PRIMARY KEY (user_id, code)
-        );
-        
-        CREATE INDEX IF NOT EXISTS idx_activation_codes_expires_at ON activation_codes(expires_at);
-        CREATE INDEX IF NOT EXISTS idx_activation_codes_is_used ON activation_codes(is_used);
+            is_used BOOLEAN DEFAULT FALSE
+        ) WITH (fillfactor = 70);
         """
 
+        # Maintenance tables: user counts by status, kept in sharded rows by
+        # the statements that change users, and the last run of each
+        # scheduled job across the fleet
+        maintenance_tables = f"{USER_COUNTERS_TABLE};\n{SCHEDULED_JOBS_TABLE};"
+
         try:
-            await self.execute_query(users_table)
-            await self.execute_query(activation_codes_table)
-            logger.info("Database tables created successfully")
-        except Exception as e:
+            async with self.unit_of_work(transaction=True):
+                await self.execute_query("SELECT pg_advisory_xact_lock($1)", SCHEMA_CREATE_LOCK_KEY)
+                if await self.execute_query("SELECT to_regclass('users') IS NOT NULL", fetch='val'):
+                    logger.info("Database schema exists; apply changes with scripts/migrate_schema.py")
+                    return
+                await self.execute_query(users_table)
+                await self.execute_query(users_indexes)
+                await self.execute_query(activation_codes_table)
+                await self.execute_query(maintenance_tables)
+                try:
+                    # Savepoint: a role without pg_trgm keeps the rest
+                    async with self.unit_of_work(transaction=True):
+                        await self.execute_query(email_search_index)
+                except DatabaseException as e:
+                    logger.warning(f"Email search will scan the users table, no trigram index: {str(e)}")
+        except DatabaseException as e:
             logger.error(f"Failed to create tables: {str(e)}")
             raise DatabaseException(f"Failed to create tables: {str(e)}")
 
+        logger.info("Database tables created successfully")
+
+    async def replication_lag_seconds(self) -> float:
+        """
+        Get the largest replay lag among connected standbys.
+        
+        Returns:
+            Lag in seconds; 0 without standbys or without the privilege
+            to read pg_stat_replication
+        """
+        lag = await self.execute_query(
+            "SELECT COALESCE(MAX(EXTRACT(EPOCH FROM replay_lag)), 0) FROM pg_stat_replication",
+            fetch='val'
+        )
+        return float(lag or 0)
+
     async def health_check(self) -> bool:
         """Check database connectivity."""
         try:
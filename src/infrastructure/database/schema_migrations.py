@@ -0,0 +1,249 @@
+import hashlib
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _lock_key(name: str) -> int:
+    return int.from_bytes(hashlib.sha256(f"schema:{name}".encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+# Serializes schema creation between workers starting on a fresh database
+SCHEMA_CREATE_LOCK_KEY = _lock_key("create")
+# Held by scripts/migrate_schema.py for its whole run
+SCHEMA_MIGRATION_LOCK_KEY = _lock_key("migrate")
+
+# (name, what it indexes) of the indexes on users
+USERS_INDEXES: List[Tuple[str, str]] = [
+    ("idx_users_email", "users (email)"),
+    ("idx_users_status", "users (status)"),
+    # Keyset pages of the admin listing and the export
+    ("idx_users_created_at_user_id", "users (created_at, user_id)"),
+    ("idx_users_pending_created_at", "users (created_at) WHERE status = 'PENDING'"),
+    # Covers the admin listing by status, for index-only scans
+    ("idx_users_status_created_at_user_id", "users (status, created_at, user_id) INCLUDE (email, activated_at)"),
+]
+
+# Substring search on email; needs pg_trgm, which the database role may
+# not be allowed to create
+EMAIL_SEARCH_INDEX: Tuple[str, str] = ("idx_users_email_trgm", "users USING gin (email gin_trgm_ops)")
+
+# Superseded by idx_users_created_at_user_id
+_OLD_USERS_INDEXES = ("idx_users_created_at",)
+
+# A migration returns what it changed; an empty list means nothing to do
+Migration = Callable[..., Awaitable[List[str]]]
+
+USER_COUNTERS_TABLE = """
+CREATE TABLE IF NOT EXISTS user_counters (
+    status VARCHAR(50) NOT NULL,
+    shard SMALLINT NOT NULL,
+    user_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (status, shard)
+) WITH (fillfactor = 50)
+"""
+
+SCHEDULED_JOBS_TABLE = """
+CREATE TABLE IF NOT EXISTS scheduled_jobs (
+    name VARCHAR(100) PRIMARY KEY,
+    last_started_at TIMESTAMP WITH TIME ZONE,
+    last_finished_at TIMESTAMP WITH TIME ZONE,
+    last_duration_ms INTEGER,
+    last_outcome VARCHAR(20),
+    last_error TEXT,
+    last_runner VARCHAR(255)
+)
+"""
+
+# Indexes on activation_codes from before codes were one row per user
+_OLD_ACTIVATION_CODE_INDEXES = (
+    "idx_activation_codes_expires_at",
+    "idx_activation_codes_is_used",
+    "idx_activation_codes_created_at",
+)
+
+
+async def _relation_exists(db_client, name: str) -> bool:
+    return await db_client.execute_query("SELECT to_regclass($1) IS NOT NULL", name, fetch='val')
+
+
+async def _has_rows(db_client, table: str) -> bool:
+    return await db_client.execute_query(f"SELECT EXISTS (SELECT 1 FROM {table})", fetch='val')
+
+
+async def _has_composite_primary_key(db_client, table: str) -> bool:
+    return bool(await db_client.execute_query(
+        """
+        SELECT 1 FROM pg_index
+        WHERE indrelid = to_regclass($1) AND indisprimary AND indnatts > 1
+        """,
+        table,
+        fetch='val'
+    ))
+
+
+async def activation_codes_one_row_per_user(db_client) -> List[str]:
+    """
+    Key activation_codes on user_id alone, keeping each user's newest code.
+
+    The primary key swap rewrites the index under an ACCESS EXCLUSIVE lock
+    on activation_codes; registrations and activations wait for it, so
+    this is a step to run before the rollout, not at app startup.
+    """
+    if not await _relation_exists(db_client, "activation_codes"):
+        return []
+
+    changes = []
+    if await _has_composite_primary_key(db_client, "activation_codes"):
+        async with db_client.unit_of_work(transaction=True):
+            await db_client.execute_query("LOCK TABLE activation_codes IN ACCESS EXCLUSIVE MODE")
+            # Another run may have finished while this one waited
+            if await _has_composite_primary_key(db_client, "activation_codes"):
+                deleted = await db_client.execute_query("""
+                    DELETE FROM activation_codes older
+                    USING activation_codes newer
+                    WHERE older.user_id = newer.user_id
+                      AND (older.created_at, older.code) < (newer.created_at, newer.code)
+                """)
+                await db_client.execute_query("ALTER TABLE activation_codes DROP CONSTRAINT activation_codes_pkey")
+                await db_client.execute_query("ALTER TABLE activation_codes ADD PRIMARY KEY (user_id)")
+                changes.append(f"deleted {deleted.split()[-1]} superseded codes, primary key now (user_id)")
+
+    fillfactor = await db_client.execute_query(
+        "SELECT 'fillfactor=70' = ANY(COALESCE(reloptions, '{}')) FROM pg_class WHERE oid = 'activation_codes'::regclass",
+        fetch='val'
+    )
+    if not fillfactor:
+        await db_client.execute_query("ALTER TABLE activation_codes SET (fillfactor = 70)")
+        changes.append("fillfactor 70")
+
+    for index in _OLD_ACTIVATION_CODE_INDEXES:
+        if await _relation_exists(db_client, index):
+            await db_client.execute_query(f"DROP INDEX CONCURRENTLY IF EXISTS {index}")
+            changes.append(f"dropped {index}")
+    return changes
+
+
+async def seeded_user_counters(db_client) -> List[str]:
+    """
+    Create the maintenance tables and seed user_counters from users.
+
+    The counters only ever receive deltas, so on a database that already
+    has users they must start from a full count, or the stats read zero or
+    negative. Users the previous release registers after the seed are
+    picked up by the ``stats.reconcile`` job.
+    """
+    changes = []
+    if await _relation_exists(db_client, "user_stats"):
+        await db_client.execute_query("DROP TABLE IF EXISTS user_stats")
+        changes.append("dropped user_stats")
+    if not await _relation_exists(db_client, "scheduled_jobs"):
+        await db_client.execute_query(SCHEDULED_JOBS_TABLE)
+        changes.append("created scheduled_jobs")
+    if not await _relation_exists(db_client, "user_counters"):
+        await db_client.execute_query(USER_COUNTERS_TABLE)
+        changes.append("created user_counters")
+
+    if await _has_rows(db_client, "user_counters"):
+        return changes
+    async with db_client.unit_of_work(transaction=True):
+        # Keeps counter writes out until the seed is in
+        await db_client.execute_query("LOCK TABLE user_counters IN SHARE ROW EXCLUSIVE MODE")
+        if not await _has_rows(db_client, "user_counters"):
+            seeded = await db_client.execute_query("""
+                INSERT INTO user_counters (status, shard, user_count)
+                SELECT status, 0, count(*) FROM users GROUP BY status
+            """)
+            changes.append(f"seeded user_counters ({seeded.split()[-1]} statuses)")
+    return changes
+
+
+async def users_activation_nonce(db_client) -> List[str]:
+    """Add the resend counter of derived activation codes (metadata only)."""
+    exists = await db_client.execute_query(
+        "SELECT 1 FROM pg_attribute WHERE attrelid = 'users'::regclass AND attname = 'activation_nonce' AND NOT attisdropped",
+        fetch='val'
+    )
+    if exists:
+        return []
+    await db_client.execute_query("ALTER TABLE users ADD COLUMN IF NOT EXISTS activation_nonce INTEGER NOT NULL DEFAULT 0")
+    return ["added users.activation_nonce"]
+
+
+async def _build_index(db_client, name: str, definition: str) -> Optional[str]:
+    """Build an index without blocking writes, unless a valid one exists."""
+    valid = await db_client.execute_query(
+        "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1)", name, fetch='val'
+    )
+    if valid:
+        return None
+    if valid is not None:
+        # Left behind by an interrupted concurrent build
+        await db_client.execute_query(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    await db_client.execute_query(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+    return f"built {name}"
+
+
+async def users_indexes(db_client) -> List[str]:
+    """
+    Build the indexes on users with CREATE INDEX CONCURRENTLY.
+
+    Registrations and activations keep going during the builds, which can
+    take minutes each on a large table. A build that fails leaves an
+    invalid index behind; the next run drops and rebuilds it.
+    """
+    changes = []
+    for name, definition in USERS_INDEXES:
+        built = await _build_index(db_client, name, definition)
+        if built:
+            changes.append(built)
+
+    try:
+        if not await db_client.execute_query(
+            "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'", fetch='val'
+        ):
+            await db_client.execute_query("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            changes.append("created extension pg_trgm")
+    except Exception as e:
+        logger.warning(f"Email search will scan the users table, no trigram index: {str(e)}")
+    else:
+        built = await _build_index(db_client, *EMAIL_SEARCH_INDEX)
+        if built:
+            changes.append(built)
+
+    for index in _OLD_USERS_INDEXES:
+        if await _relation_exists(db_client, index):
+            await db_client.execute_query(f"DROP INDEX CONCURRENTLY IF EXISTS {index}")
+            changes.append(f"dropped {index}")
+    return changes
+
+
+# In the order they must run; the long index builds last
+MIGRATIONS: List[Tuple[str, Migration]] = [
+    ("users_activation_nonce", users_activation_nonce),
+    ("activation_codes_one_row_per_user", activation_codes_one_row_per_user),
+    ("seeded_user_counters", seeded_user_counters),
+    ("users_indexes", users_indexes),
+]
+
+
+async def run_migrations(db_client) -> Dict[str, List[str]]:
+    """
+    Apply every migration, in order.
+
+    Each one checks the catalog before changing anything, so running this
+    again on a migrated database changes nothing.
+
+    Returns:
+        What each migration changed
+    """
+    applied = {}
+    for name, migration in MIGRATIONS:
+        changes = await migration(db_client)
+        if changes:
+            logger.info(f"Migration {name}: {'; '.join(changes)}")
+        else:
+            logger.info(f"Migration {name}: already applied")
+        applied[name] = changes
+    return applied
@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+
+FETCH_MODES = (None, 'all', 'one', 'val')
+
+
+@dataclass(frozen=True)
+class Statement:
+    """A named SQL statement and how its result is read."""
+
+    name: str
+    sql: str
+    fetch: Optional[str] = None
+
+
+class StatementRegistry:
+    """
+    Named SQL statements declared once and prepared on every connection.
+
+    PostgreSQLClient prepares each registered statement on every pooled
+    connection, so callers run them by name through ``execute_statement``
+    without paying a parse/plan per fresh connection.
+    """
+
+    def __init__(self):
+        self._statements: Dict[str, Statement] = {}
+
+    def register(self, name: str, sql: str, fetch: Optional[str] = None) -> Statement:
+        """
+        Register a statement.
+
+        Args:
+            name: Unique dotted name, e.g. ``users.by_email``
+            sql: SQL text with $n placeholders
+            fetch: 'all', 'one', 'val', or None for the command status
+
+        Returns:
+            The registered statement
+
+        Raises:
+            ValueError: If the name is taken or the fetch mode is unknown
+        """
+        if name in self._statements:
+            raise ValueError(f"Statement already registered: {name}")
+        if fetch not in FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode for {name}: {fetch}")
+        statement = Statement(name=name, sql=sql, fetch=fetch)
+        self._statements[name] = statement
+        return statement
+
+    def merge(self, other: 'StatementRegistry') -> 'StatementRegistry':
+        """Register every statement of another registry into this one."""
+        for statement in other:
+            self.register(statement.name, statement.sql, statement.fetch)
+        return self
+
+    def get(self, name: str) -> Statement:
+        """
+        Get a statement by name.
+
+        Raises:
+            KeyError: If no statement has this name
+        """
+        return self._statements[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._statements
+
+    def __iter__(self) -> Iterator[Statement]:
+        return iter(self._statements.values())
+
+    def __len__(self) -> int:
+        return len(self._statements)
@@ -18,7 +18,7 @@ class EmailService:
         self.queue_name = queue_name
         self._is_consuming = False
 
-    async def send_activation_code(self, email: str, activation_code: str, user_id: str):
+    async def send_activation_code(self, email: str, activation_code: str, user_id: Any):
         """
         Send activation code via RabbitMQ queue.
         
@@ -31,7 +31,7 @@ class EmailService:
             "type": "activation_code",
             "recipient": email,
             "activation_code": activation_code,
-            "user_id": user_id,
+            "user_id": str(user_id),
             "subject": "Your Dailymotion Activation Code",
             "template": "activation_code",
             "timestamp": asyncio.get_event_loop().time()
@@ -0,0 +1,131 @@
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import bcrypt
+
+from src.infrastructure.hashing.hashing_executor import HashingExecutor
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION_PASSWORD = "calibration-password-1"
+
+
+def time_bcrypt_hashes(rounds: int, samples: int) -> List[float]:
+    """
+    Time repeated bcrypt hashes at a given cost.
+
+    Module-level so it runs inside a hashing pool worker, which is what
+    production hashes will run on.
+
+    Args:
+        rounds: bcrypt cost factor
+        samples: Number of hashes to time
+
+    Returns:
+        Hash durations in milliseconds
+    """
+    password = CALIBRATION_PASSWORD.encode('utf-8')
+    durations = []
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+        durations.append((time.perf_counter() - started_at) * 1000)
+    return durations
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class CalibrationResult:
+    """Outcome of a bcrypt cost calibration run."""
+
+    rounds: int
+    p99_ms: float
+    budget_ms: float
+    measurements: Dict[int, float] = field(default_factory=dict)
+    within_budget: bool = True
+
+
+class BcryptCostCalibrator:
+    """
+    Picks the highest bcrypt cost whose p99 hash time fits a latency budget.
+
+    Costs are tried from ``min_rounds`` upwards; since every extra round
+    doubles the work, the search stops at the first cost over budget.
+    ``min_rounds`` is a security floor and is used even if it is too slow.
+    """
+
+    def __init__(
+        self,
+        budget_ms: float = 250.0,
+        min_rounds: int = 10,
+        max_rounds: int = 14,
+        samples: int = 5
+    ):
+        if min_rounds < 4 or max_rounds > 31 or min_rounds > max_rounds:
+            raise ValueError("bcrypt rounds must satisfy 4 <= min_rounds <= max_rounds <= 31")
+        if samples < 1:
+            raise ValueError("Calibration needs at least one sample")
+
+        self.budget_ms = budget_ms
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+        self.samples = samples
+
+    @classmethod
+    def from_settings(cls, settings) -> 'BcryptCostCalibrator':
+        """Build a calibrator from application settings."""
+        return cls(
+            budget_ms=settings.password_hash_budget_ms,
+            min_rounds=settings.password_hash_min_rounds,
+            max_rounds=settings.password_hash_max_rounds,
+            samples=settings.password_hash_calibration_samples
+        )
+
+    async def calibrate(self, hashing_executor: HashingExecutor) -> CalibrationResult:
+        """
+        Benchmark bcrypt on the hashing pool and choose a cost.
+
+        Args:
+            hashing_executor: Pool the production hashes will run on
+
+        Returns:
+            CalibrationResult with the chosen cost and per-cost p99 timings
+        """
+        measurements: Dict[int, float] = {}
+        chosen = self.min_rounds
+
+        for rounds in range(self.min_rounds, self.max_rounds + 1):
+            durations = await hashing_executor.run(time_bcrypt_hashes, rounds, self.samples)
+            measurements[rounds] = round(percentile(durations, 99), 3)
+            if measurements[rounds] > self.budget_ms:
+                break
+            chosen = rounds
+
+        result = CalibrationResult(
+            rounds=chosen,
+            p99_ms=measurements[chosen],
+            budget_ms=self.budget_ms,
+            measurements=measurements,
+            within_budget=measurements[chosen] <= self.budget_ms
+        )
+
+        if result.within_budget:
+            logger.info(
+                f"bcrypt cost calibrated to {result.rounds} rounds "
+                f"(p99 {result.p99_ms}ms, budget {self.budget_ms}ms)"
+            )
+        else:
+            logger.warning(
+                f"bcrypt p99 at the minimum of {self.min_rounds} rounds is {result.p99_ms}ms, "
+                f"over the {self.budget_ms}ms budget; using the minimum anyway"
+            )
+        return result
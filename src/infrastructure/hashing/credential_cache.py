@@ -0,0 +1,70 @@
+import hashlib
+import hmac
+import secrets
+from typing import Any, Dict, Optional
+
+from src.infrastructure.cache.ttl_cache import TTLCache
+
+
+class VerifiedCredentialCache:
+    """
+    Short-lived cache of recent successful password verifications.
+
+    Only an HMAC of (user_id, status, password, password_hash) is kept, under
+    a key generated per process, so the cache never holds plaintext or
+    anything that can be checked offline. A changed hash or status produces a
+    different MAC and therefore a miss, even for changes made by another
+    worker; ``invalidate`` drops an entry eagerly.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 120.0,
+        max_entries: int = 10000,
+        key: Optional[bytes] = None
+    ):
+        self._key = key or secrets.token_bytes(32)
+        self._cache: TTLCache[bytes] = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    @classmethod
+    def from_settings(cls, settings) -> 'VerifiedCredentialCache':
+        """Build a credential cache from application settings."""
+        return cls(
+            ttl_seconds=settings.credential_cache_ttl_seconds,
+            max_entries=settings.credential_cache_max_entries
+        )
+
+    def _digest(self, user, password: str) -> bytes:
+        message = "\x00".join((
+            str(user.user_id),
+            user.status.value,
+            password,
+            user.password_hash
+        )).encode('utf-8')
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def is_verified(self, user, password: str) -> bool:
+        """
+        Check whether this exact credential was verified recently.
+
+        Args:
+            user: User entity as just read from the database
+            password: Plain text password
+
+        Returns:
+            True if a matching verification is cached
+        """
+        cached = self._cache.get(str(user.user_id))
+        return cached is not None and hmac.compare_digest(cached, self._digest(user, password))
+
+    def add(self, user, password: str) -> None:
+        """Remember a successful verification for a user."""
+        self._cache.set(str(user.user_id), self._digest(user, password))
+
+    def invalidate(self, user_id: Any) -> None:
+        """Forget any cached verification for a user."""
+        self._cache.delete(str(user_id))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters."""
+        return self._cache.get_metrics()
@@ -0,0 +1,84 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from src.infrastructure.hashing.cost_calibration import BcryptCostCalibrator
+from src.infrastructure.hashing.hashing_executor import HashingExecutor
+from src.infrastructure.hashing.password_hasher import PasswordHasherRegistry
+
+
+class PasswordHashingBackend(ABC):
+    """Where UserRepository sends password hashing work."""
+
+    @abstractmethod
+    async def hash_password(self, password: str) -> str:
+        """Hash a password with the default hasher."""
+
+    @abstractmethod
+    async def verify_password(self, password: str, password_hash: str) -> bool:
+        """Check a password against a stored hash."""
+
+    @abstractmethod
+    async def needs_rehash(self, password_hash: str) -> bool:
+        """Check whether a stored hash should be migrated to the default hasher."""
+
+    async def start(self) -> None:
+        """Acquire resources (worker pool, connections)."""
+
+    async def close(self) -> None:
+        """Release resources."""
+
+    def average_hash_ms(self) -> Optional[float]:
+        """Observed mean time of one hashing job, or None before the first one."""
+        return None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get backend metrics."""
+        return {}
+
+
+class LocalHashingBackend(PasswordHashingBackend):
+    """Hashes in this process on a bounded worker pool."""
+
+    def __init__(self, hashing_executor: HashingExecutor, password_hashers: PasswordHasherRegistry):
+        self.hashing_executor = hashing_executor
+        self.password_hashers = password_hashers
+
+    @classmethod
+    async def from_settings(cls, settings) -> 'LocalHashingBackend':
+        """
+        Build a started local backend from application settings.
+        
+        Calibrates the bcrypt cost on the new pool when bcrypt is the default
+        hasher and calibration is enabled.
+        """
+        hashing_executor = HashingExecutor.from_settings(settings)
+        hashing_executor.start()
+
+        bcrypt_rounds = None
+        if settings.password_hasher == "bcrypt" and settings.password_hash_calibration_enabled:
+            calibration = await BcryptCostCalibrator.from_settings(settings).calibrate(hashing_executor)
+            bcrypt_rounds = calibration.rounds
+
+        return cls(hashing_executor, PasswordHasherRegistry.from_settings(settings, bcrypt_rounds=bcrypt_rounds))
+
+    async def hash_password(self, password: str) -> str:
+        return await self.hashing_executor.hash_password(self.password_hashers, password)
+
+    async def verify_password(self, password: str, password_hash: str) -> bool:
+        return await self.hashing_executor.verify_password(self.password_hashers, password, password_hash)
+
+    async def needs_rehash(self, password_hash: str) -> bool:
+        return self.password_hashers.needs_rehash(password_hash)
+
+    async def start(self) -> None:
+        self.hashing_executor.start()
+
+    async def close(self) -> None:
+        self.hashing_executor.shutdown()
+
+    def average_hash_ms(self) -> Optional[float]:
+        metrics = self.hashing_executor.get_metrics()
+        return metrics["avg_run_ms"] if metrics["completed"] else None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"backend": "local", **self.hashing_executor.get_metrics()}
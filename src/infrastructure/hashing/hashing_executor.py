@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from src.domain.exceptions import HashingCapacityException
+
+logger = logging.getLogger(__name__)
+
+THREAD_MODE = "thread"
+PROCESS_MODE = "process"
+
+
+class HashingExecutor:
+    """
+    Bounded worker pool for CPU-bound password hashing.
+
+    Jobs run on a thread or process pool so they never block the event loop.
+    At most ``max_workers`` jobs run at once and at most ``max_queue_size``
+    more may wait for a worker; anything beyond that is rejected immediately
+    with a ``HashingCapacityException`` (503) instead of piling up latency.
+    """
+
+    def __init__(
+        self,
+        mode: str = THREAD_MODE,
+        max_workers: Optional[int] = None,
+        max_queue_size: int = 64,
+        queue_timeout: Optional[float] = None
+    ):
+        if mode not in (THREAD_MODE, PROCESS_MODE):
+            raise ValueError(f"Unknown hashing executor mode: {mode}")
+        if max_queue_size < 0:
+            raise ValueError("Hashing queue size must be zero or positive")
+
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[Executor] = None
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+
+        # Metrics
+        self._waiting = 0
+        self._running = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._failed = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._total_run_time = 0.0
+
+    @classmethod
+    def from_settings(cls, settings) -> 'HashingExecutor':
+        """Build an executor from application settings."""
+        return cls(
+            mode=settings.password_hash_executor_mode,
+            max_workers=settings.password_hash_workers,
+            max_queue_size=settings.password_hash_max_queue_size,
+            queue_timeout=settings.password_hash_queue_timeout
+        )
+
+    def start(self) -> None:
+        """Create the underlying worker pool."""
+        if self._executor is not None:
+            return
+
+        if self.mode == PROCESS_MODE:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hashing"
+            )
+        logger.info(
+            f"Password hashing executor started ({self.mode} mode, "
+            f"{self.max_workers} workers, queue size {self.max_queue_size})"
+        )
+
+    def shutdown(self) -> None:
+        """Shut down the underlying worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            logger.info("Password hashing executor shut down")
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Run a hashing job on the worker pool.
+
+        Args:
+            func: Picklable callable to run (a module-level function or a
+                bound method of a picklable object in process mode)
+            *args: Arguments for ``func``
+
+        Returns:
+            The result of ``func(*args)``
+
+        Raises:
+            HashingCapacityException: If the wait queue is full or the job
+                waited longer than ``queue_timeout`` for a worker
+        """
+        if self._executor is None:
+            self.start()
+
+        if self._semaphore.locked() and self._waiting >= self.max_queue_size:
+            self._rejected += 1
+            logger.warning(
+                f"Password hashing queue saturated ({self._waiting} waiting), rejecting job"
+            )
+            raise HashingCapacityException()
+
+        self._submitted += 1
+        self._waiting += 1
+        enqueued_at = time.perf_counter()
+        try:
+            if self.queue_timeout is not None:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            else:
+                await self._semaphore.acquire()
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            logger.warning(f"Password hashing job waited more than {self.queue_timeout}s, rejecting")
+            raise HashingCapacityException()
+        finally:
+            self._waiting -= 1
+
+        wait_time = time.perf_counter() - enqueued_at
+        self._total_wait_time += wait_time
+        self._max_wait_time = max(self._max_wait_time, wait_time)
+
+        self._running += 1
+        started_at = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._total_run_time += time.perf_counter() - started_at
+            self._completed += 1
+            self._running -= 1
+            self._semaphore.release()
+
+    async def hash_password(self, hasher, password: str) -> str:
+        """Hash a password on the worker pool with a hasher or hasher registry."""
+        return await self.run(hasher.hash, password)
+
+    async def verify_password(self, hasher, password: str, password_hash: str) -> bool:
+        """Check a password against a stored hash on the worker pool."""
+        return await self.run(hasher.verify, password, password_hash)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a free worker."""
+        return self._waiting
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get executor metrics.
+
+        Returns:
+            Dictionary with queue depth, worker usage and wait/run times (ms)
+        """
+        completed = self._completed
+        started = completed + self._running
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_queue_size": self.max_queue_size,
+            "queue_depth": self._waiting,
+            "running": self._running,
+            "submitted": self._submitted,
+            "completed": completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "avg_wait_ms": round(self._total_wait_time / started * 1000, 3) if started else 0.0,
+            "max_wait_ms": round(self._max_wait_time * 1000, 3),
+            "avg_run_ms": round(self._total_run_time / completed * 1000, 3) if completed else 0.0,
+        }
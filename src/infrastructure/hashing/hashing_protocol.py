@@ -0,0 +1,126 @@
+"""
+Binary framing for the standalone hashing service.
+
+Every message is one frame::
+
+    uint32  body length (big endian, excludes these 4 bytes)
+    uint8   opcode (requests) or status (responses)
+    uint32  request id, echoed back so requests can be pipelined
+    fields  zero or more of: uint16 length + UTF-8 bytes
+
+Requests:
+    OP_PING          ()
+    OP_HASH          (password)
+    OP_VERIFY        (password, password_hash)
+    OP_NEEDS_REHASH  (password_hash)
+
+Responses carry the request id of the request they answer, in any order:
+    STATUS_OK     (result)  hash string, or "1"/"0" for boolean results
+    STATUS_BUSY   ()        worker queue is full, retry later
+    STATUS_ERROR  (message)
+"""
+import asyncio
+import struct
+from typing import List, Tuple
+
+OP_PING = 1
+OP_HASH = 2
+OP_VERIFY = 3
+OP_NEEDS_REHASH = 4
+
+STATUS_OK = 0
+STATUS_BUSY = 1
+STATUS_ERROR = 2
+
+MAX_FRAME_SIZE = 64 * 1024
+
+_LENGTH = struct.Struct("!I")
+_HEADER = struct.Struct("!BI")
+_FIELD_LENGTH = struct.Struct("!H")
+
+
+class ProtocolError(Exception):
+    """Raised on a malformed or oversized frame."""
+
+
+def encode_frame(kind: int, request_id: int, *fields: str) -> bytes:
+    """
+    Encode one frame.
+
+    Args:
+        kind: Opcode or status
+        request_id: Request id (0 - 2**32-1)
+        *fields: String fields
+
+    Returns:
+        Frame bytes including the length prefix
+    """
+    parts = [_HEADER.pack(kind, request_id)]
+    for field in fields:
+        data = field.encode('utf-8')
+        if len(data) > 0xFFFF:
+            raise ProtocolError("Frame field too large")
+        parts.append(_FIELD_LENGTH.pack(len(data)))
+        parts.append(data)
+    body = b"".join(parts)
+    if len(body) > MAX_FRAME_SIZE:
+        raise ProtocolError("Frame too large")
+    return _LENGTH.pack(len(body)) + body
+
+
+def decode_body(body: bytes) -> Tuple[int, int, List[str]]:
+    """
+    Decode a frame body (without its length prefix).
+
+    Returns:
+        Tuple of (opcode or status, request id, fields)
+    """
+    if len(body) < _HEADER.size:
+        raise ProtocolError("Frame too short")
+    kind, request_id = _HEADER.unpack_from(body)
+    fields = []
+    offset = _HEADER.size
+    while offset < len(body):
+        if offset + _FIELD_LENGTH.size > len(body):
+            raise ProtocolError("Truncated field length")
+        (length,) = _FIELD_LENGTH.unpack_from(body, offset)
+        offset += _FIELD_LENGTH.size
+        if offset + length > len(body):
+            raise ProtocolError("Truncated field")
+        fields.append(body[offset:offset + length].decode('utf-8'))
+        offset += length
+    return kind, request_id, fields
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, int, List[str]]:
+    """
+    Read and decode one frame from a stream.
+
+    Raises:
+        asyncio.IncompleteReadError: If the peer closed the connection
+        ProtocolError: If the frame is malformed
+    """
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    if length > MAX_FRAME_SIZE:
+        raise ProtocolError("Frame too large")
+    return decode_body(await reader.readexactly(length))
+
+
+def parse_address(url: str) -> Tuple[str, str, int]:
+    """
+    Parse a hashing service address.
+
+    Args:
+        url: ``unix:///path/to/socket`` or ``tcp://host:port``
+
+    Returns:
+        Tuple of (scheme, path or host, port)
+    """
+    if url.startswith("unix://"):
+        return "unix", url[len("unix://"):], 0
+    if url.startswith("tcp://"):
+        host, _, port = url[len("tcp://"):].rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError(f"Invalid hashing service address: {url}")
+        return "tcp", host, int(port)
+    raise ValueError(f"Hashing service address must start with unix:// or tcp://: {url}")
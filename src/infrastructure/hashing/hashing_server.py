@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import os
+from typing import Optional, Set
+
+from src.domain.exceptions import HashingCapacityException
+from src.infrastructure.hashing.hashing_backend import LocalHashingBackend
+from src.infrastructure.hashing.hashing_protocol import (
+    OP_HASH,
+    OP_NEEDS_REHASH,
+    OP_PING,
+    OP_VERIFY,
+    STATUS_BUSY,
+    STATUS_ERROR,
+    STATUS_OK,
+    ProtocolError,
+    encode_frame,
+    parse_address,
+    read_frame
+)
+
+logger = logging.getLogger(__name__)
+
+
+class HashingServer:
+    """
+    Serves hash/verify jobs over a Unix domain socket or TCP.
+
+    Requests on one connection are handled concurrently and answered as they
+    finish, tagged with their request id, so clients can pipeline. Capacity
+    is bounded by the backend's worker pool; a saturated pool answers
+    STATUS_BUSY immediately.
+
+    Passwords travel in clear over the socket: use a Unix socket or a private
+    network only.
+    """
+
+    def __init__(self, url: str, backend: LocalHashingBackend):
+        self.url = url
+        self.backend = backend
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Start listening."""
+        await self.backend.start()
+        scheme, host, port = parse_address(self.url)
+        if scheme == "unix":
+            if os.path.exists(host):
+                os.unlink(host)
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=host)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host=host, port=port)
+        logger.info(f"Hashing server listening on {self.url}")
+
+    async def serve_forever(self) -> None:
+        """Start listening and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        """Stop listening and release the worker pool."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in list(self._tasks):
+            task.cancel()
+        await self.backend.close()
+        logger.info("Hashing server stopped")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        write_lock = asyncio.Lock()
+        try:
+            while True:
+                try:
+                    opcode, request_id, fields = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                task = asyncio.create_task(
+                    self._handle_request(opcode, request_id, fields, writer, write_lock)
+                )
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except ProtocolError as e:
+            logger.warning(f"Closing hashing connection after protocol error: {str(e)}")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, opcode, request_id, fields, writer, write_lock) -> None:
+        try:
+            if opcode == OP_PING:
+                response = encode_frame(STATUS_OK, request_id, "pong")
+            elif opcode == OP_HASH:
+                password_hash = await self.backend.hash_password(fields[0])
+                response = encode_frame(STATUS_OK, request_id, password_hash)
+            elif opcode == OP_VERIFY:
+                matched = await self.backend.verify_password(fields[0], fields[1])
+                response = encode_frame(STATUS_OK, request_id, "1" if matched else "0")
+            elif opcode == OP_NEEDS_REHASH:
+                stale = await self.backend.needs_rehash(fields[0])
+                response = encode_frame(STATUS_OK, request_id, "1" if stale else "0")
+            else:
+                response = encode_frame(STATUS_ERROR, request_id, f"Unknown opcode {opcode}")
+        except HashingCapacityException:
+            response = encode_frame(STATUS_BUSY, request_id)
+        except IndexError:
+            response = encode_frame(STATUS_ERROR, request_id, "Missing request field")
+        except Exception as e:
+            logger.error(f"Hashing request failed: {str(e)}")
+            response = encode_frame(STATUS_ERROR, request_id, "Hashing failed")
+
+        try:
+            async with write_lock:
+                writer.write(response)
+                await writer.drain()
+        except ConnectionError:
+            pass
@@ -0,0 +1,298 @@
+import base64
+import hashlib
+import hmac
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+import bcrypt
+
+try:
+    import argon2
+    from argon2.exceptions import InvalidHashError, VerificationError, VerifyMismatchError
+except ImportError:  # pragma: no cover - optional dependency
+    argon2 = None
+
+logger = logging.getLogger(__name__)
+
+BCRYPT = "bcrypt"
+ARGON2ID = "argon2id"
+SCRYPT = "scrypt"
+
+
+def get_bcrypt_cost(password_hash: str) -> Optional[int]:
+    """
+    Extract the cost factor from a bcrypt hash.
+
+    Args:
+        password_hash: Hash string such as ``$2b$12$...``
+
+    Returns:
+        Cost factor, or None if the string is not a bcrypt hash
+    """
+    parts = password_hash.split('$')
+    if len(parts) < 4 or parts[1] not in ('2a', '2b', '2y') or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher(ABC):
+    """
+    Password hashing algorithm with its tuning parameters.
+
+    Implementations are plain picklable objects so their bound methods can be
+    shipped to a process pool worker.
+    """
+
+    algorithm: str = ""
+    prefixes: Tuple[str, ...] = ()
+
+    def identify(self, password_hash: str) -> bool:
+        """Check whether a stored hash was produced by this algorithm."""
+        return password_hash.startswith(self.prefixes)
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        """Hash a password with a fresh salt."""
+
+    @abstractmethod
+    def verify(self, password: str, password_hash: str) -> bool:
+        """Check a password against a stored hash of this algorithm."""
+
+    @abstractmethod
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Check whether a stored hash was made with out-of-date parameters."""
+
+    @abstractmethod
+    def parameters(self) -> Dict[str, Any]:
+        """Get the tuning parameters of this hasher."""
+
+
+class BcryptHasher(PasswordHasher):
+    """
+    bcrypt hasher.
+
+    A stored hash is rehashed when its cost is below ``rounds`` (too weak for
+    this host) or above ``max_rounds`` (too slow for any host). Hashes made
+    on larger nodes with a higher in-band cost are left alone, so nodes of
+    different sizes never flip a user's hash back and forth.
+    """
+
+    algorithm = BCRYPT
+    prefixes = ("$2a$", "$2b$", "$2y$")
+
+    def __init__(self, rounds: int = 12, max_rounds: int = 14):
+        if not 4 <= rounds <= 31:
+            raise ValueError("bcrypt rounds must be between 4 and 31")
+        self.rounds = rounds
+        self.max_rounds = max(rounds, max_rounds)
+
+    def hash(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=self.rounds)).decode('utf-8')
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        cost = get_bcrypt_cost(password_hash)
+        if cost is None:
+            return False
+        return cost < self.rounds or cost > self.max_rounds
+
+    def parameters(self) -> Dict[str, Any]:
+        return {"rounds": self.rounds}
+
+
+class Argon2idHasher(PasswordHasher):
+    """argon2id hasher (requires the ``argon2-cffi`` package)."""
+
+    algorithm = ARGON2ID
+    prefixes = ("$argon2id$",)
+
+    def __init__(self, time_cost: int = 3, memory_cost_kib: int = 65536, parallelism: int = 1):
+        if argon2 is None:
+            raise RuntimeError("argon2id hashing requires the argon2-cffi package")
+        self.time_cost = time_cost
+        self.memory_cost_kib = memory_cost_kib
+        self.parallelism = parallelism
+        self._hasher = argon2.PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost_kib,
+            parallelism=parallelism,
+            type=argon2.Type.ID
+        )
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        try:
+            return self._hasher.verify(password_hash, password)
+        except (VerifyMismatchError, VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return self._hasher.check_needs_rehash(password_hash)
+
+    def parameters(self) -> Dict[str, Any]:
+        return {
+            "time_cost": self.time_cost,
+            "memory_cost_kib": self.memory_cost_kib,
+            "parallelism": self.parallelism,
+        }
+
+
+class ScryptHasher(PasswordHasher):
+    """
+    scrypt hasher built on ``hashlib.scrypt``.
+
+    Hashes are stored as ``$scrypt$ln=<log2 N>,r=<r>,p=<p>$<salt>$<key>`` with
+    unpadded base64 salt and key.
+    """
+
+    algorithm = SCRYPT
+    prefixes = ("$scrypt$",)
+
+    def __init__(self, n_log2: int = 15, r: int = 8, p: int = 1, salt_size: int = 16, key_size: int = 32):
+        if not 1 <= n_log2 <= 30:
+            raise ValueError("scrypt log2(N) must be between 1 and 30")
+        self.n_log2 = n_log2
+        self.r = r
+        self.p = p
+        self.salt_size = salt_size
+        self.key_size = key_size
+
+    @staticmethod
+    def _b64encode(data: bytes) -> str:
+        return base64.b64encode(data).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def _b64decode(data: str) -> bytes:
+        return base64.b64decode(data + '=' * (-len(data) % 4))
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, n_log2: int, r: int, p: int, key_size: int) -> bytes:
+        n = 1 << n_log2
+        return hashlib.scrypt(
+            password.encode('utf-8'),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r * p + 1024 * 1024,
+            dklen=key_size
+        )
+
+    def _parse(self, password_hash: str) -> Tuple[int, int, int, bytes, bytes]:
+        _, _, params, salt, key = password_hash.split('$')
+        values = dict(item.split('=') for item in params.split(','))
+        return int(values['ln']), int(values['r']), int(values['p']), self._b64decode(salt), self._b64decode(key)
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(self.salt_size)
+        key = self._derive(password, salt, self.n_log2, self.r, self.p, self.key_size)
+        return f"$scrypt$ln={self.n_log2},r={self.r},p={self.p}${self._b64encode(salt)}${self._b64encode(key)}"
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        try:
+            n_log2, r, p, salt, key = self._parse(password_hash)
+        except (ValueError, KeyError):
+            return False
+        candidate = self._derive(password, salt, n_log2, r, p, len(key))
+        return hmac.compare_digest(candidate, key)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        try:
+            n_log2, r, p, salt, key = self._parse(password_hash)
+        except (ValueError, KeyError):
+            return True
+        return (n_log2, r, p, len(key)) != (self.n_log2, self.r, self.p, self.key_size)
+
+    def parameters(self) -> Dict[str, Any]:
+        return {"n_log2": self.n_log2, "r": self.r, "p": self.p}
+
+
+class PasswordHasherRegistry:
+    """
+    Set of supported hashers with one default for new hashes.
+
+    Stored hashes are matched to a hasher by prefix, so a column holding a mix
+    of algorithms keeps verifying. ``needs_rehash`` is true for any hash not
+    made by the default hasher with its current parameters, which lets a
+    successful login migrate the user transparently.
+    """
+
+    def __init__(self, default: PasswordHasher, others: Optional[List[PasswordHasher]] = None):
+        self.default = default
+        self._hashers: Dict[str, PasswordHasher] = {default.algorithm: default}
+        for hasher in others or []:
+            self._hashers.setdefault(hasher.algorithm, hasher)
+
+    @classmethod
+    def from_settings(cls, settings, bcrypt_rounds: Optional[int] = None) -> 'PasswordHasherRegistry':
+        """
+        Build the registry from application settings.
+
+        Args:
+            settings: Application settings
+            bcrypt_rounds: Calibrated bcrypt cost overriding ``password_hash_rounds``
+
+        Returns:
+            Registry with every available hasher and the configured default
+        """
+        hashers: Dict[str, PasswordHasher] = {
+            BCRYPT: BcryptHasher(
+                rounds=bcrypt_rounds or settings.password_hash_rounds,
+                max_rounds=settings.password_hash_max_rounds
+            ),
+            SCRYPT: ScryptHasher(
+                n_log2=settings.scrypt_n_log2,
+                r=settings.scrypt_r,
+                p=settings.scrypt_p
+            ),
+        }
+        if argon2 is not None:
+            hashers[ARGON2ID] = Argon2idHasher(
+                time_cost=settings.argon2_time_cost,
+                memory_cost_kib=settings.argon2_memory_cost_kib,
+                parallelism=settings.argon2_parallelism
+            )
+        elif settings.password_hasher == ARGON2ID:
+            raise RuntimeError("argon2id hashing requires the argon2-cffi package")
+
+        default = hashers[settings.password_hasher]
+        return cls(default, [hasher for name, hasher in hashers.items() if name != default.algorithm])
+
+    @property
+    def algorithms(self) -> List[str]:
+        """Names of all registered algorithms."""
+        return list(self._hashers)
+
+    def identify(self, password_hash: str) -> Optional[PasswordHasher]:
+        """Find the hasher that produced a stored hash."""
+        for hasher in self._hashers.values():
+            if hasher.identify(password_hash):
+                return hasher
+        return None
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the default hasher."""
+        return self.default.hash(password)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        """Check a password against a stored hash of any registered algorithm."""
+        hasher = self.identify(password_hash)
+        if hasher is None:
+            logger.warning("Stored password hash has an unknown format")
+            return False
+        return hasher.verify(password, password_hash)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Check whether a stored hash should be migrated to the default hasher."""
+        hasher = self.identify(password_hash)
+        if hasher is None:
+            return False
+        if hasher is not self.default:
+            return True
+        return hasher.needs_rehash(password_hash)
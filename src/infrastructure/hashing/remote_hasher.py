@@ -0,0 +1,195 @@
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.domain.exceptions import HashingCapacityException
+from src.infrastructure.hashing.hashing_backend import PasswordHashingBackend
+from src.infrastructure.hashing.hashing_protocol import (
+    OP_HASH,
+    OP_NEEDS_REHASH,
+    OP_PING,
+    OP_VERIFY,
+    STATUS_BUSY,
+    STATUS_OK,
+    ProtocolError,
+    encode_frame,
+    parse_address,
+    read_frame
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _ServiceConnection:
+    """One multiplexed connection to the hashing service."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task = asyncio.create_task(self._read_responses())
+
+    @property
+    def closed(self) -> bool:
+        return self._reader_task.done()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def request(self, request_id: int, opcode: int, fields: Tuple[str, ...]) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.write(encode_frame(opcode, request_id, *fields))
+            await self._writer.drain()
+        except Exception:
+            self._pending.pop(request_id, None)
+            raise
+        return future
+
+    def forget(self, request_id: int) -> None:
+        self._pending.pop(request_id, None)
+
+    async def _read_responses(self) -> None:
+        error: Exception = ConnectionError("Hashing service closed the connection")
+        try:
+            while True:
+                status, request_id, fields = await read_frame(self._reader)
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result((status, fields))
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError) as e:
+            error = ConnectionError(f"Hashing service connection lost: {str(e)}")
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+            self._writer.close()
+
+    async def close(self) -> None:
+        self._reader_task.cancel()
+        self._writer.close()
+
+
+class RemoteHashingBackend(PasswordHashingBackend):
+    """
+    Sends hashing jobs to a standalone hashing service.
+
+    Keeps a small pool of connections and pipelines requests over them,
+    picking the connection with the fewest requests in flight. Dead
+    connections are reopened on demand. A busy or unreachable service is
+    reported as ``HashingCapacityException`` (503), like a saturated local
+    pool.
+    """
+
+    def __init__(self, url: str, pool_size: int = 4, timeout: float = 5.0):
+        if pool_size < 1:
+            raise ValueError("Hashing service pool needs at least one connection")
+        self.url = url
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._connections: List[Optional[_ServiceConnection]] = [None] * pool_size
+        self._connect_locks = [asyncio.Lock() for _ in range(pool_size)]
+        self._request_ids = itertools.count(1)
+
+        # Metrics
+        self._requests = 0
+        self._busy = 0
+        self._errors = 0
+        self._total_latency = 0.0
+
+    @classmethod
+    def from_settings(cls, settings) -> 'RemoteHashingBackend':
+        """Build a remote backend from application settings."""
+        return cls(
+            url=settings.hashing_service_url,
+            pool_size=settings.hashing_service_pool_size,
+            timeout=settings.hashing_service_timeout
+        )
+
+    async def start(self) -> None:
+        """Open the connection pool and check the service answers."""
+        await self._call(OP_PING)
+        logger.info(f"Connected to hashing service at {self.url}")
+
+    async def close(self) -> None:
+        for index, connection in enumerate(self._connections):
+            if connection is not None:
+                await connection.close()
+            self._connections[index] = None
+
+    async def _open_connection(self) -> _ServiceConnection:
+        scheme, host, port = parse_address(self.url)
+        if scheme == "unix":
+            reader, writer = await asyncio.open_unix_connection(host)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return _ServiceConnection(reader, writer)
+
+    async def _get_connection(self) -> _ServiceConnection:
+        live = [conn for conn in self._connections if conn is not None and not conn.closed]
+        if len(live) == self.pool_size:
+            return min(live, key=lambda conn: conn.in_flight)
+
+        index = next(i for i, conn in enumerate(self._connections) if conn is None or conn.closed)
+        async with self._connect_locks[index]:
+            connection = self._connections[index]
+            if connection is None or connection.closed:
+                connection = await asyncio.wait_for(self._open_connection(), timeout=self.timeout)
+                self._connections[index] = connection
+            return connection
+
+    async def _call(self, opcode: int, *fields: str) -> str:
+        request_id = next(self._request_ids) & 0xFFFFFFFF
+        started_at = time.perf_counter()
+        self._requests += 1
+        connection = None
+        try:
+            connection = await self._get_connection()
+            future = await connection.request(request_id, opcode, fields)
+            status, result = await asyncio.wait_for(future, timeout=self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            if connection is not None:
+                connection.forget(request_id)
+            self._errors += 1
+            logger.error(f"Hashing service request failed: {str(e) or type(e).__name__}")
+            raise HashingCapacityException()
+        finally:
+            self._total_latency += time.perf_counter() - started_at
+
+        if status == STATUS_BUSY:
+            self._busy += 1
+            raise HashingCapacityException()
+        if status != STATUS_OK:
+            self._errors += 1
+            raise RuntimeError(f"Hashing service error: {result[0] if result else 'unknown'}")
+        return result[0]
+
+    async def hash_password(self, password: str) -> str:
+        return await self._call(OP_HASH, password)
+
+    async def verify_password(self, password: str, password_hash: str) -> bool:
+        return await self._call(OP_VERIFY, password, password_hash) == "1"
+
+    async def needs_rehash(self, password_hash: str) -> bool:
+        return await self._call(OP_NEEDS_REHASH, password_hash) == "1"
+
+    def average_hash_ms(self) -> Optional[float]:
+        return self._total_latency / self._requests * 1000 if self._requests else None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        live = [conn for conn in self._connections if conn is not None and not conn.closed]
+        return {
+            "backend": "remote",
+            "url": self.url,
+            "connections": len(live),
+            "in_flight": sum(conn.in_flight for conn in live),
+            "requests": self._requests,
+            "busy": self._busy,
+            "errors": self._errors,
+            "avg_latency_ms": round(self._total_latency / self._requests * 1000, 3) if self._requests else 0.0,
+        }
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+from typing import Any, List, Optional, Sequence
+from urllib.parse import unquote, urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class RespError(Exception):
+    """Error reply from the server."""
+
+
+def encode_command(*args: Any) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        else:
+            data = str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """
+    Read one RESP2 reply.
+
+    Returns:
+        str for simple strings, int, bytes or None for bulk strings, list
+        for arrays. Error replies are returned as ``RespError`` instances so
+        a pipeline can read every reply before raising.
+    """
+    line = await reader.readuntil(b"\r\n")
+    prefix, payload = line[:1], line[1:-2]
+    if prefix == b"+":
+        return payload.decode("utf-8")
+    if prefix == b"-":
+        return RespError(payload.decode("utf-8"))
+    if prefix == b":":
+        return int(payload)
+    if prefix == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if prefix == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f"Unexpected RESP reply: {line[:32]!r}")
+
+
+class RespClient:
+    """
+    Minimal async client for Redis-protocol servers.
+
+    One connection, with commands serialized by a lock and pipelined when
+    sent together through ``pipeline``. The connection is reopened on the
+    next command after a failure. Supports ``redis://[:password@]host:port/db``.
+    """
+
+    def __init__(self, url: str, timeout: float = 2.0):
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported Redis URL: {url}")
+        self.url = url
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), timeout=self.timeout
+        )
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            await self._send(setup)
+
+    async def _send(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        self._writer.write(b"".join(encode_command(*command) for command in commands))
+        await self._writer.drain()
+        replies = [await read_reply(self._reader) for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    async def pipeline(self, *commands: Sequence[Any]) -> List[Any]:
+        """
+        Send several commands in one write and read all replies.
+
+        Raises:
+            RespError: If any command got an error reply
+            ConnectionError: If the server cannot be reached
+        """
+        async with self._lock:
+            try:
+                if self._writer is None or self._writer.is_closing():
+                    await self._connect()
+                return await asyncio.wait_for(self._send(commands), timeout=self.timeout)
+            except RespError:
+                raise
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+                await self._drop_connection()
+                raise ConnectionError(f"Redis command failed: {str(e) or type(e).__name__}")
+
+    async def execute(self, *args: Any) -> Any:
+        """Send one command and return its reply."""
+        return (await self.pipeline(args))[0]
+
+    async def _drop_connection(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def close(self) -> None:
+        """Close the connection."""
+        async with self._lock:
+            await self._drop_connection()
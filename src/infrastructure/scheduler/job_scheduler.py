@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import socket
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.infrastructure.database.postgresql_client import PostgreSQLClient
+
+logger = logging.getLogger(__name__)
+
+_LAST_FINISHED_SQL = """
+    SELECT last_finished_at FROM scheduled_jobs WHERE name = $1
+"""
+
+_RECORD_RUN_SQL = """
+    INSERT INTO scheduled_jobs (name, last_started_at, last_finished_at, last_duration_ms, last_outcome, last_error, last_runner)
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+    ON CONFLICT (name) DO UPDATE
+    SET last_started_at = EXCLUDED.last_started_at,
+        last_finished_at = EXCLUDED.last_finished_at,
+        last_duration_ms = EXCLUDED.last_duration_ms,
+        last_outcome = EXCLUDED.last_outcome,
+        last_error = EXCLUDED.last_error,
+        last_runner = EXCLUDED.last_runner
+"""
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for a job name."""
+    return int.from_bytes(hashlib.sha256(f"job:{name}".encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+@dataclass
+class ScheduledJob:
+    """A periodic job and the outcome of its runs in this process."""
+
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    interval_seconds: float
+    jitter_seconds: float = 0.0
+    # False for jobs on per-process state, which every worker must run
+    exclusive: bool = True
+
+    runs: int = 0
+    failures: int = 0
+    skips: int = 0
+    last_outcome: Optional[str] = None
+    last_started_at: Optional[datetime] = None
+    last_duration_seconds: Optional[float] = None
+    last_result: Any = None
+    last_error: Optional[str] = None
+    lock_key: int = field(init=False)
+
+    def __post_init__(self):
+        self.lock_key = advisory_lock_key(self.name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert job state to dictionary."""
+        return {
+            "interval_seconds": self.interval_seconds,
+            "exclusive": self.exclusive,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skips": self.skips,
+            "last_outcome": self.last_outcome,
+            "last_started_at": self.last_started_at.isoformat() if self.last_started_at else None,
+            "last_duration_seconds": self.last_duration_seconds,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+        }
+
+
+class JobScheduler:
+    """
+    Runs periodic maintenance jobs from inside the API processes.
+
+    Every worker ticks every job on its interval plus random jitter, but an
+    exclusive job only runs in the worker that takes its Postgres advisory
+    lock, and only if no worker finished it within the last
+    ``interval - jitter`` seconds (from the ``scheduled_jobs`` table). So
+    the fleet runs each job about once per interval however many workers
+    there are, and never twice at the same time. Per-process jobs skip both
+    checks.
+    """
+
+    def __init__(self, db_client: PostgreSQLClient):
+        self.db_client = db_client
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self.runner = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: List[asyncio.Task] = []
+
+    def register(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        interval_seconds: float,
+        jitter_seconds: float = 0.0,
+        exclusive: bool = True
+    ) -> ScheduledJob:
+        """Register a job; call before ``start``."""
+        if name in self.jobs:
+            raise ValueError(f"Job already registered: {name}")
+        if interval_seconds <= 0:
+            raise ValueError(f"Job interval must be positive: {name}")
+        job = ScheduledJob(name, func, interval_seconds, jitter_seconds, exclusive)
+        self.jobs[name] = job
+        return job
+
+    def start(self) -> None:
+        """Start one ticking task per job."""
+        self._tasks = [asyncio.create_task(self._tick(job), name=f"job:{job.name}") for job in self.jobs.values()]
+        logger.info(f"Job scheduler started with jobs: {', '.join(self.jobs) or 'none'}")
+
+    async def stop(self) -> None:
+        """Cancel the job tasks and wait for them to unwind."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _tick(self, job: ScheduledJob) -> None:
+        # Spread the first runs of freshly started workers
+        await asyncio.sleep(random.uniform(0, job.jitter_seconds))
+        while True:
+            try:
+                await self.run_once(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Lock or bookkeeping failure; the job itself is caught in _run
+                logger.error(f"Scheduler could not run job {job.name}: {str(e)}")
+            await asyncio.sleep(job.interval_seconds + random.uniform(0, job.jitter_seconds))
+
+    async def run_once(self, job: ScheduledJob) -> Optional[str]:
+        """
+        Run a job now if this process should.
+
+        Returns:
+            The outcome: "ok", "error", "locked" or "not_due"
+        """
+        if not job.exclusive:
+            return await self._run(job)
+
+        async with self.db_client.advisory_lock(job.lock_key) as connection:
+            if connection is None:
+                return self._skip(job, "locked")
+            last_finished_at = await connection.fetchval(_LAST_FINISHED_SQL, job.name)
+            min_gap = max(0.0, job.interval_seconds - job.jitter_seconds)
+            if last_finished_at is not None and (
+                datetime.now(timezone.utc) - last_finished_at
+            ).total_seconds() < min_gap:
+                return self._skip(job, "not_due")
+
+            outcome = await self._run(job)
+            await connection.execute(
+                _RECORD_RUN_SQL,
+                job.name,
+                job.last_started_at,
+                datetime.now(timezone.utc),
+                int(job.last_duration_seconds * 1000),
+                outcome,
+                job.last_error,
+                self.runner
+            )
+            return outcome
+
+    async def _run(self, job: ScheduledJob) -> str:
+        job.last_started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            job.last_result = await job.func()
+            job.last_error = None
+            outcome = "ok"
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            outcome = "error"
+            logger.error(f"Job {job.name} failed: {str(e)}")
+        job.runs += 1
+        job.last_duration_seconds = round(time.perf_counter() - started, 3)
+        job.last_outcome = outcome
+        logger.info(f"Job {job.name} finished in {job.last_duration_seconds}s: {outcome}")
+        return outcome
+
+    @staticmethod
+    def _skip(job: ScheduledJob, reason: str) -> str:
+        job.skips += 1
+        return reason
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get per-job run metrics for this process."""
+        return {name: job.to_dict() for name, job in self.jobs.items()}
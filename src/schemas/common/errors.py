@@ -44,6 +44,13 @@ class DmErrorCode(str, Enum):
     DM_REG_0008 = "DM_REG_0008"  # Database error
     DM_REG_0009 = "DM_REG_0009"  # Email service error
     DM_REG_0010 = "DM_REG_0010"  # Invalid credentials
+    DM_REG_0011 = "DM_REG_0011"  # Password hashing capacity exceeded
+    DM_REG_0012 = "DM_REG_0012"  # Admin access denied
+    DM_REG_0013 = "DM_REG_0013"  # Invalid listing or search parameters
+    DM_REG_0014 = "DM_REG_0014"  # Invalid bulk import file
+    DM_REG_0015 = "DM_REG_0015"  # Invalid bulk status change
+    DM_REG_0016 = "DM_REG_0016"  # Internal access denied
+    DM_REG_0017 = "DM_REG_0017"  # Invalid status lookup
     DM_REG_0050 = "DM_REG_0050"  # Unexpected error
 
 
@@ -88,6 +95,34 @@ class ErrorMessage(tuple, Enum):
         "Invalid authentication credentials",
         "Please check your email and password and try again"
     )
+    MESSAGE_REG_0011 = (
+        "Service is busy processing other requests",
+        "Please retry in a few seconds"
+    )
+    MESSAGE_REG_0012 = (
+        "Admin access denied",
+        "Please provide a valid admin token"
+    )
+    MESSAGE_REG_0013 = (
+        "Invalid listing or search parameters",
+        "Search needs at least 3 characters; pass back cursors unchanged"
+    )
+    MESSAGE_REG_0014 = (
+        "Invalid import file",
+        "Send a UTF-8 CSV whose header has email and password columns"
+    )
+    MESSAGE_REG_0015 = (
+        "Invalid bulk status change",
+        "Send user_ids or emails, within the size limit, and an allowed transition"
+    )
+    MESSAGE_REG_0016 = (
+        "Internal access denied",
+        "Please provide a valid internal service token"
+    )
+    MESSAGE_REG_0017 = (
+        "Invalid status lookup",
+        "Send either user_ids or emails, within the size limit"
+    )
     MESSAGE_REG_0050 = (
         "An unexpected error occurred",
         "Please try again later or contact support"
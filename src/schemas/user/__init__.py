@@ -1,5 +1,6 @@
+import uuid
 from pydantic import BaseModel, EmailStr, ConfigDict
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 from src.domain.user.entities import UserStatus
@@ -92,6 +93,73 @@ class ResendActivationRequest(BaseModel):
     )
 
 
+class UserStatsResponse(BaseModel):
+    """Response schema for user statistics."""
+    total_users: int
+    active_users: int
+    pending_users: int
+    by_status: Dict[str, int]
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "total_users": 1250,
+                "active_users": 1000,
+                "pending_users": 240,
+                "by_status": {"PENDING": 240, "ACTIVE": 1000, "INACTIVE": 8, "SUSPENDED": 2}
+            }
+        }
+    )
+
+
+class BulkStatusChangeRequest(BaseModel):
+    """Request schema for moving many users to one status."""
+    status: UserStatus
+    user_ids: Optional[List[uuid.UUID]] = None
+    emails: Optional[List[EmailStr]] = None
+    from_statuses: Optional[List[UserStatus]] = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "status": "SUSPENDED",
+                "user_ids": [
+                    "123e4567-e89b-12d3-a456-426614174000",
+                    "9b2f1c3e-5d4a-4e8b-a1c2-0f3e4d5c6b7a"
+                ],
+                "from_statuses": ["ACTIVE"]
+            }
+        }
+    )
+
+
+class UserStatusLookupRequest(BaseModel):
+    """Request schema for looking up the status of many users."""
+    user_ids: Optional[List[uuid.UUID]] = None
+    emails: Optional[List[str]] = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "emails": ["user@example.com", "someone.else@example.com"]
+            }
+        }
+    )
+
+
+class UserStatusLookupResponse(BaseModel):
+    """Response schema for a status lookup; null for users not registered."""
+    statuses: Dict[str, Optional[UserStatus]]
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "statuses": {"user@example.com": "ACTIVE", "someone.else@example.com": None}
+            }
+        }
+    )
+
+
 class ApiResponse(BaseModel):
     """Generic API response wrapper."""
     status: str = "success"
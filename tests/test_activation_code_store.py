@@ -0,0 +1,288 @@
+import asyncio
+import time
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+
+from src.domain.exceptions import DatabaseException, InvalidActivationCodeException
+from src.domain.user.entities import ActivationCode, CodeConsumeResult, User, UserStatus, utc_now
+from src.domain.user.service import UserService
+from src.infrastructure.activation_codes.activation_code_store import ActivationCodeStore, StoredActivationCodeStore
+from src.infrastructure.activation_codes.hmac_store import HmacActivationCodeStore
+from src.infrastructure.activation_codes.memory_store import InMemoryActivationCodeStore
+from src.infrastructure.activation_codes.redis_store import RedisActivationCodeStore
+from src.infrastructure.redis.resp_client import RespClient, encode_command, read_reply
+
+
+class RedisStandIn:
+    """Just enough of a Redis server for the code store: strings with expiry."""
+
+    def __init__(self):
+        self.data = {}
+        self.server = None
+
+    def _live(self, key):
+        entry = self.data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            entry = None
+        return entry
+
+    def _reply(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, str):
+            return b"+%s\r\n" % value.encode()
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def _handle(self, command, args):
+        if command == "PING":
+            return "PONG"
+        if command == "SET":
+            key, value, options = args[0], args[1], [a.decode().upper() for a in args[2:]]
+            expires_at = None
+            if "PX" in options:
+                expires_at = time.monotonic() + int(options[options.index("PX") + 1]) / 1000
+            previous = self._live(key)
+            self.data[key] = (value, expires_at)
+            return previous[0] if "GET" in options and previous else (None if "GET" in options else "OK")
+        if command == "GETDEL":
+            entry = self._live(args[0])
+            self.data.pop(args[0], None)
+            return entry[0] if entry else None
+        if command == "DEL":
+            return sum(1 for key in args if self._live(key) and self.data.pop(key))
+        return None
+
+    async def _serve(self, reader, writer):
+        try:
+            while True:
+                request = await read_reply(reader)
+                command = request[0].decode().upper()
+                writer.write(self._reply(self._handle(command, request[1:])))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+@pytest_asyncio.fixture
+async def redis_store():
+    stand_in = RedisStandIn()
+    port = await stand_in.start()
+    store = RedisActivationCodeStore(RespClient(f"redis://127.0.0.1:{port}/0"), expired_grace_seconds=60)
+    yield store
+    await store.close()
+    await stand_in.stop()
+
+
+def make_user(user_id="test-user-id", activation_nonce=0):
+    return User(
+        user_id=user_id, email="test@example.com", password_hash="hashed_password",
+        activation_nonce=activation_nonce
+    )
+
+
+def make_code(code="1234", user_id="test-user-id", seconds=60):
+    return ActivationCode(user_id=user_id, code=code, expires_at=utc_now() + timedelta(seconds=seconds))
+
+
+class TestInMemoryActivationCodeStore:
+    """Test the in-process code store."""
+
+    @pytest.mark.asyncio
+    async def test_consume_once(self):
+        """Test that a code activates exactly once."""
+        store = InMemoryActivationCodeStore()
+        await store.put(make_code())
+
+        assert await store.consume(make_user("test-user-id"), "9999") == CodeConsumeResult.NOT_FOUND
+        assert await store.consume(make_user("test-user-id"), "1234") == CodeConsumeResult.CONSUMED
+        assert await store.consume(make_user("test-user-id"), "1234") == CodeConsumeResult.NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_put_replaces_previous_code(self):
+        """Test that resending invalidates the earlier code."""
+        store = InMemoryActivationCodeStore()
+        await store.put(make_code("1111"))
+        await store.put(make_code("2222"))
+
+        assert await store.consume(make_user("test-user-id"), "1111") == CodeConsumeResult.NOT_FOUND
+        assert await store.consume(make_user("test-user-id"), "2222") == CodeConsumeResult.CONSUMED
+
+    @pytest.mark.asyncio
+    async def test_expiry_and_purge(self):
+        """Test that expired codes are reported and purged."""
+        now = [time.time()]
+        store = InMemoryActivationCodeStore(clock=lambda: now[0])
+        await store.put(make_code(user_id="a"))
+        await store.put(make_code(user_id="b"))
+        now[0] += 61
+
+        assert await store.consume(make_user("a"), "1234") == CodeConsumeResult.EXPIRED
+        assert await store.cleanup_expired() == 1
+        assert len(store) == 0
+
+    @pytest.mark.asyncio
+    async def test_bounded_size(self):
+        """Test that a full store evicts the code closest to expiry."""
+        store = InMemoryActivationCodeStore(max_entries=2)
+        await store.put(make_code(user_id="a", seconds=10))
+        await store.put(make_code(user_id="b", seconds=60))
+        await store.put(make_code(user_id="c", seconds=60))
+
+        assert len(store) == 2
+        assert await store.consume(make_user("a"), "1234") == CodeConsumeResult.NOT_FOUND
+        assert store.get_metrics()["evictions"] == 1
+
+
+class TestRedisActivationCodeStore:
+    """Test the Redis-protocol code store against a local stand-in."""
+
+    def test_encode_command(self):
+        """Test RESP command encoding."""
+        assert encode_command("GETDEL", "key") == b"*2\r\n$6\r\nGETDEL\r\n$3\r\nkey\r\n"
+
+    @pytest.mark.asyncio
+    async def test_consume_once_and_wrong_guess(self, redis_store):
+        """Test that a wrong guess does not burn the live code."""
+        await redis_store.put(make_code())
+
+        assert await redis_store.consume(make_user("test-user-id"), "9999") == CodeConsumeResult.NOT_FOUND
+        assert await redis_store.consume(make_user("test-user-id"), "1234") == CodeConsumeResult.CONSUMED
+        assert await redis_store.consume(make_user("test-user-id"), "1234") == CodeConsumeResult.NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_put_and_invalidate(self, redis_store):
+        """Test that a new code or an invalidation drops the old code."""
+        await redis_store.put(make_code("1111"))
+        await redis_store.put(make_code("2222"))
+        assert await redis_store.consume(make_user("test-user-id"), "1111") == CodeConsumeResult.NOT_FOUND
+
+        await redis_store.invalidate_user("test-user-id")
+        assert await redis_store.consume(make_user("test-user-id"), "2222") == CodeConsumeResult.NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_expired_code(self, redis_store):
+        """Test that a code past expiry but within the grace period is reported expired."""
+        await redis_store.put(make_code(seconds=-1))
+
+        assert await redis_store.consume(make_user("test-user-id"), "1234") == CodeConsumeResult.EXPIRED
+
+    @pytest.mark.asyncio
+    async def test_unreachable_server(self):
+        """Test that a missing server surfaces as a database error."""
+        store = RedisActivationCodeStore(RespClient("redis://127.0.0.1:1/0", timeout=0.5))
+
+        with pytest.raises(DatabaseException):
+            await store.consume(make_user("test-user-id"), "1234")
+
+
+class TestHmacActivationCodeStore:
+    """Test derived, table-free activation codes."""
+
+    @staticmethod
+    def _store(now, user_repository=None):
+        return HmacActivationCodeStore(
+            "test-secret", user_repository or AsyncMock(), step_seconds=60, valid_steps=2,
+            clock=lambda: now[0]
+        )
+
+    @pytest.mark.asyncio
+    async def test_code_valid_within_window(self):
+        """Test that a derived code verifies for its window, then reads as expired."""
+        now = [6000.0]
+        store = self._store(now)
+        user = make_user()
+
+        activation_code = await store.issue(user)
+        assert len(activation_code.code) == 4
+        assert activation_code.expires_at.timestamp() == 6120
+        assert await store.consume(user, activation_code.code) == CodeConsumeResult.CONSUMED
+
+        now[0] += 119
+        assert await store.consume(user, activation_code.code) == CodeConsumeResult.CONSUMED
+        now[0] += 1
+        assert await store.consume(user, activation_code.code) == CodeConsumeResult.EXPIRED
+        now[0] += 3600
+        assert await store.consume(user, activation_code.code) == CodeConsumeResult.NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_codes_depend_on_user_and_secret(self):
+        """Test that codes are tied to the user and the secret key."""
+        store = self._store([6000.0])
+        other_secret = HmacActivationCodeStore("other-secret", AsyncMock(), clock=lambda: 6000.0)
+
+        codes = {store.derive_code(f"user-{i}", 100, 0) for i in range(50)}
+        assert len(codes) > 40
+        assert store.derive_code("user-1", 100, 0) == store.derive_code("user-1", 100, 0)
+        assert [store.derive_code(f"user-{i}", 100, 0) for i in range(20)] != \
+            [other_secret.derive_code(f"user-{i}", 100, 0) for i in range(20)]
+
+    @pytest.mark.asyncio
+    async def test_resend_voids_earlier_codes(self):
+        """Test that a resend bumps the nonce and the old code stops working."""
+        user_repository = AsyncMock()
+        user_repository.bump_activation_nonce.return_value = 1
+        store = self._store([6000.0], user_repository)
+        user = make_user()
+        first = await store.issue(user)
+
+        second = await store.issue(user, resend=True)
+
+        user_repository.bump_activation_nonce.assert_awaited_once_with("test-user-id")
+        assert user.activation_nonce == 1
+        if first.code != second.code:
+            assert await store.consume(user, first.code) == CodeConsumeResult.NOT_FOUND
+        assert await store.consume(user, second.code) == CodeConsumeResult.CONSUMED
+
+    def test_codes_are_not_stored(self):
+        """Test that the derived-code store has no write path besides issue()."""
+        store = self._store([6000.0])
+
+        assert isinstance(store, ActivationCodeStore)
+        assert not isinstance(store, StoredActivationCodeStore)
+        assert not hasattr(store, "put")
+
+
+class TestServiceWithCodeStore:
+    """Test registration and activation with a code store outside Postgres."""
+
+    @pytest.mark.asyncio
+    async def test_register_and_activate(self):
+        """Test the two-step paths through the store."""
+        user = User(user_id="test-user-id", email="test@example.com", password_hash="hashed_password")
+        active_user = User(
+            user_id="test-user-id", email="test@example.com", password_hash="hashed_password",
+            status=UserStatus.ACTIVE
+        )
+        user_repository = AsyncMock()
+        user_repository.create_user.return_value = user
+        user_repository.get_user_by_email.return_value = user
+        user_repository.verify_password.return_value = True
+        user_repository.activate_user.return_value = active_user
+        email_service = AsyncMock()
+        store = InMemoryActivationCodeStore()
+        service = UserService(user_repository, AsyncMock(), email_service, activation_code_store=store)
+
+        await service.register_user("test@example.com", "password123")
+        code = email_service.send_activation_code.call_args.kwargs["activation_code"]
+
+        with pytest.raises(InvalidActivationCodeException):
+            await service.activate_user("test@example.com", "password123", "0000" if code != "0000" else "0001")
+        result = await service.activate_user("test@example.com", "password123", code)
+
+        assert result.is_active()
+        user_repository.create_user_with_activation_code.assert_not_called()
+        user_repository.activate_with_code.assert_not_called()
@@ -0,0 +1,110 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.api.v1 import admin
+from src.domain.exceptions import AdminAccessDeniedException, InvalidQueryException
+from src.domain.user.entities import UserStatus
+from src.domain.user.repository import UserRepository
+from src.domain.user.service import UserService
+
+
+def make_row(i):
+    return {
+        "user_id": uuid.UUID(int=i),
+        "email": f"user{i}@example.com",
+        "status": "ACTIVE",
+        "created_at": datetime(2026, 1, 1, 0, 0, i, tzinfo=timezone.utc),
+        "activated_at": None,
+    }
+
+
+async def rows_of(rows):
+    for row in rows:
+        yield row
+
+
+async def read_body(chunks):
+    return json.loads(b"".join([chunk async for chunk in chunks]))
+
+
+class TestAdminUserListing:
+    """Test the keyset-paginated admin listing and search."""
+
+    def test_cursor_round_trip(self):
+        """Test that a cursor decodes to the row it was made from."""
+        row = make_row(7)
+        cursor = admin.encode_cursor(row["created_at"], row["user_id"])
+
+        assert admin.decode_cursor(cursor) == (row["created_at"], row["user_id"])
+
+    def test_first_page_and_bad_cursor(self):
+        """Test the first-page sentinel and rejection of forged cursors."""
+        created_at, user_id = admin.decode_cursor(None)
+        assert created_at > make_row(59)["created_at"]
+        assert user_id == uuid.UUID("ffffffff-ffff-ffff-ffff-ffffffffffff")
+
+        with pytest.raises(InvalidQueryException):
+            admin.decode_cursor("not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_full_page_has_next_cursor(self):
+        """Test that a full page points at its last row."""
+        rows = [make_row(3), make_row(2)]
+
+        body = await read_body(admin.stream_page(rows_of(rows), limit=2))
+
+        assert body["status"] == "success"
+        assert [user["email"] for user in body["data"]["users"]] == ["user3@example.com", "user2@example.com"]
+        assert body["data"]["count"] == 2
+        assert admin.decode_cursor(body["data"]["next_cursor"]) == (rows[1]["created_at"], rows[1]["user_id"])
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self):
+        """Test that a short or empty page ends pagination."""
+        body = await read_body(admin.stream_page(rows_of([make_row(1)]), limit=2))
+        assert body["data"]["next_cursor"] is None
+
+        body = await read_body(admin.stream_page(rows_of([]), limit=2))
+        assert body["data"] == {"users": [], "count": 0, "next_cursor": None}
+
+    def test_admin_token(self, monkeypatch):
+        """Test that only the configured token is accepted."""
+        monkeypatch.setattr(admin, "admin_api_token", "s3cret")
+        admin.require_admin("s3cret")
+
+        for token in (None, "", "wrong"):
+            with pytest.raises(AdminAccessDeniedException):
+                admin.require_admin(token)
+
+        # No token configured: the endpoints stay closed
+        monkeypatch.setattr(admin, "admin_api_token", "")
+        with pytest.raises(AdminAccessDeniedException):
+            admin.require_admin("")
+
+    def test_short_search_rejected(self):
+        """Test that searches too short for the trigram index are refused."""
+        service = UserService(AsyncMock(), AsyncMock(), AsyncMock())
+
+        with pytest.raises(InvalidQueryException):
+            service.search_users_by_email(" ab ", None, *admin.decode_cursor(None), 10)
+
+    @pytest.mark.asyncio
+    async def test_search_escapes_like_wildcards(self):
+        """Test that the fragment is matched literally."""
+        db_client = MagicMock()
+        db_client.stream_statement.return_value = rows_of([make_row(1)])
+        repository = UserRepository(db_client)
+        before_created_at, before_user_id = admin.decode_cursor(None)
+
+        rows = [row async for row in repository.stream_email_search(
+            "a_b%", UserStatus.ACTIVE, before_created_at, before_user_id, 10
+        )]
+
+        assert len(rows) == 1
+        db_client.stream_statement.assert_called_once_with(
+            "admin.search_email", "%a\\_b\\%%", "ACTIVE", before_created_at, before_user_id, 10
+        )
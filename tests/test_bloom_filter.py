@@ -0,0 +1,170 @@
+import asyncio
+import uuid
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.domain.user.email_filter import WARM_UP_YIELD_EVERY, RegisteredEmailFilter
+from src.domain.user.entities import utc_now
+from src.domain.user.repository import UserRepository
+from src.infrastructure.cache.bloom_filter import BloomFilter, ScalableBloomFilter
+
+
+class FakeEmailSource:
+    """Streams fixed rows the way UserRepository.stream_registered_emails does."""
+
+    def __init__(self, emails):
+        start = utc_now()
+        self.rows = [
+            {'email': email, 'created_at': start + timedelta(seconds=i), 'user_id': uuid.uuid4()}
+            for i, email in enumerate(emails)
+        ]
+        self.calls = []
+
+    async def stream_registered_emails(self, after_created_at, after_user_id, batch_size):
+        self.calls.append(after_created_at)
+        rows = [row for row in self.rows if (row['created_at'], row['user_id']) > (after_created_at, after_user_id)]
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+
+
+class TestBloomFilter:
+    """Test the Bloom filters."""
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        """Test membership and the false-positive rate."""
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f"user{i}@example.com")
+
+        assert all(f"user{i}@example.com" in bloom for i in range(2000))
+        false_positives = sum(f"other{i}@example.com" in bloom for i in range(10000))
+        assert false_positives < 300
+
+    def test_scalable_filter_grows(self):
+        """Test that a full stage adds a larger one."""
+        bloom = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+        for i in range(500):
+            bloom.add(f"user{i}@example.com")
+
+        assert len(bloom.filters) > 1
+        assert all(f"user{i}@example.com" in bloom for i in range(500))
+
+    def test_snapshot_round_trip(self, tmp_path):
+        """Test that a memory-mapped snapshot keeps members and accepts additions."""
+        path = str(tmp_path / "emails.bin")
+        bloom = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+        for i in range(300):
+            bloom.add(f"user{i}@example.com")
+        bloom.metadata["watermark"] = {"created_at": "2024-01-01T00:00:00+00:00", "user_id": str(uuid.uuid4())}
+        bloom.save(path)
+
+        loaded = ScalableBloomFilter.load(path)
+        loaded.add("new@example.com")
+
+        assert len(loaded) == len(bloom) + 1
+        assert all(f"user{i}@example.com" in loaded for i in range(300))
+        assert "new@example.com" in loaded
+        assert loaded.metadata == bloom.metadata
+        assert "new@example.com" not in ScalableBloomFilter.load(path)
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that a file that is not a snapshot is refused."""
+        path = tmp_path / "garbage.bin"
+        path.write_bytes(b"not a bloom filter at all")
+
+        with pytest.raises(ValueError):
+            ScalableBloomFilter.load(str(path))
+
+
+class TestRegisteredEmailFilter:
+    """Test warm-up and the registration fast path."""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_resumes_from_watermark(self, tmp_path):
+        """Test that a restart only reads rows added after the snapshot."""
+        source = FakeEmailSource([f"user{i}@example.com" for i in range(25)])
+        email_filter = RegisteredEmailFilter(ScalableBloomFilter(initial_capacity=100), batch_size=10)
+        assert email_filter.might_exist("anyone@example.com")
+
+        assert await email_filter.warm_up(source) == 25
+        assert not email_filter.might_exist("anyone@example.com")
+        email_filter.save(str(tmp_path / "emails.bin"))
+
+        source.rows.append({'email': 'late@example.com', 'created_at': utc_now() + timedelta(days=1), 'user_id': uuid.uuid4()})
+        restarted = RegisteredEmailFilter(
+            ScalableBloomFilter.load(str(tmp_path / "emails.bin")), batch_size=10, watermark_overlap_seconds=0
+        )
+
+        # The watermark row itself, then the new one
+        assert await restarted.warm_up(source) == 2
+        assert restarted.might_exist("late@example.com")
+        assert restarted.might_exist("user3@example.com")
+
+    @pytest.mark.asyncio
+    async def test_warm_up_rereads_rows_committed_late(self, tmp_path):
+        """Test that a row with a created_at before the watermark is still picked up."""
+        source = FakeEmailSource([f"user{i}@example.com" for i in range(25)])
+        email_filter = RegisteredEmailFilter(ScalableBloomFilter(initial_capacity=100), batch_size=10)
+        await email_filter.warm_up(source)
+        watermark_time = source.rows[-1]['created_at']
+
+        # Stamped before the last row read, but committed after the warm-up
+        source.rows.append({
+            'email': 'slow@example.com', 'created_at': watermark_time - timedelta(seconds=2.5), 'user_id': uuid.uuid4()
+        })
+        email_filter.ready = False
+        email_filter.watermark_overlap_seconds = 5
+
+        assert await email_filter.warm_up(source) == 7
+        assert email_filter.might_exist("slow@example.com")
+        assert source.calls[-1] == watermark_time - timedelta(seconds=5)
+
+    def test_one_worker_owns_the_snapshot(self, tmp_path):
+        """Test that only the first filter to claim a snapshot path may write it."""
+        path = str(tmp_path / "emails.bin")
+        first = RegisteredEmailFilter(ScalableBloomFilter(initial_capacity=100))
+        second = RegisteredEmailFilter(ScalableBloomFilter(initial_capacity=100))
+
+        assert first.claim_snapshot(path)
+        assert not second.claim_snapshot(path)
+        assert first.snapshot_owner and not second.snapshot_owner
+
+    @pytest.mark.asyncio
+    async def test_warm_up_yields_to_the_loop(self):
+        """Test that other tasks run while a large batch is added."""
+        source = FakeEmailSource([f"user{i}@example.com" for i in range(3 * WARM_UP_YIELD_EVERY)])
+        email_filter = RegisteredEmailFilter(ScalableBloomFilter(initial_capacity=100), batch_size=10000)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        ticks = 0
+        await email_filter.warm_up(source)
+        task.cancel()
+
+        assert ticks >= 3
+
+    @pytest.mark.asyncio
+    async def test_new_email_skips_precheck(self):
+        """Test that registration skips the lookup for an unseen email."""
+        email_filter = RegisteredEmailFilter(ScalableBloomFilter(initial_capacity=100))
+        email_filter.ready = True
+        db_client = AsyncMock()
+        db_client.execute_statement.return_value = "new-user-id"
+        hashing_backend = AsyncMock()
+        hashing_backend.hash_password.return_value = "hashed_password"
+        hashing_backend.average_hash_ms = MagicMock(return_value=None)
+        repository = UserRepository(db_client, hashing_backend, email_precheck="always", email_filter=email_filter)
+
+        await repository.create_user("fresh@example.com", "password123")
+
+        db_client.execute_statement.assert_awaited_once()
+        assert email_filter.might_exist("fresh@example.com")
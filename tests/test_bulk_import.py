@@ -0,0 +1,267 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.domain.exceptions import HashingCapacityException, InvalidImportFileException
+from src.domain.user.bulk_import import MAX_RECORD_CHARS, UserImporter, iter_lines, iter_records
+from src.domain.user.entities import ActivationCode
+from src.domain.user.repository import UserRepository
+
+
+async def lines_of(text):
+    for line in text.split("\n"):
+        yield line
+
+
+async def chunks_of(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def make_repository(registered=(), taken_meanwhile=()):
+    """Repository double: ``registered`` exist before, ``taken_meanwhile`` race the load."""
+    user_repository = AsyncMock()
+    user_repository.find_registered_emails.side_effect = lambda emails: {e for e in emails if e in registered}
+    user_repository.import_users.side_effect = lambda users: {
+        user.email for user in users if user.email not in taken_meanwhile
+    }
+    user_repository.hashing_backend.hash_password.side_effect = lambda password: f"hashed:{password}"
+    return user_repository
+
+
+class TestUserImporter:
+    """Test the bulk registration pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_bad_rows_are_rejected_one_by_one(self):
+        """Test that every kind of bad row is reported and the rest imported."""
+        user_repository = make_repository(registered={"old@example.com"}, taken_meanwhile={"raced@example.com"})
+        importer = UserImporter(user_repository)
+        rejected = []
+        csv_file = "\n".join([
+            "name,Password,Email",
+            "Ann,password123,ann@example.com",
+            "Bad,password123,not-an-email",
+            "Weak,short,weak@example.com",
+            "Dup,password123,ann@example.com",
+            "Old,password123,old@example.com",
+            "Raced,password123,raced@example.com",
+            "Short row",
+            "",
+            "Bob,\"pass,word 42\",bob@example.com",
+        ])
+
+        report = await importer.run(lines_of(csv_file), on_reject=rejected.append)
+
+        assert report.rows == 8
+        assert report.imported == 2
+        assert report.rejected == 6
+        assert sorted((reject.line, reject.reason.value) for reject in rejected) == [
+            (3, "invalid_email"),
+            (4, "invalid_password"),
+            (5, "duplicate_in_file"),
+            (6, "already_registered"),
+            (7, "already_registered"),
+            (8, "malformed_row"),
+        ]
+        assert report.rejects_by_reason["already_registered"] == 2
+
+        loaded = user_repository.import_users.call_args.args[0]
+        assert {user.email: user.password_hash for user in loaded} == {
+            "ann@example.com": "hashed:password123",
+            "raced@example.com": "hashed:password123",
+            "bob@example.com": "hashed:pass,word 42",
+        }
+        # Registered emails are dropped before hashing
+        hashed = [call.args[0] for call in user_repository.hashing_backend.hash_password.call_args_list]
+        assert len(hashed) == 3
+
+    @pytest.mark.asyncio
+    async def test_emails_are_normalized_like_registrations(self):
+        """Test that emails are deduplicated and loaded in their normalized form."""
+        user_repository = make_repository(registered={"old@example.com"})
+        importer = UserImporter(user_repository)
+        rejected = []
+        csv_file = "\n".join([
+            "email,password",
+            "Ann@EXAMPLE.com,password123",
+            "Ann@example.com,password123",
+            "old@Example.COM,password123",
+            "ann@@example.com,password123",
+        ])
+
+        report = await importer.run(lines_of(csv_file), on_reject=rejected.append)
+
+        assert report.imported == 1
+        assert [(reject.line, reject.reason.value) for reject in rejected] == [
+            (3, "duplicate_in_file"),
+            (5, "invalid_email"),
+            (4, "already_registered"),
+        ]
+        user_repository.find_registered_emails.assert_awaited_once_with(["Ann@example.com", "old@example.com"])
+        assert [user.email for user in user_repository.import_users.call_args.args[0]] == ["Ann@example.com"]
+
+    @pytest.mark.asyncio
+    async def test_rows_are_imported_in_batches(self):
+        """Test that each batch is deduplicated and loaded on its own."""
+        user_repository = make_repository()
+        importer = UserImporter(user_repository, batch_size=2)
+        rows = [f"user{i}@example.com,password{i}" for i in range(5)]
+
+        report = await importer.run(lines_of("\n".join(["email,password"] + rows)))
+
+        assert report.batches == 3
+        assert report.imported == 5
+        assert [len(call.args[0]) for call in user_repository.import_users.call_args_list] == [2, 2, 1]
+        assert set(report.stage_seconds) == {"validate", "dedupe", "hash", "load"}
+
+    @pytest.mark.asyncio
+    async def test_saturated_hashing_pool_is_retried(self):
+        """Test that a full hashing queue delays rows and a failing hasher rejects them."""
+        user_repository = make_repository()
+        outcomes = {"password1": [HashingCapacityException(), "hash1"], "password2": [RuntimeError("boom")]}
+
+        async def hash_password(password):
+            outcome = outcomes[password].pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        user_repository.hashing_backend.hash_password.side_effect = hash_password
+        importer = UserImporter(user_repository, hash_retry_seconds=0)
+
+        report = await importer.run(lines_of("email,password\na@example.com,password1\nb@example.com,password2"))
+
+        assert report.imported == 1
+        assert report.rejects_by_reason == {"hashing_failed": 1}
+        assert user_repository.import_users.call_args.args[0][0].password_hash == "hash1"
+
+    @pytest.mark.asyncio
+    async def test_activation_emails_for_imported_users(self):
+        """Test that imported users get codes and emails, and failures are counted."""
+        user_repository = make_repository()
+        activation_code_store = AsyncMock()
+        activation_code_store.issue.side_effect = lambda user: ActivationCode.generate_for_user(user.user_id)
+        email_service = AsyncMock()
+        email_service.send_activation_code.side_effect = [None, Exception("queue down")]
+        importer = UserImporter(user_repository, activation_code_store, email_service)
+
+        report = await importer.run(
+            lines_of("email,password\na@example.com,password1\nb@example.com,password2"),
+            send_activation=True
+        )
+
+        assert report.imported == 2
+        assert report.activation_emails_sent == 1
+        assert report.activation_email_failures == 1
+
+    @pytest.mark.asyncio
+    async def test_activation_sends_are_bounded(self):
+        """Test that no more than activation_concurrency users are sent to at once."""
+        user_repository = make_repository()
+        in_flight = peak = 0
+
+        async def issue(user):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return ActivationCode.generate_for_user(user.user_id)
+
+        activation_code_store = AsyncMock()
+        activation_code_store.issue.side_effect = issue
+        importer = UserImporter(user_repository, activation_code_store, AsyncMock(), activation_concurrency=3)
+        rows = [f"user{i}@example.com,password{i}" for i in range(20)]
+
+        report = await importer.run(lines_of("\n".join(["email,password"] + rows)), send_activation=True)
+
+        assert report.activation_emails_sent == 20
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_unusable_files(self):
+        """Test that a file without the needed columns is refused."""
+        importer = UserImporter(make_repository())
+
+        with pytest.raises(InvalidImportFileException):
+            await importer.run(lines_of("email,name\na@example.com,Ann"))
+        with pytest.raises(InvalidImportFileException):
+            await importer.run(lines_of(""))
+
+    @pytest.mark.asyncio
+    async def test_quoted_fields_span_lines(self):
+        """Test that a quoted newline stays in its field and line numbers follow the file."""
+        user_repository = make_repository()
+        importer = UserImporter(user_repository)
+        rejected = []
+        csv_file = "\r\n".join([
+            "email,password,note",
+            "ann@example.com,password123,\"two",
+            "",
+            "lines\"",
+            "weak@example.com,short,x",
+            "bob@example.com,password123,\"never closed",
+            "cid@example.com,password123,",
+        ])
+
+        report = await importer.run(lines_of(csv_file), on_reject=rejected.append)
+
+        assert report.rows == 3
+        assert report.imported == 1
+        assert [(reject.line, reject.reason.value) for reject in rejected] == [
+            (6, "malformed_row"),
+            (5, "invalid_password"),
+        ]
+        assert [user.email for user in user_repository.import_users.call_args.args[0]] == ["ann@example.com"]
+
+    @pytest.mark.asyncio
+    async def test_iter_records(self):
+        """Test record grouping, escaped quotes and the record size limit."""
+        text = "\n".join(['a,"b""c', 'd"', "", 'e,"' + "x" * MAX_RECORD_CHARS, "f,g"])
+
+        records = [record async for record in iter_records(lines_of(text))]
+
+        assert records == [(1, ["a", 'b"c\nd']), (4, None), (5, ["f", "g"])]
+
+    @pytest.mark.asyncio
+    async def test_iter_lines_across_chunks(self):
+        """Test line splitting over chunk boundaries, including inside a UTF-8 character."""
+        data = "email,password\r\nzoé@example.com,password1\n".encode("utf-8")
+        split = data.index("é".encode("utf-8")) + 1
+
+        lines = [line async for line in iter_lines(chunks_of(b"\xef\xbb\xbf" + data[:5], data[5:split], data[split:]))]
+
+        assert lines == ["email,password\r", "zoé@example.com,password1"]
+
+        with pytest.raises(InvalidImportFileException):
+            [line async for line in iter_lines(chunks_of(b"email\xff"))]
+
+    @pytest.mark.asyncio
+    async def test_repository_loads_through_staging_table(self):
+        """Test the COPY-based load and that only inserted emails enter the filter."""
+        db_client = AsyncMock()
+
+        @asynccontextmanager
+        async def unit_of_work(transaction=False):
+            yield None
+
+        db_client.unit_of_work = unit_of_work
+        db_client.execute_query.side_effect = [None, [{"email": "a@example.com"}]]
+        email_filter = MagicMock()
+        repository = UserRepository(db_client, email_filter=email_filter)
+        users = [
+            MagicMock(email=email, status=MagicMock(value="PENDING"))
+            for email in ("a@example.com", "b@example.com")
+        ]
+
+        inserted = await repository.import_users(users)
+
+        assert inserted == {"a@example.com"}
+        table, records, columns = db_client.copy_records.call_args.args
+        assert table == "import_users"
+        assert len(records) == 2
+        assert columns[:2] == ["user_id", "email"]
+        email_filter.add.assert_called_once_with("a@example.com")
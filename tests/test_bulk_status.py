@@ -0,0 +1,123 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pydantic import ValidationError
+
+from src.domain.exceptions import InvalidStatusChangeException
+from src.domain.user.entities import StatusChangeSkip, UserStatus
+from src.domain.user.repository import UserRepository
+from src.domain.user.service import MAX_BULK_STATUS_USERS, UserService
+from src.schemas.user import BulkStatusChangeRequest
+
+
+def make_row(user_id, previous_status, updated, email=None):
+    return {
+        "user_id": user_id,
+        "email": email or f"{user_id}@example.com",
+        "previous_status": previous_status,
+        "updated": updated,
+    }
+
+
+class TestBulkStatusChange:
+    """Test moving many users to one status."""
+
+    @pytest.mark.asyncio
+    async def test_updated_and_skipped_users(self):
+        """Test that every user is reported as updated or skipped with a reason."""
+        ids = [uuid.UUID(int=i) for i in range(1, 6)]
+        user_repository = AsyncMock()
+        user_repository.bulk_update_status.return_value = [
+            make_row(ids[0], "ACTIVE", True),
+            make_row(ids[1], "SUSPENDED", False),
+            make_row(ids[2], "PENDING", False),
+            make_row(ids[3], "ACTIVE", False),
+        ]
+        credential_cache = MagicMock()
+        service = UserService(user_repository, AsyncMock(), AsyncMock(), credential_cache=credential_cache)
+
+        result = await service.change_users_status(
+            UserStatus.SUSPENDED, user_ids=ids + [ids[0]], from_statuses=[UserStatus.ACTIVE]
+        )
+
+        assert result.updated == [ids[0]]
+        assert result.skipped == {
+            str(ids[1]): StatusChangeSkip.ALREADY_IN_STATUS,
+            str(ids[2]): StatusChangeSkip.NOT_ALLOWED,
+            str(ids[3]): StatusChangeSkip.CHANGED_CONCURRENTLY,
+            str(ids[4]): StatusChangeSkip.NOT_FOUND,
+        }
+        key, values, status, from_statuses, _ = user_repository.bulk_update_status.call_args.args
+        assert (key, values, status) == ("user_id", ids, UserStatus.SUSPENDED)
+        assert from_statuses == {UserStatus.ACTIVE}
+        credential_cache.invalidate.assert_called_once_with(ids[0])
+        assert result.to_dict()["updated_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_by_email_defaults_to_allowed_transitions(self):
+        """Test email keys and the default source statuses."""
+        user_id = uuid.uuid4()
+        user_repository = AsyncMock()
+        user_repository.bulk_update_status.return_value = [
+            make_row(user_id, "SUSPENDED", True, email="a@example.com")
+        ]
+        service = UserService(user_repository, AsyncMock(), AsyncMock())
+
+        result = await service.change_users_status(UserStatus.ACTIVE, emails=["a@example.com", "b@example.com"])
+
+        assert result.updated == [user_id]
+        assert result.skipped == {"b@example.com": StatusChangeSkip.NOT_FOUND}
+        key, _, _, from_statuses, _ = user_repository.bulk_update_status.call_args.args
+        assert key == "email"
+        assert from_statuses == {UserStatus.INACTIVE, UserStatus.SUSPENDED}
+
+    @pytest.mark.asyncio
+    async def test_invalid_requests(self):
+        """Test the request checks made before touching the database."""
+        user_repository = AsyncMock()
+        service = UserService(user_repository, AsyncMock(), AsyncMock())
+        user_ids = [uuid.uuid4()]
+
+        for kwargs in (
+            {"status": UserStatus.SUSPENDED},
+            {"status": UserStatus.SUSPENDED, "user_ids": user_ids, "emails": ["a@example.com"]},
+            {"status": UserStatus.PENDING, "user_ids": user_ids},
+            {"status": UserStatus.ACTIVE, "user_ids": user_ids, "from_statuses": [UserStatus.PENDING]},
+            {"status": UserStatus.SUSPENDED,
+             "user_ids": [uuid.UUID(int=i) for i in range(MAX_BULK_STATUS_USERS + 1)]},
+        ):
+            with pytest.raises(InvalidStatusChangeException):
+                await service.change_users_status(**kwargs)
+
+        user_repository.bulk_update_status.assert_not_called()
+
+    def test_request_emails_are_normalized(self):
+        """Test that request emails match the stored spelling, as in registration."""
+        request = BulkStatusChangeRequest(status="SUSPENDED", emails=["Ann@EXAMPLE.com"])
+
+        assert request.emails == ["Ann@example.com"]
+        with pytest.raises(ValidationError):
+            BulkStatusChangeRequest(status="SUSPENDED", emails=["not-an-email"])
+
+    @pytest.mark.asyncio
+    async def test_repository_updates_in_chunks(self):
+        """Test one array UPDATE per chunk and cache invalidation of changed users."""
+        ids = [uuid.UUID(int=i) for i in range(1, 6)]
+        db_client = AsyncMock()
+        db_client.execute_statement.side_effect = lambda name, chunk, *args: [
+            make_row(user_id, "ACTIVE", user_id != ids[4]) for user_id in chunk
+        ]
+        user_cache = MagicMock()
+        repository = UserRepository(db_client, user_cache=user_cache)
+
+        rows = await repository.bulk_update_status(
+            "user_id", ids, UserStatus.SUSPENDED, [UserStatus.ACTIVE], chunk_size=2
+        )
+
+        assert len(rows) == 5
+        calls = db_client.execute_statement.call_args_list
+        assert [call.args[0] for call in calls] == ["users.bulk_set_status_by_id"] * 3
+        assert [call.args[1] for call in calls] == [ids[:2], ids[2:4], ids[4:]]
+        assert calls[0].args[2:4] == (["ACTIVE"], "SUSPENDED")
+        assert user_cache.invalidate.call_count == 4
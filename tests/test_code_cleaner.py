@@ -0,0 +1,108 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.domain.user.code_cleaner import ActivationCodeCleaner
+from src.domain.user.repository import ActivationCodeRepository
+
+
+class FakeCodeTable:
+    """Code rows keyed by user_id, deleted through the batch method."""
+
+    def __init__(self, rows):
+        # user_id -> expired
+        self.rows = dict(sorted(rows.items()))
+        self.calls = []
+
+    async def delete_expired_codes_batch(self, after_user_id, batch_size):
+        self.calls.append(after_user_id)
+        scanned = [user_id for user_id in self.rows if user_id > after_user_id][:batch_size]
+        deleted = 0
+        for user_id in scanned:
+            if self.rows[user_id]:
+                del self.rows[user_id]
+                deleted += 1
+        return (scanned[-1] if scanned else None), len(scanned), deleted
+
+
+def make_rows(count, expired_every=2):
+    return {uuid.UUID(int=i + 1): i % expired_every == 0 for i in range(count)}
+
+
+class TestActivationCodeCleaner:
+    """Test the batched expired-code cleanup."""
+
+    @pytest.mark.asyncio
+    async def test_deletes_in_batches(self):
+        """Test that the whole table is walked in bounded batches."""
+        table = FakeCodeTable(make_rows(25))
+        cleaner = ActivationCodeCleaner(table, batch_size=10)
+
+        progress = await cleaner.run()
+
+        assert progress.finished
+        assert progress.batches == 3
+        assert progress.scanned == 25
+        assert progress.deleted == 13
+        assert len(table.rows) == 12
+
+    @pytest.mark.asyncio
+    async def test_stop_and_resume(self):
+        """Test that a stopped run can be resumed from its cursor."""
+        table = FakeCodeTable(make_rows(25))
+        stop = asyncio.Event()
+        cleaner = ActivationCodeCleaner(table, batch_size=10)
+
+        first = await cleaner.run(stop=stop, on_batch=lambda progress: stop.set())
+        assert not first.finished
+        assert first.batches == 1
+
+        second = await cleaner.run(start_after=first.last_user_id)
+
+        assert second.finished
+        assert first.scanned + second.scanned == 25
+        assert second.last_user_id == uuid.UUID(int=25)
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_and_replication_lag(self):
+        """Test that the cleaner sleeps off its rate and waits out standby lag."""
+        table = FakeCodeTable(make_rows(20, expired_every=1))
+        sleeps = []
+        lags = iter([5.0, 0.0])
+
+        async def sleep(seconds):
+            sleeps.append(seconds)
+
+        async def replication_lag():
+            return next(lags, 0.0)
+
+        cleaner = ActivationCodeCleaner(
+            table, batch_size=10, max_rows_per_second=100.0,
+            replication_lag=replication_lag, max_replication_lag_seconds=1.0, lag_poll_seconds=0.5,
+            sleep=sleep, clock=lambda: 0.0
+        )
+
+        progress = await cleaner.run()
+
+        # Two full batches of 10 rows at 100/s; one lag poll while it is 5s
+        assert sleeps == [0.1, 0.5, 0.1]
+        assert progress.deleted == 20
+        assert progress.throttled_seconds == pytest.approx(0.7)
+
+    @pytest.mark.asyncio
+    async def test_repository_cleanup_walks_batches(self):
+        """Test the unpaced repository loop and the batch statement result."""
+        db_client = AsyncMock()
+        db_client.execute_statement.side_effect = [
+            {'last_user_id': uuid.UUID(int=2), 'scanned': 2, 'deleted': 1},
+            {'last_user_id': uuid.UUID(int=3), 'scanned': 1, 'deleted': 1},
+        ]
+        repository = ActivationCodeRepository(db_client)
+
+        assert await repository.cleanup_expired_codes(batch_size=2) == 2
+        assert db_client.execute_statement.call_args_list[0].args[:3] == (
+            "codes.delete_expired_batch", uuid.UUID(int=0), 2
+        )
+        assert db_client.execute_statement.call_args_list[1].args[1] == uuid.UUID(int=2)
@@ -0,0 +1,113 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from src.domain.user.entities import User, UserStatus, utc_now
+from src.domain.user.service import UserService
+from src.infrastructure.cache.ttl_cache import TTLCache
+from src.infrastructure.hashing.credential_cache import VerifiedCredentialCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def sample_user():
+    return User(
+        user_id="test-user-id",
+        email="test@example.com",
+        password_hash="$2b$12$hashed_password",
+        status=UserStatus.PENDING,
+        created_at=utc_now()
+    )
+
+
+class TestTTLCache:
+    """Test the LRU + TTL cache."""
+
+    def test_entries_expire(self):
+        """Test that entries are dropped after their TTL."""
+        clock = FakeClock()
+        cache = TTLCache(max_entries=10, ttl_seconds=5, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 4.9
+        assert cache.get("a") == 1
+        clock.now = 5.0
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that the LRU entry goes first when the cache is full."""
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+
+class TestVerifiedCredentialCache:
+    """Test the verified credential cache."""
+
+    def test_hit_only_for_same_credential(self, sample_user):
+        """Test that only the exact verified password hits."""
+        cache = VerifiedCredentialCache()
+        cache.add(sample_user, "password123")
+
+        assert cache.is_verified(sample_user, "password123")
+        assert not cache.is_verified(sample_user, "password124")
+
+    def test_hash_or_status_change_misses(self, sample_user):
+        """Test that a new hash or status invalidates the entry."""
+        cache = VerifiedCredentialCache()
+        cache.add(sample_user, "password123")
+
+        sample_user.password_hash = "$2b$13$rehashed_password"
+        assert not cache.is_verified(sample_user, "password123")
+
+        cache.add(sample_user, "password123")
+        sample_user.status = UserStatus.ACTIVE
+        assert not cache.is_verified(sample_user, "password123")
+
+    def test_invalidate(self, sample_user):
+        """Test explicit invalidation by user id."""
+        cache = VerifiedCredentialCache()
+        cache.add(sample_user, "password123")
+        cache.invalidate(sample_user.user_id)
+
+        assert not cache.is_verified(sample_user, "password123")
+
+    def test_no_plaintext_stored(self, sample_user):
+        """Test that the password never appears in the cache."""
+        cache = VerifiedCredentialCache()
+        cache.add(sample_user, "password123")
+
+        stored = list(cache._cache._entries.values())
+        assert all(b"password123" not in value for _, value in stored)
+
+    @pytest.mark.asyncio
+    async def test_service_skips_bcrypt_on_repeat(self, sample_user):
+        """Test that a repeat authentication does not verify the password again."""
+        user_repository = AsyncMock()
+        user_repository.get_user_by_email.return_value = sample_user
+        user_repository.verify_password.return_value = True
+        service = UserService(
+            user_repository=user_repository,
+            activation_code_repository=AsyncMock(),
+            email_service=AsyncMock(),
+            credential_cache=VerifiedCredentialCache()
+        )
+
+        await service.resend_activation_code("test@example.com", "password123")
+        await service.resend_activation_code("test@example.com", "password123")
+
+        user_repository.verify_password.assert_called_once()
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.infrastructure.hashing.hashing_executor import HashingExecutor
+from src.infrastructure.hashing.cost_calibration import BcryptCostCalibrator
+from src.infrastructure.hashing.password_hasher import BcryptHasher
+from src.domain.exceptions import HashingCapacityException
+
+
+@pytest.fixture
+def executor():
+    executor = HashingExecutor(max_workers=1, max_queue_size=1)
+    executor.start()
+    yield executor
+    executor.shutdown()
+
+
+class TestHashingExecutor:
+    """Test the bounded password hashing pool."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_check_password(self, executor):
+        """Test hashing and verifying a password on the pool."""
+        hasher = BcryptHasher(rounds=4)
+        password_hash = await executor.hash_password(hasher, "password123")
+
+        assert password_hash.startswith("$2b$04$")
+        assert await executor.verify_password(hasher, "password123", password_hash)
+        assert not await executor.verify_password(hasher, "wrong_password1", password_hash)
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self, executor):
+        """Test that jobs beyond workers + queue size fail fast."""
+        release = threading.Event()
+
+        running = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        assert executor.queue_depth == 1
+        with pytest.raises(HashingCapacityException):
+            await executor.run(release.wait)
+
+        release.set()
+        await asyncio.gather(running, queued)
+
+        metrics = executor.get_metrics()
+        assert metrics["rejected"] == 1
+        assert metrics["completed"] == 2
+        assert metrics["queue_depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_after_queue_timeout(self):
+        """Test that a job waiting longer than the queue timeout is rejected."""
+        executor = HashingExecutor(max_workers=1, max_queue_size=4, queue_timeout=0.05)
+        release = threading.Event()
+        try:
+            running = asyncio.create_task(executor.run(release.wait))
+            await asyncio.sleep(0.02)
+
+            with pytest.raises(HashingCapacityException):
+                await executor.run(release.wait)
+
+            release.set()
+            await running
+            assert executor.get_metrics()["timed_out"] == 1
+        finally:
+            release.set()
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self, executor):
+        """Test that the loop keeps serving other coroutines while hashing."""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        ticker_task = asyncio.create_task(ticker())
+        await executor.hash_password(BcryptHasher(rounds=10), "password123")
+        ticker_task.cancel()
+
+        assert ticks > 5
+
+
+class TestBcryptCostCalibration:
+    """Test bcrypt cost calibration and the rehash band."""
+
+    @pytest.mark.asyncio
+    async def test_calibration_stops_at_budget(self, executor):
+        """Test that calibration picks the highest cost within budget."""
+        calibrator = BcryptCostCalibrator(budget_ms=10_000, min_rounds=4, max_rounds=6, samples=2)
+        result = await calibrator.calibrate(executor)
+
+        assert result.rounds == 6
+        assert result.within_budget
+        assert set(result.measurements) == {4, 5, 6}
+
+    @pytest.mark.asyncio
+    async def test_calibration_falls_back_to_minimum(self, executor):
+        """Test that the minimum cost is used when nothing fits the budget."""
+        calibrator = BcryptCostCalibrator(budget_ms=0.0, min_rounds=4, max_rounds=6, samples=1)
+        result = await calibrator.calibrate(executor)
+
+        assert result.rounds == 4
+        assert not result.within_budget
+        assert set(result.measurements) == {4}
@@ -0,0 +1,151 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.domain.user.service import UserService
+from src.infrastructure.scheduler.job_scheduler import JobScheduler, advisory_lock_key
+
+
+class FakeLockingDatabase:
+    """Advisory locks and the scheduled_jobs table, shared by schedulers."""
+
+    def __init__(self):
+        self.held = set()
+        self.last_finished = {}
+
+    @asynccontextmanager
+    async def advisory_lock(self, key):
+        if key in self.held:
+            yield None
+            return
+        self.held.add(key)
+        connection = AsyncMock()
+        connection.fetchval.side_effect = lambda sql, name: self.last_finished.get(name)
+
+        async def record(sql, name, started_at, finished_at, *args):
+            self.last_finished[name] = finished_at
+
+        connection.execute.side_effect = record
+        try:
+            yield connection
+        finally:
+            self.held.discard(key)
+
+
+class TestJobScheduler:
+    """Test fleet-wide single runs of periodic jobs."""
+
+    @pytest.mark.asyncio
+    async def test_runs_once_per_interval_across_workers(self):
+        """Test that a second worker skips a job another worker just ran."""
+        database = FakeLockingDatabase()
+        job_func = AsyncMock(return_value=3)
+        first, second = JobScheduler(database), JobScheduler(database)
+        first_job = first.register("cleanup", job_func, interval_seconds=60)
+        second_job = second.register("cleanup", job_func, interval_seconds=60)
+
+        assert await first.run_once(first_job) == "ok"
+        assert await second.run_once(second_job) == "not_due"
+
+        job_func.assert_awaited_once()
+        assert first_job.last_result == 3
+        assert first_job.last_duration_seconds is not None
+        assert second_job.skips == 1
+
+        # Due again once the interval has passed
+        database.last_finished["cleanup"] = datetime.now(timezone.utc) - timedelta(seconds=61)
+        assert await second.run_once(second_job) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_run_is_locked_out(self):
+        """Test that a job never runs twice at the same time."""
+        database = FakeLockingDatabase()
+        release = asyncio.Event()
+
+        async def slow_job():
+            await release.wait()
+
+        first, second = JobScheduler(database), JobScheduler(database)
+        first_job = first.register("purge", slow_job, interval_seconds=60)
+        second_job = second.register("purge", slow_job, interval_seconds=60)
+
+        running = asyncio.create_task(first.run_once(first_job))
+        await asyncio.sleep(0)
+        assert await second.run_once(second_job) == "locked"
+        release.set()
+        assert await running == "ok"
+
+    @pytest.mark.asyncio
+    async def test_failure_is_recorded(self):
+        """Test that a failing job reports its error and keeps the lock free."""
+        database = FakeLockingDatabase()
+        scheduler = JobScheduler(database)
+        job = scheduler.register("stats", AsyncMock(side_effect=RuntimeError("boom")), interval_seconds=60)
+
+        assert await scheduler.run_once(job) == "error"
+
+        metrics = scheduler.get_metrics()["stats"]
+        assert metrics["last_outcome"] == "error"
+        assert metrics["last_error"] == "boom"
+        assert metrics["failures"] == 1
+        assert not database.held
+
+    @pytest.mark.asyncio
+    async def test_per_process_job_skips_lock(self):
+        """Test that non-exclusive jobs run in every worker."""
+        scheduler = JobScheduler(AsyncMock())
+        job_func = AsyncMock()
+        job = scheduler.register("memory_cleanup", job_func, interval_seconds=60, exclusive=False)
+
+        assert await scheduler.run_once(job) == "ok"
+        job_func.assert_awaited_once()
+
+    def test_lock_keys_are_stable_and_distinct(self):
+        """Test that lock keys fit a bigint and differ by job."""
+        assert advisory_lock_key("cleanup") == advisory_lock_key("cleanup")
+        assert advisory_lock_key("cleanup") != advisory_lock_key("purge")
+        assert -2 ** 63 <= advisory_lock_key("cleanup") < 2 ** 63
+
+    def test_duplicate_job_rejected(self):
+        """Test that a job name can only be registered once."""
+        scheduler = JobScheduler(AsyncMock())
+        scheduler.register("cleanup", AsyncMock(), interval_seconds=60)
+
+        with pytest.raises(ValueError):
+            scheduler.register("cleanup", AsyncMock(), interval_seconds=60)
+
+
+class TestMaintenanceJobs:
+    """Test the service side of the scheduled jobs."""
+
+    @pytest.mark.asyncio
+    async def test_user_stats_from_counters(self):
+        """Test that stats are summed from the status counters."""
+        user_repository = AsyncMock()
+        user_repository.get_user_stats.return_value = {"PENDING": 2, "ACTIVE": 5, "SUSPENDED": 1}
+        service = UserService(user_repository, AsyncMock(), AsyncMock())
+
+        stats = await service.get_user_stats()
+
+        assert stats == {
+            "total_users": 8,
+            "active_users": 5,
+            "pending_users": 2,
+            "by_status": {"PENDING": 2, "ACTIVE": 5, "INACTIVE": 0, "SUSPENDED": 1}
+        }
+
+    @pytest.mark.asyncio
+    async def test_purge_cutoff(self):
+        """Test that the purge deletes accounts older than the max age."""
+        user_repository = AsyncMock()
+        user_repository.purge_stale_pending_users.return_value = 4
+        service = UserService(user_repository, AsyncMock(), AsyncMock())
+
+        assert await service.purge_stale_pending_users(3600) == 4
+
+        created_before = user_repository.purge_stale_pending_users.call_args.args[0]
+        age = datetime.now(timezone.utc) - created_before
+        assert timedelta(seconds=3599) < age < timedelta(seconds=3605)
@@ -0,0 +1,91 @@
+import pickle
+
+import pytest
+
+from src.infrastructure.hashing import password_hasher
+from src.infrastructure.hashing.password_hasher import (
+    Argon2idHasher,
+    BcryptHasher,
+    PasswordHasherRegistry,
+    ScryptHasher
+)
+
+requires_argon2 = pytest.mark.skipif(password_hasher.argon2 is None, reason="argon2-cffi not installed")
+
+
+@pytest.fixture
+def bcrypt_hasher():
+    return BcryptHasher(rounds=4, max_rounds=6)
+
+
+@pytest.fixture
+def scrypt_hasher():
+    return ScryptHasher(n_log2=10, r=8, p=1)
+
+
+class TestPasswordHashers:
+    """Test the individual password hashers."""
+
+    def test_bcrypt_round_trip(self, bcrypt_hasher):
+        """Test bcrypt hash and verify."""
+        password_hash = bcrypt_hasher.hash("password123")
+
+        assert bcrypt_hasher.identify(password_hash)
+        assert bcrypt_hasher.verify("password123", password_hash)
+        assert not bcrypt_hasher.verify("password124", password_hash)
+
+    def test_bcrypt_rehash_band(self):
+        """Test that only hashes below target or above the max are rehashed."""
+        hasher = BcryptHasher(rounds=11, max_rounds=13)
+
+        assert hasher.needs_rehash("$2b$10$" + "a" * 53)
+        assert not hasher.needs_rehash("$2b$11$" + "a" * 53)
+        assert not hasher.needs_rehash("$2b$13$" + "a" * 53)
+        assert hasher.needs_rehash("$2b$14$" + "a" * 53)
+
+    def test_scrypt_round_trip(self, scrypt_hasher):
+        """Test scrypt hash, verify and parameter change detection."""
+        password_hash = scrypt_hasher.hash("password123")
+
+        assert password_hash.startswith("$scrypt$ln=10,r=8,p=1$")
+        assert scrypt_hasher.verify("password123", password_hash)
+        assert not scrypt_hasher.verify("password124", password_hash)
+        assert not scrypt_hasher.needs_rehash(password_hash)
+        assert ScryptHasher(n_log2=11).needs_rehash(password_hash)
+
+    @requires_argon2
+    def test_argon2id_round_trip(self):
+        """Test argon2id hash, verify and parameter change detection."""
+        hasher = Argon2idHasher(time_cost=1, memory_cost_kib=1024)
+        password_hash = hasher.hash("password123")
+
+        assert password_hash.startswith("$argon2id$")
+        assert hasher.verify("password123", password_hash)
+        assert not hasher.verify("password124", password_hash)
+        assert Argon2idHasher(time_cost=2, memory_cost_kib=1024).needs_rehash(password_hash)
+
+    def test_hashers_are_picklable(self, scrypt_hasher):
+        """Test that hashers can be shipped to a process pool."""
+        restored = pickle.loads(pickle.dumps(scrypt_hasher))
+
+        assert restored.verify("password123", scrypt_hasher.hash("password123"))
+
+
+class TestPasswordHasherRegistry:
+    """Test hash identification and migration-on-verify."""
+
+    def test_verifies_mixed_hashes(self, bcrypt_hasher, scrypt_hasher):
+        """Test that hashes of every registered algorithm verify."""
+        registry = PasswordHasherRegistry(scrypt_hasher, [bcrypt_hasher])
+
+        assert registry.verify("password123", bcrypt_hasher.hash("password123"))
+        assert registry.verify("password123", scrypt_hasher.hash("password123"))
+        assert not registry.verify("password123", "$unknown$hash")
+
+    def test_non_default_algorithm_needs_rehash(self, bcrypt_hasher, scrypt_hasher):
+        """Test that hashes migrate to the default algorithm."""
+        registry = PasswordHasherRegistry(scrypt_hasher, [bcrypt_hasher])
+
+        assert registry.needs_rehash(bcrypt_hasher.hash("password123"))
+        assert not registry.needs_rehash(registry.hash("password123"))
+        assert registry.hash("password123").startswith("$scrypt$")
@@ -0,0 +1,203 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.domain.exceptions import DatabaseException
+from src.infrastructure.database.postgresql_client import PostgreSQLClient
+from src.infrastructure.database.statements import StatementRegistry
+
+
+class FakePool:
+    """Pool that hands out mock connections and counts acquisitions."""
+
+    def __init__(self, size: int = 2):
+        self.acquired = 0
+        self.size = size
+
+    def get_size(self):
+        return self.size
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquired += 1
+        connection = MagicMock()
+        connection.execute = AsyncMock(return_value="UPDATE 1")
+        connection.transaction = MagicMock(side_effect=lambda: _FakeTransaction(connection))
+        connection.committed = 0
+        connection.prepared_statements = {}
+        connection.prepare = AsyncMock(side_effect=_fake_prepare)
+        yield connection
+
+
+async def _fake_prepare(sql, name=None):
+    if "missing_table" in sql:
+        raise Exception('relation "missing_table" does not exist')
+    prepared = MagicMock()
+    prepared.fetchrow = AsyncMock(return_value={"user_id": "test-user-id"})
+    prepared.fetch = AsyncMock(return_value=[])
+    prepared.get_statusmsg = MagicMock(return_value="UPDATE 1")
+    return prepared
+
+
+class _FakeTransaction:
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.connection.committed += 1
+        return False
+
+
+@pytest.fixture
+def statements():
+    registry = StatementRegistry()
+    registry.register("users.by_id", "SELECT user_id FROM users WHERE user_id = $1", fetch='one')
+    registry.register("users.touch", "UPDATE users SET updated_at = NOW() WHERE user_id = $1")
+    return registry
+
+
+@pytest.fixture
+def db_client(statements):
+    client = PostgreSQLClient("localhost", 5432, "test", "test", "test", min_connections=2, statements=statements)
+    client.pool = FakePool()
+    return client
+
+
+class TestUnitOfWork:
+    """Test request-scoped connection pinning."""
+
+    @pytest.mark.asyncio
+    async def test_statements_share_one_connection(self, db_client):
+        """Test that queries inside a unit of work reuse its connection."""
+        async with db_client.unit_of_work(transaction=True) as connection:
+            await db_client.execute_query("UPDATE users SET status = 'ACTIVE'")
+            await db_client.execute_query("UPDATE activation_codes SET is_used = TRUE")
+
+        assert db_client.pool.acquired == 1
+        assert connection.execute.await_count == 2
+        assert connection.committed == 1
+
+    @pytest.mark.asyncio
+    async def test_nested_unit_of_work_reuses_connection(self, db_client):
+        """Test that an inner unit of work does not acquire again."""
+        async with db_client.unit_of_work() as outer:
+            async with db_client.unit_of_work(transaction=True) as inner:
+                assert inner is outer
+
+        assert db_client.pool.acquired == 1
+
+    @pytest.mark.asyncio
+    async def test_pin_is_task_local(self, db_client):
+        """Test that concurrent tasks do not share a pinned connection."""
+        async def run():
+            async with db_client.unit_of_work() as connection:
+                await asyncio.sleep(0)
+                return connection
+
+        first, second = await asyncio.gather(run(), run())
+
+        assert first is not second
+        assert db_client.pool.acquired == 2
+
+    @pytest.mark.asyncio
+    async def test_without_unit_of_work(self, db_client):
+        """Test that plain queries still acquire per statement."""
+        await db_client.execute_query("SELECT 1")
+        await db_client.execute_query("SELECT 1")
+
+        assert db_client.pool.acquired == 2
+
+
+class TestStatementRegistry:
+    """Test named prepared statements."""
+
+    def test_register_rejects_duplicates_and_bad_fetch(self, statements):
+        """Test that names are unique and fetch modes are checked."""
+        with pytest.raises(ValueError):
+            statements.register("users.by_id", "SELECT 1")
+        with pytest.raises(ValueError):
+            statements.register("users.count", "SELECT count(*) FROM users", fetch='many')
+
+    @pytest.mark.asyncio
+    async def test_statement_prepared_once_per_connection(self, db_client):
+        """Test that a connection reuses its prepared statement."""
+        async with db_client.unit_of_work() as connection:
+            row = await db_client.execute_statement("users.by_id", "test-user-id")
+            await db_client.execute_statement("users.by_id", "test-user-id")
+            status = await db_client.execute_statement("users.touch", "test-user-id")
+
+        assert row == {"user_id": "test-user-id"}
+        assert status == "UPDATE 1"
+        assert connection.prepare.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_statement(self, db_client):
+        """Test that an unregistered name is a database error."""
+        with pytest.raises(DatabaseException):
+            await db_client.execute_statement("users.nope")
+
+    @pytest.mark.asyncio
+    async def test_warm_up_fails_on_broken_statement(self, db_client, statements):
+        """Test that startup fails when a statement does not prepare."""
+        statements.register("broken", "SELECT * FROM missing_table")
+
+        with pytest.raises(DatabaseException, match="broken"):
+            await db_client.warm_up_statements()
+
+    @pytest.mark.asyncio
+    async def test_warm_up_prepares_idle_connections(self, db_client):
+        """Test that warm-up prepares on every idle connection."""
+        await db_client.warm_up_statements()
+
+        assert db_client.pool.acquired == 2
+        assert db_client._statements_ready
+
+
+class TestCreateTables:
+    """Test that startup only builds the schema of a fresh database."""
+
+    def _client(self, schema_exists):
+        client = PostgreSQLClient("localhost", 5432, "test", "test", "test")
+        pool = FakePool()
+        acquire = pool.acquire
+
+        @asynccontextmanager
+        async def acquire_with_catalog():
+            async with acquire() as connection:
+                connection.fetchval = AsyncMock(return_value=schema_exists)
+                pool.connection = connection
+                yield connection
+
+        pool.acquire = acquire_with_catalog
+        client.pool = pool
+        return client
+
+    @pytest.mark.asyncio
+    async def test_existing_schema_is_left_alone(self):
+        """Test that no DDL runs once the users table exists."""
+        client = self._client(schema_exists=True)
+
+        await client.create_tables()
+
+        queries = [call.args[0] for call in client.pool.connection.execute.call_args_list]
+        assert queries == ["SELECT pg_advisory_xact_lock($1)"]
+
+    @pytest.mark.asyncio
+    async def test_fresh_database_gets_every_index(self):
+        """Test that a fresh database is created under the lock, indexes included."""
+        client = self._client(schema_exists=False)
+
+        await client.create_tables()
+
+        ddl = "\n".join(call.args[0] for call in client.pool.connection.execute.call_args_list)
+        assert client.pool.acquired == 1
+        for name in ("idx_users_created_at_user_id", "idx_users_pending_created_at", "idx_users_email_trgm"):
+            assert f"CREATE INDEX IF NOT EXISTS {name}" in ddl
+        assert "CONCURRENTLY" not in ddl
+        assert "CREATE TABLE IF NOT EXISTS user_counters" in ddl
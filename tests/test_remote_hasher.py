@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from src.domain.exceptions import HashingCapacityException
+from src.infrastructure.hashing.hashing_backend import LocalHashingBackend
+from src.infrastructure.hashing.hashing_executor import HashingExecutor
+from src.infrastructure.hashing.hashing_protocol import (
+    OP_VERIFY,
+    ProtocolError,
+    decode_body,
+    encode_frame,
+    parse_address
+)
+from src.infrastructure.hashing.hashing_server import HashingServer
+from src.infrastructure.hashing.password_hasher import BcryptHasher, PasswordHasherRegistry
+from src.infrastructure.hashing.remote_hasher import RemoteHashingBackend
+
+
+@pytest_asyncio.fixture
+async def hashing_server(tmp_path):
+    backend = LocalHashingBackend(
+        HashingExecutor(max_workers=2, max_queue_size=8),
+        PasswordHasherRegistry(BcryptHasher(rounds=4, max_rounds=6))
+    )
+    server = HashingServer(f"unix://{tmp_path}/hashing.sock", backend)
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest_asyncio.fixture
+async def remote_backend(hashing_server):
+    backend = RemoteHashingBackend(hashing_server.url, pool_size=2, timeout=5.0)
+    await backend.start()
+    yield backend
+    await backend.close()
+
+
+class TestHashingProtocol:
+    """Test the binary framing."""
+
+    def test_round_trip(self):
+        """Test that a frame decodes to what was encoded."""
+        frame = encode_frame(OP_VERIFY, 42, "pässword", "$2b$04$hash")
+
+        assert decode_body(frame[4:]) == (OP_VERIFY, 42, ["pässword", "$2b$04$hash"])
+
+    def test_truncated_frame(self):
+        """Test that a truncated field is rejected."""
+        frame = encode_frame(OP_VERIFY, 1, "password123")
+
+        with pytest.raises(ProtocolError):
+            decode_body(frame[4:-2])
+
+    def test_parse_address(self):
+        """Test Unix and TCP addresses."""
+        assert parse_address("unix:///tmp/hash.sock") == ("unix", "/tmp/hash.sock", 0)
+        assert parse_address("tcp://10.0.0.5:7300") == ("tcp", "10.0.0.5", 7300)
+        with pytest.raises(ValueError):
+            parse_address("http://example.com")
+
+
+class TestRemoteHashingBackend:
+    """Test the API-side client against a real hashing server."""
+
+    @pytest.mark.asyncio
+    async def test_hash_verify_and_rehash(self, remote_backend):
+        """Test every operation over the socket."""
+        password_hash = await remote_backend.hash_password("password123")
+
+        assert password_hash.startswith("$2b$04$")
+        assert await remote_backend.verify_password("password123", password_hash)
+        assert not await remote_backend.verify_password("password124", password_hash)
+        assert not await remote_backend.needs_rehash(password_hash)
+        assert not await remote_backend.needs_rehash("$2b$05$" + "a" * 53)
+        assert await remote_backend.needs_rehash("$2b$03$" + "a" * 53)
+
+    @pytest.mark.asyncio
+    async def test_pipelined_requests(self, remote_backend):
+        """Test many concurrent requests over a small connection pool."""
+        passwords = [f"password{i}" for i in range(10)]
+        hashes = await asyncio.gather(*(remote_backend.hash_password(p) for p in passwords))
+        results = await asyncio.gather(*(
+            remote_backend.verify_password(p, h) for p, h in zip(passwords, hashes)
+        ))
+
+        assert all(results)
+        assert remote_backend.get_metrics()["connections"] <= 2
+
+    @pytest.mark.asyncio
+    async def test_unreachable_service(self, tmp_path):
+        """Test that a missing service surfaces as a capacity error."""
+        backend = RemoteHashingBackend(f"unix://{tmp_path}/missing.sock", timeout=0.5)
+
+        with pytest.raises(HashingCapacityException):
+            await backend.hash_password("password123")
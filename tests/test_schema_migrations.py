@@ -0,0 +1,147 @@
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.infrastructure.database.schema_migrations import (
+    EMAIL_SEARCH_INDEX,
+    USERS_INDEXES,
+    activation_codes_one_row_per_user,
+    run_migrations,
+    seeded_user_counters,
+    users_indexes
+)
+
+ALL_USERS_INDEXES = {name: True for name, _ in USERS_INDEXES + [EMAIL_SEARCH_INDEX]}
+
+
+class FakeCatalog:
+    """Database client answering catalog checks from a set of relations."""
+
+    def __init__(
+        self, relations=(), composite_key=False, reloptions=(), counters=False,
+        indexes=None, extensions=("pg_trgm",), columns=("activation_nonce",)
+    ):
+        self.relations = set(relations)
+        self.composite_key = composite_key
+        self.reloptions = set(reloptions)
+        self.counters = counters
+        # Index name -> whether it is valid
+        self.indexes = dict(indexes or {})
+        self.extensions = set(extensions)
+        self.columns = set(columns)
+        self.executed = []
+
+    @asynccontextmanager
+    async def unit_of_work(self, transaction=False):
+        yield None
+
+    async def execute_query(self, query, *args, fetch=None):
+        if "to_regclass($1) IS NOT NULL" in query:
+            return args[0] in self.relations
+        if "indisvalid" in query:
+            return self.indexes.get(args[0])
+        if "pg_extension" in query:
+            return 1 if "pg_trgm" in self.extensions else None
+        if "pg_attribute" in query:
+            return 1 if "activation_nonce" in self.columns else None
+        if "indisprimary" in query:
+            return 1 if self.composite_key else None
+        if "reloptions" in query:
+            return "fillfactor=70" in self.reloptions
+        if "FROM user_counters" in query:
+            return self.counters
+        self.executed.append(" ".join(query.split()))
+        if query.lstrip().startswith("DELETE"):
+            return "DELETE 3"
+        if query.lstrip().startswith("INSERT"):
+            return "INSERT 0 2"
+        if "ADD PRIMARY KEY" in query:
+            self.composite_key = False
+        return "OK"
+
+
+class TestActivationCodesMigration:
+    """Test moving activation_codes to one row per user."""
+
+    @pytest.mark.asyncio
+    async def test_old_shape_is_migrated(self):
+        """Test the superseded-row delete, key swap and cleanup of old indexes."""
+        db_client = FakeCatalog(
+            relations={"activation_codes", "idx_activation_codes_expires_at"}, composite_key=True
+        )
+
+        changes = await activation_codes_one_row_per_user(db_client)
+
+        assert changes[0] == "deleted 3 superseded codes, primary key now (user_id)"
+        assert db_client.executed[0] == "LOCK TABLE activation_codes IN ACCESS EXCLUSIVE MODE"
+        assert "ALTER TABLE activation_codes ADD PRIMARY KEY (user_id)" in db_client.executed
+        assert "DROP INDEX CONCURRENTLY IF EXISTS idx_activation_codes_expires_at" in db_client.executed
+        assert not any("idx_activation_codes_is_used" in query for query in db_client.executed)
+
+    @pytest.mark.asyncio
+    async def test_second_run_changes_nothing(self):
+        """Test that a migrated database is left alone."""
+        db_client = FakeCatalog(
+            relations={"activation_codes", "scheduled_jobs", "user_counters"},
+            reloptions={"fillfactor=70"},
+            counters=True,
+            indexes=ALL_USERS_INDEXES
+        )
+
+        assert await run_migrations(db_client) == {
+            "users_activation_nonce": [],
+            "activation_codes_one_row_per_user": [],
+            "seeded_user_counters": [],
+            "users_indexes": [],
+        }
+        assert db_client.executed == []
+
+
+class TestUserCountersMigration:
+    """Test the maintenance tables on a database that already has users."""
+
+    @pytest.mark.asyncio
+    async def test_counters_start_from_a_full_count(self):
+        """Test that new counters are seeded and the old stats table dropped."""
+        db_client = FakeCatalog(relations={"user_stats"})
+
+        changes = await seeded_user_counters(db_client)
+
+        assert changes == [
+            "dropped user_stats",
+            "created scheduled_jobs",
+            "created user_counters",
+            "seeded user_counters (2 statuses)",
+        ]
+        assert db_client.executed[-1] == (
+            "INSERT INTO user_counters (status, shard, user_count) "
+            "SELECT status, 0, count(*) FROM users GROUP BY status"
+        )
+
+
+class TestUsersIndexesMigration:
+    """Test building the users indexes without blocking writes."""
+
+    @pytest.mark.asyncio
+    async def test_missing_and_invalid_indexes_are_built_concurrently(self):
+        """Test concurrent builds, the rebuild of an invalid index and the old index drop."""
+        indexes = dict(ALL_USERS_INDEXES)
+        del indexes["idx_users_created_at_user_id"]
+        indexes["idx_users_pending_created_at"] = False
+        db_client = FakeCatalog(relations={"idx_users_created_at"}, indexes=indexes)
+
+        changes = await users_indexes(db_client)
+
+        assert changes == [
+            "built idx_users_created_at_user_id",
+            "built idx_users_pending_created_at",
+            "dropped idx_users_created_at",
+        ]
+        assert db_client.executed == [
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_at_user_id ON users (created_at, user_id)",
+            "DROP INDEX CONCURRENTLY IF EXISTS idx_users_pending_created_at",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_pending_created_at "
+            "ON users (created_at) WHERE status = 'PENDING'",
+            "DROP INDEX CONCURRENTLY IF EXISTS idx_users_created_at",
+        ]
+        assert all("CONCURRENTLY" in query for query in db_client.executed)
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from src.domain.user.entities import User, UserStatus, utc_now
+from src.domain.user.repository import UserRepository
+from src.infrastructure.cache.user_cache import UserCache
+
+
+@pytest.fixture
+def frozen_user():
+    return User(
+        user_id="test-user-id",
+        email="test@example.com",
+        password_hash="hashed_password",
+        status=UserStatus.PENDING,
+        created_at=utc_now()
+    ).freeze()
+
+
+class TestUserCache:
+    """Test the read-through user cache."""
+
+    @pytest.mark.asyncio
+    async def test_loaded_user_is_cached_under_both_keys(self, frozen_user):
+        """Test that a load by email also serves lookups by id."""
+        cache = UserCache()
+        loader = AsyncMock(return_value=frozen_user)
+
+        assert await cache.get_by_email("test@example.com", loader) is frozen_user
+        assert await cache.get_by_id("test-user-id", loader) is frozen_user
+        loader.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_negative_entry(self):
+        """Test that a missing user is remembered until invalidated."""
+        cache = UserCache()
+        loader = AsyncMock(return_value=None)
+
+        assert await cache.get_by_email("nobody@example.com", loader) is None
+        assert await cache.get_by_email("nobody@example.com", loader) is None
+        cache.invalidate(email="nobody@example.com")
+        await cache.get_by_email("nobody@example.com", loader)
+
+        assert loader.await_count == 2
+        assert cache.get_metrics()["negative_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self, frozen_user):
+        """Test that concurrent misses for one key hit the database once."""
+        cache = UserCache()
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            return frozen_user
+
+        loader = AsyncMock(side_effect=load)
+        waiters = [asyncio.create_task(cache.get_by_email("test@example.com", loader)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert all(user is frozen_user for user in await asyncio.gather(*waiters))
+        loader.assert_awaited_once()
+        assert cache.get_metrics()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_load_skips_fill(self, frozen_user):
+        """Test that a load racing a write does not cache the old row."""
+        cache = UserCache()
+
+        async def load():
+            cache.invalidate(user_id="test-user-id")
+            return frozen_user
+
+        await cache.get_by_email("test@example.com", load)
+        loader = AsyncMock(return_value=frozen_user)
+        await cache.get_by_email("test@example.com", loader)
+
+        loader.assert_awaited_once()
+
+
+class TestRepositoryWithUserCache:
+    """Test cache use and invalidation in UserRepository."""
+
+    @pytest.mark.asyncio
+    async def test_status_update_invalidates(self, frozen_user):
+        """Test that reads are cached and a status write drops the entry."""
+        record = {
+            'user_id': 'test-user-id', 'email': 'test@example.com', 'password_hash': 'hashed_password',
+            'status': 'PENDING', 'created_at': utc_now(), 'updated_at': utc_now(), 'activated_at': None,
+            'activation_nonce': 0
+        }
+        db_client = AsyncMock()
+        db_client.execute_statement.return_value = record
+        repository = UserRepository(db_client, AsyncMock(), user_cache=UserCache())
+
+        first = await repository.get_user_by_email("test@example.com")
+        second = await repository.get_user_by_email("test@example.com")
+        assert first == second and first is not second
+        assert db_client.execute_statement.await_count == 1
+
+        await repository.update_user_status('test-user-id', UserStatus.ACTIVE, utc_now())
+        await repository.get_user_by_email("test@example.com")
+
+        # UPDATE, re-read by id (refills both keys), then the email lookup hits
+        assert db_client.execute_statement.await_count == 3
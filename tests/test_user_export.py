@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.domain.user.export import EXPORT_COLUMNS, ExportFormat, encode_export
+from src.domain.user.repository import UserRepository
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_row(i, email=None):
+    return {
+        "user_id": uuid.UUID(int=i),
+        "email": email or f"user{i}@example.com",
+        "status": "PENDING",
+        "created_at": NOW,
+        "updated_at": NOW,
+        "activated_at": None,
+    }
+
+
+async def rows_of(rows):
+    for row in rows:
+        yield row
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+class TestUserExport:
+    """Test the streamed NDJSON and CSV user export."""
+
+    @pytest.mark.asyncio
+    async def test_ndjson_lines(self):
+        """Test one JSON object per row, NULLs kept as null."""
+        chunks = await collect(encode_export(rows_of([make_row(1), make_row(2)]), ExportFormat.NDJSON))
+
+        lines = b"".join(chunks).decode("utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {
+                "user_id": str(uuid.UUID(int=i)),
+                "email": f"user{i}@example.com",
+                "status": "PENDING",
+                "created_at": NOW.isoformat(),
+                "updated_at": NOW.isoformat(),
+                "activated_at": None,
+            }
+            for i in (1, 2)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_csv_header_and_quoting(self):
+        """Test the header line and that awkward emails survive a round trip."""
+        rows = [make_row(1, email='"odd,name"@example.com'), make_row(2)]
+
+        chunks = await collect(encode_export(rows_of(rows), ExportFormat.CSV))
+
+        parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+        assert parsed[0] == list(EXPORT_COLUMNS)
+        assert parsed[1][1] == '"odd,name"@example.com'
+        assert parsed[2][5] == ""
+        assert len(parsed) == 3
+
+    @pytest.mark.asyncio
+    async def test_rows_are_chunked(self):
+        """Test that output is written in chunks of rows, not per row."""
+        rows = [make_row(i) for i in range(1, 6)]
+
+        chunks = await collect(encode_export(rows_of(rows), ExportFormat.NDJSON, rows_per_chunk=2))
+
+        assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_empty_export(self):
+        """Test that an empty table gives an empty NDJSON body and a bare CSV header."""
+        assert await collect(encode_export(rows_of([]), ExportFormat.NDJSON)) == []
+        assert await collect(encode_export(rows_of([]), ExportFormat.CSV)) == [
+            (",".join(EXPORT_COLUMNS) + "\n").encode("utf-8")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_repository_streams_through_cursor(self):
+        """Test that the export uses the cursor with the requested batch size."""
+        db_client = MagicMock()
+        db_client.stream_statement.return_value = rows_of([make_row(1)])
+        repository = UserRepository(db_client)
+
+        rows = [row async for row in repository.stream_export(None, batch_size=500)]
+
+        assert len(rows) == 1
+        db_client.stream_statement.assert_called_once_with("export.users", None, prefetch=500)
@@ -0,0 +1,247 @@
+import uuid
+from dataclasses import FrozenInstanceError
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from datetime import timedelta
+
+from src.domain.user.entities import (
+    USER_STATUS_BY_VALUE, ActivationCode, ActivationOutcome, User, UserStatus, utc_now
+)
+from src.domain.user.repository import ActivationCodeRepository, UserRepository
+from src.domain.user.statements import USER_STATEMENTS
+from src.domain.exceptions import EmailAlreadyExistsException, HashingCapacityException
+
+
+@pytest.fixture
+def mock_db_client():
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_hashing_backend():
+    backend = AsyncMock()
+    backend.hash_password.return_value = "hashed_password"
+    backend.average_hash_ms = MagicMock(return_value=None)
+    return backend
+
+
+class TestCreateUser:
+    """Test single round-trip registration."""
+
+    @pytest.mark.asyncio
+    async def test_insert_without_precheck(self, mock_db_client, mock_hashing_backend):
+        """Test that a cheap hash skips the lookup and inserts directly."""
+        mock_hashing_backend.average_hash_ms.return_value = 5.0
+        mock_db_client.execute_statement.return_value = "new-user-id"
+        repository = UserRepository(mock_db_client, mock_hashing_backend)
+
+        user = await repository.create_user("test@example.com", "password123")
+
+        assert user.password_hash == "hashed_password"
+        mock_db_client.execute_statement.assert_called_once()
+        assert mock_db_client.execute_statement.call_args.args[0] == "users.create"
+
+    @pytest.mark.asyncio
+    async def test_conflict_raises_email_exists(self, mock_db_client, mock_hashing_backend):
+        """Test that an insert losing the unique constraint is a duplicate."""
+        mock_db_client.execute_statement.return_value = None
+        repository = UserRepository(mock_db_client, mock_hashing_backend, email_precheck="never")
+
+        with pytest.raises(EmailAlreadyExistsException):
+            await repository.create_user("test@example.com", "password123")
+
+    @pytest.mark.asyncio
+    async def test_precheck_skips_hash_for_duplicate(self, mock_db_client, mock_hashing_backend):
+        """Test that an expensive hash is not spent on a known duplicate."""
+        mock_hashing_backend.average_hash_ms.return_value = 200.0
+        repository = UserRepository(mock_db_client, mock_hashing_backend)
+        repository.get_user_by_email = AsyncMock(return_value=MagicMock())
+
+        with pytest.raises(EmailAlreadyExistsException):
+            await repository.create_user("test@example.com", "password123")
+
+        mock_hashing_backend.hash_password.assert_not_called()
+        mock_db_client.execute_statement.assert_not_called()
+
+    def test_precheck_modes(self, mock_db_client, mock_hashing_backend):
+        """Test the pre-check decision for each mode."""
+        auto = UserRepository(mock_db_client, mock_hashing_backend, email_precheck_min_hash_ms=50.0)
+        assert auto._should_precheck_email("test@example.com")
+        mock_hashing_backend.average_hash_ms.return_value = 10.0
+        assert not auto._should_precheck_email("test@example.com")
+        assert UserRepository(mock_db_client, mock_hashing_backend, email_precheck="always")._should_precheck_email("test@example.com")
+
+        with pytest.raises(ValueError):
+            UserRepository(mock_db_client, mock_hashing_backend, email_precheck="sometimes")
+
+
+class TestCreateUserWithActivationCode:
+    """Test one-statement registration of a user and its code."""
+
+    @pytest.mark.asyncio
+    async def test_single_statement(self, mock_db_client, mock_hashing_backend):
+        """Test that the user and code are written by one query."""
+        mock_db_client.execute_statement.side_effect = lambda name, *args: args[0]
+        repository = UserRepository(mock_db_client, mock_hashing_backend, email_precheck="never")
+
+        user, activation_code = await repository.create_user_with_activation_code(
+            "test@example.com", "password123"
+        )
+
+        assert activation_code.user_id == user.user_id
+        mock_db_client.execute_statement.assert_called_once()
+        assert mock_db_client.execute_statement.call_args.args[0] == "users.create_with_code"
+
+    @pytest.mark.asyncio
+    async def test_conflict_writes_nothing(self, mock_db_client, mock_hashing_backend):
+        """Test that a duplicate email raises without a code."""
+        mock_db_client.execute_statement.return_value = None
+        repository = UserRepository(mock_db_client, mock_hashing_backend, email_precheck="never")
+
+        with pytest.raises(EmailAlreadyExistsException):
+            await repository.create_user_with_activation_code("test@example.com", "password123")
+
+
+class TestActivationCodeRow:
+    """Test the one-row-per-user code storage."""
+
+    @pytest.mark.asyncio
+    async def test_resend_replaces_row_in_one_statement(self, mock_db_client):
+        """Test that storing a code is a single upsert, with no invalidation pass."""
+        repository = ActivationCodeRepository(mock_db_client)
+
+        await repository.create_activation_code(ActivationCode.generate_for_user("test-user-id"))
+
+        mock_db_client.execute_statement.assert_called_once()
+        assert mock_db_client.execute_statement.call_args.args[0] == "codes.upsert"
+
+    def test_upsert_keys_on_user(self):
+        """Test that a repeated code for the same user cannot collide on the key."""
+        sql = USER_STATEMENTS.get("codes.upsert").sql
+
+        assert "ON CONFLICT (user_id) DO UPDATE" in sql
+
+
+class TestUserCounters:
+    """Test that user counts are maintained by the statements that change users."""
+
+    @pytest.mark.parametrize("name", [
+        "users.create", "users.create_with_code", "users.update_status", "users.activate",
+        "users.activate_with_code", "users.delete_stale_pending"
+    ])
+    def test_user_changes_update_counters(self, name):
+        """Test that every statement changing users also adds its counter delta."""
+        sql = USER_STATEMENTS.get(name).sql
+
+        assert "INSERT INTO user_counters" in sql
+        assert "pg_backend_pid()" in sql
+
+    @pytest.mark.asyncio
+    async def test_reconcile_reports_drift(self, mock_db_client, mock_hashing_backend):
+        """Test that reconciliation returns the corrections it applied."""
+        mock_db_client.execute_statement.return_value = [{'status': 'ACTIVE', 'delta': -2}]
+        repository = UserRepository(mock_db_client, mock_hashing_backend)
+
+        assert await repository.reconcile_user_stats() == {'ACTIVE': -2}
+        assert mock_db_client.execute_statement.call_args.args[0] == "stats.reconcile"
+
+
+class TestRehashPassword:
+    """Test the best-effort rehash after a login."""
+
+    @pytest.mark.asyncio
+    async def test_saturated_pool_drops_rehash(self, mock_db_client, mock_hashing_backend):
+        """Test that a full hashing pool keeps the old hash without an error."""
+        mock_hashing_backend.needs_rehash.return_value = True
+        mock_hashing_backend.hash_password.side_effect = HashingCapacityException()
+        repository = UserRepository(mock_db_client, mock_hashing_backend)
+        user = User(email="test@example.com", password_hash="old_hash")
+
+        assert await repository.rehash_password_if_needed(user, "password123") is False
+        assert user.password_hash == "old_hash"
+        mock_db_client.execute_statement.assert_not_called()
+
+
+class TestActivateWithCode:
+    """Test single-statement activation."""
+
+    @staticmethod
+    def _result(**overrides):
+        row = {
+            'user_id': None, 'email': None, 'password_hash': None, 'status': None,
+            'created_at': None, 'updated_at': None, 'activated_at': None, 'activation_nonce': None,
+            'current_status': 'PENDING', 'code_is_used': False,
+            'code_expires_at': utc_now() + timedelta(minutes=1)
+        }
+        row.update(overrides)
+        return row
+
+    @pytest.mark.asyncio
+    async def test_activated(self, mock_db_client, mock_hashing_backend):
+        """Test that the returned row becomes the activated user."""
+        now = utc_now()
+        mock_db_client.execute_statement.return_value = self._result(
+            user_id="test-user-id", email="test@example.com", password_hash="hashed_password",
+            status="ACTIVE", created_at=now, updated_at=now, activated_at=now,
+            activation_nonce=0, current_status="PENDING"
+        )
+        repository = UserRepository(mock_db_client, mock_hashing_backend)
+
+        outcome, user = await repository.activate_with_code("test-user-id", "1234")
+
+        assert outcome == ActivationOutcome.ACTIVATED
+        assert user.is_active() and user.activated_at == now
+        mock_db_client.execute_statement.assert_called_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("overrides,expected", [
+        ({'current_status': None}, ActivationOutcome.USER_NOT_FOUND),
+        ({'current_status': 'ACTIVE'}, ActivationOutcome.ALREADY_ACTIVE),
+        ({'code_is_used': None, 'code_expires_at': None}, ActivationOutcome.CODE_NOT_FOUND),
+        ({'code_expires_at': utc_now() - timedelta(minutes=1)}, ActivationOutcome.CODE_EXPIRED),
+        ({'code_is_used': True}, ActivationOutcome.CODE_USED),
+        ({}, ActivationOutcome.CODE_USED),
+    ])
+    async def test_failed_precondition(self, mock_db_client, mock_hashing_backend, overrides, expected):
+        """Test that each failed precondition is reported."""
+        mock_db_client.execute_statement.return_value = self._result(**overrides)
+        repository = UserRepository(mock_db_client, mock_hashing_backend)
+
+        outcome, user = await repository.activate_with_code("test-user-id", "1234")
+
+        assert outcome == expected
+        assert user is None
+
+
+class TestUserHydration:
+    """Test the trusted record-to-entity path."""
+
+    @pytest.mark.asyncio
+    async def test_get_user_by_email_keeps_stored_values(self, mock_db_client, mock_hashing_backend):
+        """Test that hydration keeps the UUID and the stored updated_at."""
+        user_id = uuid.uuid4()
+        stored_at = utc_now() - timedelta(days=3)
+        mock_db_client.execute_statement.return_value = {
+            'user_id': user_id, 'email': 'test@example.com', 'password_hash': 'hashed_password',
+            'status': 'PENDING', 'created_at': stored_at, 'updated_at': stored_at, 'activated_at': None,
+            'activation_nonce': 0
+        }
+        repository = UserRepository(mock_db_client, mock_hashing_backend)
+
+        user = await repository.get_user_by_email("test@example.com")
+
+        assert user.user_id is user_id
+        assert user.updated_at == stored_at
+        assert user.status == UserStatus.PENDING
+
+    def test_slotted_and_frozen_entities(self):
+        """Test that entities are slotted and the frozen copy is immutable."""
+        user = User(email="test@example.com", password_hash="hashed_password")
+        frozen = user.freeze()
+
+        assert not hasattr(user, "__dict__")
+        with pytest.raises(FrozenInstanceError):
+            frozen.status = UserStatus.ACTIVE
+        assert frozen.thaw() == user
+        assert USER_STATUS_BY_VALUE["ACTIVE"] is UserStatus.ACTIVE
@@ -1,9 +1,11 @@
+import asyncio
+
 import pytest
 import pytest_asyncio
 from unittest.mock import AsyncMock, MagicMock
 from datetime import datetime, timedelta
 
-from src.domain.user.entities import User, ActivationCode, UserStatus, utc_now
+from src.domain.user.entities import User, ActivationCode, ActivationOutcome, UserStatus, utc_now
 from src.domain.user.service import UserService
 from src.domain.exceptions import (
     EmailAlreadyExistsException,
@@ -79,10 +81,18 @@ class TestUserRegistration:
     """Test user registration functionality."""
 
     @pytest.mark.asyncio
-    async def test_register_user_success(self, user_service, mock_user_repository, sample_user):
+    async def test_register_user_success(
+        self,
+        user_service,
+        mock_user_repository,
+        mock_activation_code_repository,
+        mock_email_service,
+        sample_user
+    ):
         """Test successful user registration."""
         # Setup
-        mock_user_repository.create_user.return_value = sample_user
+        activation_code = ActivationCode.generate_for_user(sample_user.user_id)
+        mock_user_repository.create_user_with_activation_code.return_value = (sample_user, activation_code)
         
         # Execute
         result = await user_service.register_user("test@example.com", "password123")
@@ -90,7 +100,13 @@ class TestUserRegistration:
         # Assert
         assert result.email == "test@example.com"
         assert result.status == UserStatus.PENDING
-        mock_user_repository.create_user.assert_called_once()
+        mock_user_repository.create_user_with_activation_code.assert_called_once()
+        mock_activation_code_repository.create_activation_code.assert_not_called()
+        mock_email_service.send_activation_code.assert_called_once_with(
+            email=sample_user.email,
+            activation_code=activation_code.code,
+            user_id=sample_user.user_id
+        )
 
     @pytest.mark.asyncio
     async def test_register_user_invalid_password(self, user_service):
@@ -102,7 +118,7 @@ class TestUserRegistration:
     async def test_register_user_email_exists(self, user_service, mock_user_repository):
         """Test user registration with existing email."""
         # Setup
-        mock_user_repository.create_user.side_effect = EmailAlreadyExistsException()
+        mock_user_repository.create_user_with_activation_code.side_effect = EmailAlreadyExistsException()
         
         # Execute & Assert
         with pytest.raises(EmailAlreadyExistsException):
@@ -126,15 +142,15 @@ class TestUserActivation:
         # Setup
         mock_user_repository.get_user_by_email.return_value = sample_user
         mock_user_repository.verify_password.return_value = True
-        mock_activation_code_repository.get_activation_code.return_value = sample_activation_code
-        mock_user_repository.update_user_status.return_value = sample_active_user
+        mock_user_repository.activate_with_code.return_value = (ActivationOutcome.ACTIVATED, sample_active_user)
         
         # Execute
         result = await user_service.activate_user("test@example.com", "password123", "1234")
         
         # Assert
         assert result.status == UserStatus.ACTIVE
-        mock_activation_code_repository.mark_code_as_used.assert_called_once()
+        mock_user_repository.activate_with_code.assert_called_once_with(sample_user.user_id, "1234")
+        mock_activation_code_repository.get_activation_code.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_activate_user_invalid_credentials(self, user_service, mock_user_repository):
@@ -174,7 +190,7 @@ class TestUserActivation:
         # Setup
         mock_user_repository.get_user_by_email.return_value = sample_user
         mock_user_repository.verify_password.return_value = True
-        mock_activation_code_repository.get_activation_code.return_value = None
+        mock_user_repository.activate_with_code.return_value = (ActivationOutcome.CODE_NOT_FOUND, None)
         
         # Execute & Assert
         with pytest.raises(InvalidActivationCodeException):
@@ -190,21 +206,122 @@ class TestUserActivation:
     ):
         """Test activation with expired code."""
         # Setup
-        expired_code = ActivationCode(
-            user_id="test-user-id",
-            code="1234",
-            expires_at=utc_now() - timedelta(minutes=1),  # Expired
-            created_at=utc_now()
-        )
-        
         mock_user_repository.get_user_by_email.return_value = sample_user
         mock_user_repository.verify_password.return_value = True
-        mock_activation_code_repository.get_activation_code.return_value = expired_code
+        mock_user_repository.activate_with_code.return_value = (ActivationOutcome.CODE_EXPIRED, None)
         
         # Execute & Assert
         with pytest.raises(ActivationCodeExpiredException):
             await user_service.activate_user("test@example.com", "password123", "1234")
 
+    @pytest.mark.asyncio
+    async def test_activate_user_lost_race(
+        self,
+        user_service,
+        mock_user_repository,
+        sample_user
+    ):
+        """Test that a concurrent activation that already won is reported."""
+        # Setup
+        mock_user_repository.get_user_by_email.return_value = sample_user
+        mock_user_repository.verify_password.return_value = True
+        mock_user_repository.activate_with_code.return_value = (ActivationOutcome.ALREADY_ACTIVE, None)
+        
+        # Execute & Assert
+        with pytest.raises(UserAlreadyActivatedException):
+            await user_service.activate_user("test@example.com", "password123", "1234")
+
+
+class TestAuthentication:
+    """Test credential verification."""
+
+    @pytest.mark.asyncio
+    async def test_authenticate_rehashes_out_of_band_password(
+        self,
+        user_service,
+        mock_user_repository,
+        sample_user
+    ):
+        """Test that a successful login rehashes in the background."""
+        # Setup
+        mock_user_repository.get_user_by_email.return_value = sample_user
+        mock_user_repository.verify_password.return_value = True
+        mock_user_repository.password_needs_rehash.return_value = True
+        
+        # Execute
+        await user_service.resend_activation_code("test@example.com", "password123")
+        await asyncio.gather(*user_service._rehash_tasks)
+        
+        # Assert
+        mock_user_repository.rehash_password_if_needed.assert_called_once_with(sample_user, "password123")
+
+    @pytest.mark.asyncio
+    async def test_authenticate_skips_task_for_current_hash(
+        self,
+        user_service,
+        mock_user_repository,
+        sample_user
+    ):
+        """Test that a hash already in the default format schedules nothing."""
+        # Setup
+        mock_user_repository.get_user_by_email.return_value = sample_user
+        mock_user_repository.verify_password.return_value = True
+        mock_user_repository.password_needs_rehash.return_value = False
+        
+        # Execute
+        await user_service.resend_activation_code("test@example.com", "password123")
+        
+        # Assert
+        assert not user_service._rehash_tasks
+        mock_user_repository.rehash_password_if_needed.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_authenticate_does_not_wait_for_rehash(
+        self,
+        user_service,
+        mock_user_repository,
+        sample_user
+    ):
+        """Test that a slow or failing rehash neither delays nor fails the login."""
+        # Setup
+        rehash_started = asyncio.Event()
+
+        async def slow_failing_rehash(user, password):
+            rehash_started.set()
+            await asyncio.sleep(0.01)
+            raise RuntimeError("hashing backend down")
+
+        mock_user_repository.get_user_by_email.return_value = sample_user
+        mock_user_repository.verify_password.return_value = True
+        mock_user_repository.password_needs_rehash.return_value = True
+        mock_user_repository.rehash_password_if_needed.side_effect = slow_failing_rehash
+        
+        # Execute
+        await user_service.resend_activation_code("test@example.com", "password123")
+        
+        # Assert
+        assert not rehash_started.is_set()
+        await asyncio.gather(*user_service._rehash_tasks)
+        assert rehash_started.is_set()
+        assert not user_service._rehash_tasks
+
+    @pytest.mark.asyncio
+    async def test_authenticate_does_not_rehash_on_wrong_password(
+        self,
+        user_service,
+        mock_user_repository,
+        sample_user
+    ):
+        """Test that a failed login never triggers a rehash."""
+        # Setup
+        mock_user_repository.get_user_by_email.return_value = sample_user
+        mock_user_repository.verify_password.return_value = False
+        
+        # Execute & Assert
+        with pytest.raises(AuthenticationException):
+            await user_service.resend_activation_code("test@example.com", "wrong_password1")
+        mock_user_repository.rehash_password_if_needed.assert_not_called()
+
 
 class TestResendActivationCode:
     """Test resend activation code functionality."""
@@ -244,6 +361,23 @@ class TestResendActivationCode:
             await user_service.resend_activation_code("test@example.com", "password123")
 
 
+class TestCleanupExpiredCodes:
+    """Test the scheduled cleanup of expired activation codes."""
+
+    @pytest.mark.asyncio
+    async def test_failure_reaches_the_scheduler(self, mock_user_repository, mock_email_service):
+        """Test that a failed cleanup raises instead of reporting 0 codes."""
+        activation_code_store = AsyncMock()
+        activation_code_store.cleanup_expired.side_effect = RuntimeError("database down")
+        service = UserService(
+            mock_user_repository, AsyncMock(), mock_email_service,
+            activation_code_store=activation_code_store
+        )
+
+        with pytest.raises(RuntimeError):
+            await service.cleanup_expired_codes()
+
+
 class TestPasswordValidation:
     """Test password validation."""
 
@@ -257,7 +391,9 @@ class TestPasswordValidation:
             "abcdefgh1"
         ]
         
-        mock_user_repository.create_user.return_value = sample_user
+        mock_user_repository.create_user_with_activation_code.return_value = (
+            sample_user, ActivationCode.generate_for_user(sample_user.user_id)
+        )
         
         for password in valid_passwords:
             await user_service.register_user("test@example.com", password)
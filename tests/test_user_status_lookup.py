@@ -0,0 +1,93 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.api.v1 import users
+from src.domain.exceptions import InternalAccessDeniedException, InvalidStatusLookupException
+from src.domain.user.repository import UserRepository
+from src.domain.user.service import MAX_STATUS_LOOKUP_KEYS, UserService
+
+
+class TestUserStatusLookup:
+    """Test the batch status lookup for internal callers."""
+
+    @pytest.mark.asyncio
+    async def test_every_key_gets_an_answer(self):
+        """Test that missing users map to None and keys keep the caller's spelling."""
+        user_id, unknown_id = uuid.uuid4(), uuid.uuid4()
+        user_repository = AsyncMock()
+        user_repository.get_user_statuses.return_value = {user_id: "ACTIVE"}
+        service = UserService(user_repository, AsyncMock(), AsyncMock())
+
+        statuses = await service.get_user_statuses(user_ids=[user_id, unknown_id, user_id])
+
+        assert statuses == {str(user_id): "ACTIVE", str(unknown_id): None}
+        user_repository.get_user_statuses.assert_awaited_once_with("user_id", [user_id, unknown_id])
+
+    @pytest.mark.asyncio
+    async def test_emails_are_normalized_but_answered_as_sent(self):
+        """Test that emails match the stored spelling and come back under the caller's."""
+        user_repository = AsyncMock()
+        user_repository.get_user_statuses.return_value = {"Ann@example.com": "ACTIVE"}
+        service = UserService(user_repository, AsyncMock(), AsyncMock())
+
+        statuses = await service.get_user_statuses(emails=["Ann@EXAMPLE.com", "Ann@example.com", "not-an-email"])
+
+        assert statuses == {"Ann@EXAMPLE.com": "ACTIVE", "Ann@example.com": "ACTIVE", "not-an-email": None}
+        user_repository.get_user_statuses.assert_awaited_once_with("email", ["Ann@example.com"])
+
+    @pytest.mark.asyncio
+    async def test_invalid_lookups(self):
+        """Test that a lookup needs exactly one kind of key, within the limit."""
+        service = UserService(AsyncMock(), AsyncMock(), AsyncMock())
+
+        with pytest.raises(InvalidStatusLookupException):
+            await service.get_user_statuses()
+        with pytest.raises(InvalidStatusLookupException):
+            await service.get_user_statuses(user_ids=[uuid.uuid4()], emails=["a@example.com"])
+        with pytest.raises(InvalidStatusLookupException):
+            await service.get_user_statuses(
+                emails=[f"user{i}@example.com" for i in range(MAX_STATUS_LOOKUP_KEYS + 1)]
+            )
+
+    @pytest.mark.asyncio
+    async def test_one_query_for_the_batch(self):
+        """Test a single ANY query for every key."""
+        db_client = AsyncMock()
+        db_client.execute_statement.return_value = [{"key": "a@example.com", "status": "PENDING"}]
+        repository = UserRepository(db_client)
+
+        statuses = await repository.get_user_statuses("email", ["a@example.com", "b@example.com"])
+
+        assert statuses == {"a@example.com": "PENDING"}
+        db_client.execute_statement.assert_awaited_once_with(
+            "users.statuses_by_email", ["a@example.com", "b@example.com"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_email_filter_is_not_trusted(self):
+        """Test that an email unknown to this process's filter is still looked up."""
+        db_client = AsyncMock()
+        db_client.execute_statement.return_value = [{"key": "elsewhere@example.com", "status": "ACTIVE"}]
+        email_filter = MagicMock()
+        email_filter.might_exist.return_value = False
+        repository = UserRepository(db_client, email_filter=email_filter)
+
+        statuses = await repository.get_user_statuses("email", ["elsewhere@example.com"])
+
+        assert statuses == {"elsewhere@example.com": "ACTIVE"}
+        db_client.execute_statement.assert_awaited_once_with("users.statuses_by_email", ["elsewhere@example.com"])
+
+    def test_internal_token(self, monkeypatch):
+        """Test that only the configured service token is accepted."""
+        monkeypatch.setattr(users, "internal_api_token", "s3cret")
+        users.require_internal_caller("s3cret")
+
+        for token in (None, "", "wrong"):
+            with pytest.raises(InternalAccessDeniedException):
+                users.require_internal_caller(token)
+
+        monkeypatch.setattr(users, "internal_api_token", "")
+        with pytest.raises(InternalAccessDeniedException):
+            users.require_internal_caller("")